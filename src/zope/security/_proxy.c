@@ -15,6 +15,8 @@ Security Proxy Implementation
 */
 
 #include <Python.h>
+#include <frameobject.h>
+#include <stddef.h>
 #include "zope/proxy/proxy.h"
 
 static PyObject *__class__str = 0, *__name__str = 0, *__module__str = 0;
@@ -111,6 +113,7 @@ DECLARE_STRING(__str__);
 typedef struct {
   ProxyObject proxy;
   PyObject *proxy_checker;
+  vectorcallfunc vectorcall;
 } SecurityProxy;
 
 #define CLEAR(O) if (O) {PyObject *t = O; O = 0; Py_DECREF(t); }
@@ -120,6 +123,110 @@ typedef struct {
     PyObject_TypeCheck(proxy, &SecurityProxyType)
 
 static PyTypeObject SecurityProxyType;
+static PyObject *proxy_vectorcall(PyObject *, PyObject *const *, size_t,
+                                  PyObject *);
+
+/*
+ * Trusted regions.
+ *
+ * While code runs in a trusted region (see
+ * zope.security.management.trustedRegion) all checks pass.  The
+ * innermost region is kept in a context variable, so that it isn't
+ * shared with other threads or asyncio tasks, as a list that holds
+ * True while the region is active and is emptied when it is left:
+ * tasks started in the region, which get a copy of the context, are
+ * no longer trusted once it's left.  Regions can't be entered by
+ * generators, as the code that runs while a generator is suspended
+ * shares its context.  Until the first region is entered, which is
+ * nearly always, a check only costs a test of trusted_regions_used;
+ * afterwards, it costs a lookup of the context variable.
+ */
+
+static PyObject *trusted_region_var;
+static int trusted_regions_used = 0;
+
+static int
+inTrustedRegion(void)
+{
+  PyObject *region;
+  int result;
+
+  if (! trusted_regions_used)
+    return 0;
+  if (PyContextVar_Get(trusted_region_var, NULL, &region) < 0)
+    {
+      PyErr_Clear();
+      return 0;
+    }
+  if (region == NULL)
+    return 0;
+  result = PyList_GET_SIZE(region) > 0;
+  Py_DECREF(region);
+  return result;
+}
+
+static PyObject *
+module_enterTrustedRegion(PyObject *self, PyObject *frame)
+{
+  PyCodeObject *code;
+  PyObject *region, *token, *result;
+  int flags;
+
+  if (! PyFrame_Check(frame))
+    {
+      PyErr_SetString(PyExc_TypeError, "expected a frame");
+      return NULL;
+    }
+  code = PyFrame_GetCode((PyFrameObject*)frame);
+  flags = code->co_flags;
+  Py_DECREF(code);
+  if (flags & (CO_GENERATOR | CO_ASYNC_GENERATOR))
+    {
+      PyErr_SetString(PyExc_RuntimeError,
+                      "trusted regions can't be entered in generators");
+      return NULL;
+    }
+  region = PyList_New(1);
+  if (region == NULL)
+    return NULL;
+  Py_INCREF(Py_True);
+  PyList_SET_ITEM(region, 0, Py_True);
+  token = PyContextVar_Set(trusted_region_var, region);
+  if (token == NULL)
+    {
+      Py_DECREF(region);
+      return NULL;
+    }
+  result = PyTuple_Pack(2, token, region);
+  Py_DECREF(token);
+  Py_DECREF(region);
+  trusted_regions_used = 1;
+  return result;
+}
+
+static PyObject *
+module_exitTrustedRegion(PyObject *self, PyObject *token)
+{
+  if (! PyTuple_Check(token) || PyTuple_GET_SIZE(token) != 2
+      || ! PyList_Check(PyTuple_GET_ITEM(token, 1)))
+    {
+      PyErr_SetString(PyExc_TypeError, "expected a trusted region token");
+      return NULL;
+    }
+  if (PyContextVar_Reset(trusted_region_var,
+                         PyTuple_GET_ITEM(token, 0)) < 0)
+    return NULL;
+  if (PyList_SetSlice(PyTuple_GET_ITEM(token, 1), 0, PY_SSIZE_T_MAX,
+                      NULL) < 0)
+    return NULL;
+  Py_RETURN_NONE;
+}
+
+static PyObject *
+module_inTrustedRegion(PyObject *self, PyObject *unused)
+{
+  return PyBool_FromLong(inTrustedRegion());
+}
 
 /*
  * Machinery to call the checker.
@@ -129,6 +236,11 @@ static int
 check(SecurityProxy *self, PyObject *meth, PyObject *name)
 {
   PyObject *r;
+  /* The first slot is free for vectorcall to use. */
+  PyObject *args[4];
+
+  if (inTrustedRegion())
+    return 0;
 
   /* If the checker has __setitem__, we call it's slot rather than
      calling check or check_getattr. Why? Because calling operator slots
@@ -142,9 +254,11 @@ check(SecurityProxy *self, PyObject *meth, PyObject *name)
     return self->proxy_checker->ob_type->tp_as_mapping->
       mp_ass_subscript(self->proxy_checker, self->proxy.proxy_object, name);
 
-  r = PyObject_CallMethodObjArgs(self->proxy_checker, meth,
-                                 self->proxy.proxy_object, name,
-                                 NULL);
+  args[1] = self->proxy_checker;
+  args[2] = self->proxy.proxy_object;
+  args[3] = name;
+  r = PyObject_VectorcallMethod(meth, args + 1,
+                                3 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
   if (r == NULL)
     return -1;
 
@@ -166,8 +280,7 @@ if (result != NULL) { \
     tmp = self->proxy_checker->ob_type->tp_as_mapping-> \
       mp_subscript(self->proxy_checker, result); \
   else \
-    tmp = PyObject_CallMethodObjArgs(self->proxy_checker, str_proxy, \
-                                     result, NULL); \
+    tmp = PyObject_CallMethodOneArg(self->proxy_checker, str_proxy, result); \
   Py_DECREF(result); \
   result = tmp; \
 }
@@ -286,6 +399,7 @@ proxy_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
   Py_INCREF(checker);
   self->proxy.proxy_object = object;
   self->proxy_checker = checker;
+  self->vectorcall = proxy_vectorcall;
   return (PyObject *)self;
 }
 
@@ -470,6 +584,25 @@ proxy_call(SecurityProxy *self, PyObject *args, PyObject *kwds)
   return result;
 }
 
+/* Calls made with the vectorcall protocol (such as calls from Python
+   code) pass their arguments on as they are, without packing them
+   into a tuple and a dictionary. */
+static PyObject *
+proxy_vectorcall(PyObject *self, PyObject *const *args, size_t nargsf,
+                 PyObject *kwnames)
+{
+  SecurityProxy *proxy = (SecurityProxy *)self;
+  PyObject *result = NULL;
+
+  if (check(proxy, str_check, str___call__) >= 0)
+    {
+      result = PyObject_Vectorcall(proxy->proxy.proxy_object,
+                                   args, nargsf, kwnames);
+      PROXY_RESULT(proxy, result);
+    }
+  return result;
+}
+
 /*
  * Number methods.
  */
@@ -770,7 +903,7 @@ static PyTypeObject SecurityProxyType = {
     sizeof(SecurityProxy),
     0,
     (destructor)proxy_dealloc,                /* tp_dealloc */
-    0,                                        /* tp_print */
+    offsetof(SecurityProxy, vectorcall),      /* tp_vectorcall_offset */
     0,                                        /* tp_getattr */
     0,                                        /* tp_setattr */
     0,                                        /* tp_reserved, was tp_compare */
@@ -786,6 +919,7 @@ static PyTypeObject SecurityProxyType = {
     0,                                        /* tp_as_buffer */
     Py_TPFLAGS_DEFAULT |
     Py_TPFLAGS_HAVE_GC |
+    Py_TPFLAGS_HAVE_VECTORCALL |
     Py_TPFLAGS_BASETYPE,                      /* tp_flags */
     proxy_doc,                                /* tp_doc */
     (traverseproc)proxy_traverse,             /* tp_traverse */
@@ -837,6 +971,256 @@ module_getObject(PyObject *self, PyObject *arg)
   return result;
 }
 
+/*
+ * Removing the proxies from containers.
+ *
+ * unproxy() returns a new reference to ob without its security proxy.
+ * If recurse is true, lists, tuples, dicts, sets and frozensets (but
+ * not their subclasses) are walked as well, and their items are
+ * treated the same way, recursing further only if deep is true.
+ * Containers are only copied if one of their items changed; the
+ * originals are never modified.
+ */
+
+static PyObject *unproxy(PyObject *ob, int recurse, int deep);
+
+static PyObject *
+unproxyList(PyObject *list, int deep)
+{
+  PyObject *result = NULL, *source = list, *item, *new;
+  Py_ssize_t i;
+
+  for (i = 0; i < PyList_GET_SIZE(source); i++)
+    {
+      item = PyList_GET_ITEM(source, i);
+      Py_INCREF(item);
+      new = unproxy(item, deep, deep);
+      Py_DECREF(item);
+      if (new == NULL)
+        goto error;
+      if (new == item)
+        {
+          Py_DECREF(new);
+          continue;
+        }
+      if (result == NULL)
+        {
+          /* Copy, and from now on work on the copy. */
+          result = PyList_GetSlice(list, 0, PY_SSIZE_T_MAX);
+          if (result == NULL)
+            {
+              Py_DECREF(new);
+              return NULL;
+            }
+          source = result;
+          if (i >= PyList_GET_SIZE(result))
+            {
+              Py_DECREF(new);
+              break;
+            }
+        }
+      PyList_SetItem(result, i, new);
+    }
+
+  if (result == NULL)
+    {
+      Py_INCREF(list);
+      return list;
+    }
+  return result;
+
+ error:
+  Py_XDECREF(result);
+  return NULL;
+}
+
+static PyObject *
+unproxyTuple(PyObject *tuple, int deep)
+{
+  PyObject *result = NULL, *item, *new;
+  Py_ssize_t i, j, size = PyTuple_GET_SIZE(tuple);
+
+  for (i = 0; i < size; i++)
+    {
+      item = PyTuple_GET_ITEM(tuple, i);
+      new = unproxy(item, deep, deep);
+      if (new == NULL)
+        goto error;
+      if (result == NULL)
+        {
+          if (new == item)
+            {
+              Py_DECREF(new);
+              continue;
+            }
+          result = PyTuple_New(size);
+          if (result == NULL)
+            {
+              Py_DECREF(new);
+              return NULL;
+            }
+          for (j = 0; j < i; j++)
+            {
+              item = PyTuple_GET_ITEM(tuple, j);
+              Py_INCREF(item);
+              PyTuple_SET_ITEM(result, j, item);
+            }
+        }
+      PyTuple_SET_ITEM(result, i, new);
+    }
+
+  if (result == NULL)
+    {
+      Py_INCREF(tuple);
+      return tuple;
+    }
+  return result;
+
+ error:
+  Py_XDECREF(result);
+  return NULL;
+}
+
+static PyObject *
+unproxyDict(PyObject *dict, int deep)
+{
+  PyObject *items, *result = NULL, *item, *key, *value;
+  Py_ssize_t i, j;
+
+  /* Work on a snapshot; hashing the keys of the copy can run code that
+     changes the original. */
+  items = PyDict_Items(dict);
+  if (items == NULL)
+    return NULL;
+
+  for (i = 0; i < PyList_GET_SIZE(items); i++)
+    {
+      item = PyList_GET_ITEM(items, i);
+      key = unproxy(PyTuple_GET_ITEM(item, 0), deep, deep);
+      if (key == NULL)
+        goto error;
+      value = unproxy(PyTuple_GET_ITEM(item, 1), deep, deep);
+      if (value == NULL)
+        {
+          Py_DECREF(key);
+          goto error;
+        }
+      if (result == NULL)
+        {
+          if (key == PyTuple_GET_ITEM(item, 0)
+              && value == PyTuple_GET_ITEM(item, 1))
+            {
+              Py_DECREF(key);
+              Py_DECREF(value);
+              continue;
+            }
+          result = PyDict_New();
+          if (result == NULL)
+            goto error_item;
+          for (j = 0; j < i; j++)
+            {
+              PyObject *old = PyList_GET_ITEM(items, j);
+              if (PyDict_SetItem(result, PyTuple_GET_ITEM(old, 0),
+                                 PyTuple_GET_ITEM(old, 1)) < 0)
+                goto error_item;
+            }
+        }
+      if (PyDict_SetItem(result, key, value) < 0)
+        goto error_item;
+      Py_DECREF(key);
+      Py_DECREF(value);
+    }
+
+  Py_DECREF(items);
+  if (result == NULL)
+    {
+      Py_INCREF(dict);
+      return dict;
+    }
+  return result;
+
+ error_item:
+  Py_DECREF(key);
+  Py_DECREF(value);
+ error:
+  Py_DECREF(items);
+  Py_XDECREF(result);
+  return NULL;
+}
+
+static PyObject *
+unproxySet(PyObject *set, int deep)
+{
+  PyObject *items, *new_items, *result;
+
+  items = PySequence_List(set);
+  if (items == NULL)
+    return NULL;
+  new_items = unproxyList(items, deep);
+  Py_DECREF(items);
+  if (new_items == NULL)
+    return NULL;
+  if (new_items == items)
+    {
+      /* Nothing changed; items is only still alive through new_items. */
+      Py_DECREF(new_items);
+      Py_INCREF(set);
+      return set;
+    }
+  if (PyFrozenSet_CheckExact(set))
+    result = PyFrozenSet_New(new_items);
+  else
+    result = PySet_New(new_items);
+  Py_DECREF(new_items);
+  return result;
+}
+
+static PyObject *
+unproxy(PyObject *ob, int recurse, int deep)
+{
+  PyObject *result;
+
+  while (Proxy_Check(ob))
+    ob = ((SecurityProxy*)ob)->proxy.proxy_object;
+
+  if (! recurse)
+    {
+      Py_INCREF(ob);
+      return ob;
+    }
+
+  if (Py_EnterRecursiveCall(" in removeSecurityProxies"))
+    return NULL;
+  if (PyList_CheckExact(ob))
+    result = unproxyList(ob, deep);
+  else if (PyTuple_CheckExact(ob))
+    result = unproxyTuple(ob, deep);
+  else if (PyDict_CheckExact(ob))
+    result = unproxyDict(ob, deep);
+  else if (PyAnySet_CheckExact(ob))
+    result = unproxySet(ob, deep);
+  else
+    {
+      Py_INCREF(ob);
+      result = ob;
+    }
+  Py_LeaveRecursiveCall();
+  return result;
+}
+
+static PyObject *
+module_removeSecurityProxies(PyObject *self, PyObject *args, PyObject *kwds)
+{
+  static char *kwlist[] = {"obj", "deep", NULL};
+  PyObject *ob;
+  int deep = 1;
+
+  if (! PyArg_ParseTupleAndKeywords(args, kwds, "O|p:removeSecurityProxies",
+                                    kwlist, &ob, &deep))
+    return NULL;
+  return unproxy(ob, 1, deep);
+}
+
 static char
 module___doc__[] = "Security proxy implementation.";
 
@@ -845,12 +1229,29 @@ module_functions[] = {
   {"getChecker", module_getChecker, METH_O, "get checker from proxy"},
   {"getObject", module_getObject, METH_O,
    "Get the proxied object\n\nReturn the original object if not proxied."},
+  {"removeSecurityProxies", (PyCFunction)module_removeSecurityProxies,
+   METH_VARARGS | METH_KEYWORDS,
+   "removeSecurityProxies(obj, deep=True)\n\n"
+   "Remove the security proxies from *obj* and the containers in it.\n\n"
+   "Lists, tuples, dicts (keys and values), sets and frozensets are\n"
+   "walked, recursively unless *deep* is false, in which case only\n"
+   "*obj* and its direct items are unproxied.  Subclasses of these\n"
+   "types are left alone.  Containers that contained proxies are\n"
+   "copied; the originals are never changed, and containers that\n"
+   "didn't contain any proxies are returned as they are."},
+  {"_enterTrustedRegion", module_enterTrustedRegion, METH_O,
+   "Enter a trusted region for the code run by the given frame; "
+   "return a token for _exitTrustedRegion"},
+  {"_exitTrustedRegion", module_exitTrustedRegion, METH_O,
+   "Leave the trusted region entered with the given token"},
+  {"_inTrustedRegion", module_inTrustedRegion, METH_NOARGS,
+   "Is the running code in a trusted region?"},
   {NULL}
 };
 
 MOD_INIT(_proxy)
 {
-  PyObject *m;
+  PyObject *m, *trusted_region_capi;
 
   MOD_DEF(m, "_proxy", module___doc__, module_functions)
 
@@ -929,6 +1330,11 @@ if((str_op_##S = INTERN("__" #S "__")) == NULL) return MOD_ERROR_VAL
   INIT_STRING(__str__);
 
 
+  trusted_region_var = PyContextVar_New("zope.security.trusted_region",
+                                        NULL);
+  if (trusted_region_var == NULL)
+    return MOD_ERROR_VAL;
+
   __class__str = FROM_STRING("__class__");
   if (! __class__str)
      return MOD_ERROR_VAL;
@@ -949,5 +1355,13 @@ if((str_op_##S = INTERN("__" #S "__")) == NULL) return MOD_ERROR_VAL
   Py_INCREF(&SecurityProxyType);
   PyModule_AddObject(m, "_Proxy", (PyObject *)&SecurityProxyType);
 
+  /* The C checker short-circuits in trusted regions, too. */
+  trusted_region_capi = PyCapsule_New((void *)inTrustedRegion,
+                                      "zope.security._proxy._trusted_region_CAPI",
+                                      NULL);
+  if (trusted_region_capi == NULL)
+    return MOD_ERROR_VAL;
+  PyModule_AddObject(m, "_trusted_region_CAPI", trusted_region_capi);
+
   return MOD_SUCCESS_VAL(m);
 }
@@ -14,17 +14,21 @@
 #include <Python.h>
 
 static PyObject *_checkers, *_defaultChecker, *_available_by_default, *NoProxy;
+static PyObject *_value_type_checkers;
 static PyObject *Proxy, *_thread_local, *CheckerPublic;
 static PyObject *ForbiddenAttribute, *Unauthorized;
+/* Provided by zope.security._proxy: is the current thread in a trusted
+   region? */
+static int (*inTrustedRegion)(void);
+#if PY_VERSION_HEX >= 0x030C0000
+static initproc base_exception_init, attribute_error_init;
+#endif
 
 
 #define PyInt_FromLong PyLong_FromLong
 
 #define IS_STRING PyUnicode_Check
 
-#define MAKE_STRING(name) PyBytes_AS_STRING( \
-        PyUnicode_AsUTF8String(name))
-
 #define FROM_STRING PyUnicode_FromString
 
 #define FROM_STRING_FORMAT PyUnicode_FromFormat
@@ -46,9 +50,14 @@ static PyObject *ForbiddenAttribute, *Unauthorized;
 
 #define DECLARE_STRING(N) static PyObject *str_##N
 
+DECLARE_STRING(check);
 DECLARE_STRING(checkPermission);
+DECLARE_STRING(check_setattr);
+DECLARE_STRING(get_permissions);
+DECLARE_STRING(set_permissions);
 DECLARE_STRING(__Security_checker__);
 DECLARE_STRING(interaction);
+DECLARE_STRING(__iter__);
 
 #define CLEAR(O) if (O) {PyObject *t = O; O = 0; Py_DECREF(t); }
 
@@ -97,10 +106,22 @@ Checker_setattr_permission_id(Checker *self, PyObject *name)
   return result;
 }
 
+/* The outcome of a check that has been decided without raising an
+   exception.  Deciding is used by the combined checker, which has to
+   look at several checkers before it knows what (if anything) to
+   raise. */
+#define DECISION_ALLOWED 0
+#define DECISION_UNAUTHORIZED 1
+#define DECISION_FORBIDDEN 2
+
+/* Return 1 if the interaction grants permission on object, 0 if it
+   doesn't and -1 on error. */
 static int
-checkPermission(PyObject *permission, PyObject *object, PyObject *name)
+permissionGranted(PyObject *permission, PyObject *object)
 {
       PyObject *interaction, *r;
+      /* The first slot is free for vectorcall to use. */
+      PyObject *args[4];
       int i;
 
 /*          if thread_local.interaction.checkPermission(permission, object): */
@@ -108,93 +129,330 @@ checkPermission(PyObject *permission, PyObject *object, PyObject *name)
       interaction = PyObject_GetAttr(_thread_local, str_interaction);
       if (interaction == NULL)
         return -1;
-      r = PyObject_CallMethodObjArgs(interaction, str_checkPermission,
-                                     permission, object, NULL);
+      args[1] = interaction;
+      args[2] = permission;
+      args[3] = object;
+      r = PyObject_VectorcallMethod(str_checkPermission, args + 1,
+                                    3 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
       Py_DECREF(interaction);
       if (r == NULL)
         return -1;
       i = PyObject_IsTrue(r);
       Py_DECREF(r);
-      if (i < 0)
-        return -1;
-      if (i)
-        return 0;
-/*             else: */
+      return i;
+}
+
+/* Raise type with the argument tuple args (a reference to which is
+   stolen) without going through the normal exception construction.
+
+   Most of the exceptions raised here are never looked at: hasattr(),
+   getattr() with a default and the like just clear them again.  Before
+   Python 3.12 the exception is left unnormalized, so the instance is
+   only created if somebody actually inspects it.  Later versions always
+   normalize, so there we at least create the instance directly from the
+   argument tuple we already have, as long as the exception class doesn't
+   define its own __init__. */
+static void
+raiseLazily(PyObject *type, PyObject *args)
+{
+#if PY_VERSION_HEX >= 0x030C0000
+  PyTypeObject *exc_type = (PyTypeObject *)type;
+  PyObject *inst;
+
+  if (exc_type->tp_init == base_exception_init
+      || exc_type->tp_init == attribute_error_init)
+    {
+      inst = exc_type->tp_new(exc_type, args, NULL);
+      Py_DECREF(args);
+      if (inst != NULL)
+        {
+          PyErr_SetObject(type, inst);
+          Py_DECREF(inst);
+        }
+      return;
+    }
+#endif
+  PyErr_SetObject(type, args);
+  Py_DECREF(args);
+}
+
+static void
+raiseUnauthorized(PyObject *object, PyObject *name, PyObject *permission)
+{
 /*                 __traceback_supplement__ = (TracebackSupplement, object) */
 /*                 raise Unauthorized(object, name, permission) */
-      r = Py_BuildValue("OOO", object, name, permission);
-      if (r == NULL)
-        return -1;
-      PyErr_SetObject(Unauthorized, r);
-      Py_DECREF(r);
-      return -1;
+  PyObject *args;
+
+  args = PyTuple_Pack(3, object, name, permission);
+  if (args != NULL)
+    raiseLazily(Unauthorized, args);
 }
 
+static void
+raiseForbidden(PyObject *object, PyObject *name)
+{
+/*         __traceback_supplement__ = (TracebackSupplement, object) */
+/*         raise ForbiddenAttribute, (name, object) */
+  PyObject *args;
+
+  args = PyTuple_Pack(2, name, object);
+  if (args != NULL)
+    raiseLazily(ForbiddenAttribute, args);
+}
+
+/* Decide a permission found in one of the permission dictionaries.  A
+   new reference to the permission is stored in *reason when access is
+   not allowed. */
+static int
+decidePermission(PyObject *permission, PyObject *object, PyObject **reason)
+{
+  int i;
+
+/*             if permission is CheckerPublic: */
+/*                 return # Public */
+  if (permission == CheckerPublic)
+    return DECISION_ALLOWED;
+
+  /* The policy may run arbitrary code, so hold on to the permission. */
+  Py_INCREF(permission);
+  i = permissionGranted(permission, object);
+  if (i <= 0)
+    {
+      if (i < 0)
+        {
+          Py_DECREF(permission);
+          return -1;
+        }
+      *reason = permission;
+      return DECISION_UNAUTHORIZED;
+    }
+  Py_DECREF(permission);
+  return DECISION_ALLOWED;
+}
+
+/* Return 1 if name is in _available_by_default, 0 if it isn't and -1
+   on error.
+
+   The names in the list are string literals, and the names the proxy
+   checks are attribute names and the names of special methods, so
+   nearly all of them are interned.  Equal interned strings are the same
+   object, so comparing identities is enough to decide, unless the name
+   or one of the names in the list is not interned.  (The list may be
+   changed at any time, so we can't remember the outcome.) */
+static int
+availableByDefault(PyObject *name)
+{
+  PyObject *item;
+  Py_ssize_t i, l;
+  int interned = PyUnicode_CHECK_INTERNED(name);
+
+  l = PyList_GET_SIZE(_available_by_default);
+  for (i = 0; i < l; i++)
+    {
+      item = PyList_GET_ITEM(_available_by_default, i);
+      if (item == name)
+        return 1;
+      if (! PyUnicode_CheckExact(item) || ! PyUnicode_CHECK_INTERNED(item))
+        interned = 0;
+    }
+  if (interned)
+    return 0;
+
+  return PySequence_Contains(_available_by_default, name);
+}
 
 /*     def check(self, object, name): */
 
-/* Note that we have an int version here because we will use it for
-   __setitem__, as described below */
+/* Decide whether getting name is allowed, without raising anything
+   but real errors. */
 
 static int
-Checker_check_int(Checker *self, PyObject *object, PyObject *name)
+Checker_decide(Checker *self, PyObject *object, PyObject *name,
+               PyObject **reason)
 {
   PyObject *permission=NULL;
   int operator;
 
+  if (inTrustedRegion())
+    return DECISION_ALLOWED;
+
 /*         permission = self._permission_func(name) */
   if (self->getperms)
     permission = PyDict_GetItem(self->getperms, name);
 
 /*         if permission is not None: */
   if (permission != NULL)
-    {
-/*             if permission is CheckerPublic: */
-/*                 return # Public */
-      if (permission == CheckerPublic)
-        return 0;
-
-      if (checkPermission(permission, object, name) < 0)
-        return -1;
-      return 0;
-    }
+    return decidePermission(permission, object, reason);
 
 
   operator = (IS_STRING(name)
-              && MAKE_STRING(name)[0] == '_'
-              && MAKE_STRING(name)[1] == '_');
+              && PyUnicode_GET_LENGTH(name) >= 2
+              && PyUnicode_READ_CHAR(name, 0) == '_'
+              && PyUnicode_READ_CHAR(name, 1) == '_');
 
   if (operator)
     {
 /*         elif name in _available_by_default: */
 /*             return */
-      int ic = PySequence_Contains(_available_by_default, name);
+      int ic = availableByDefault(name);
       if (ic < 0)
         return -1;
       if (ic)
-        return 0;
+        return DECISION_ALLOWED;
 
 /*         if name != '__iter__' or hasattr(object, name): */
 /*             __traceback_supplement__ = (TracebackSupplement, object) */
 /*             raise ForbiddenAttribute, (name, object) */
 
-      if (strcmp("__iter__", MAKE_STRING(name)) == 0
+      if ((name == str___iter__
+           || (! PyUnicode_CHECK_INTERNED(name)
+               && PyUnicode_CompareWithASCIIString(name, "__iter__") == 0))
           && ! PyObject_HasAttr(object, name))
         /* We want an attr error if we're asked for __iter__ and we don't
            have it. We'll get one by allowing the access. */
-        return 0;
+        return DECISION_ALLOWED;
     }
 
-  {
-    PyObject *args;
-    args = Py_BuildValue("OO", name, object);
-    if (args != NULL)
-      {
-        PyErr_SetObject(ForbiddenAttribute, args);
-        Py_DECREF(args);
-      }
+  return DECISION_FORBIDDEN;
+}
+
+/*     def check_setattr(self, object, name): */
+static int
+Checker_decide_setattr(Checker *self, PyObject *object, PyObject *name,
+                       PyObject **reason)
+{
+  PyObject *permission=NULL;
+
+  if (inTrustedRegion())
+    return DECISION_ALLOWED;
+
+/*         permission = self._permission_func(name) */
+  if (self->setperms)
+    permission = PyDict_GetItem(self->setperms, name);
+
+/*         if permission is not None: */
+  if (permission != NULL)
+    return decidePermission(permission, object, reason);
+
+  return DECISION_FORBIDDEN;
+}
+
+/* Raise the exception for a decision that didn't allow access.  The
+   reason is either the permission that wasn't granted, an exception
+   raised by a checker we don't know how to decide, or NULL. */
+static int
+raiseDecision(int decision, PyObject *reason,
+              PyObject *object, PyObject *name)
+{
+  if (decision < 0)
     return -1;
-  }
+  if (decision == DECISION_ALLOWED)
+    return 0;
+
+  if (reason != NULL && PyExceptionInstance_Check(reason))
+    {
+      PyObject *tb = PyException_GetTraceback(reason);
+      Py_INCREF(reason);
+      Py_INCREF(Py_TYPE(reason));
+      PyErr_Restore((PyObject*)Py_TYPE(reason), reason, tb);
+    }
+  else if (decision == DECISION_UNAUTHORIZED)
+    raiseUnauthorized(object, name, reason);
+  else
+    raiseForbidden(object, name);
+  return -1;
+}
+
+/* Convert a decision to the value returned by allowed() and
+   allowed_setattr(): True if access is allowed, False if it is
+   unauthorized and None if it is forbidden. */
+static PyObject *
+decisionResult(int decision, PyObject *reason)
+{
+  PyObject *result;
+
+  Py_XDECREF(reason);
+  switch (decision)
+    {
+    case DECISION_ALLOWED:
+      result = Py_True;
+      break;
+    case DECISION_UNAUTHORIZED:
+      result = Py_False;
+      break;
+    case DECISION_FORBIDDEN:
+      result = Py_None;
+      break;
+    default:
+      return NULL;
+    }
+  Py_INCREF(result);
+  return result;
+}
+
+/* The function called with the outcome of every check, or NULL.  It
+   is set with _setTrace() (see setCheckTrace() in checker.py); while
+   it's NULL, tracing costs a single test per check. */
+static PyObject *trace = NULL;
+
+/* Call the trace function for a decided check.  Return -1, with an
+   exception set, if the trace function raised one. */
+static int
+traceDecision(PyObject *checker, PyObject *operation,
+              PyObject *object, PyObject *name, int decision)
+{
+  PyObject *t, *result, *r;
+  PyObject *args[6];
+
+  switch (decision)
+    {
+    case DECISION_ALLOWED:
+      result = Py_True;
+      break;
+    case DECISION_UNAUTHORIZED:
+      result = Py_False;
+      break;
+    default:
+      result = Py_None;
+    }
+
+  /* The trace function may replace itself. */
+  t = trace;
+  Py_INCREF(t);
+  args[1] = checker;
+  args[2] = operation;
+  args[3] = object;
+  args[4] = name;
+  args[5] = result;
+  r = PyObject_Vectorcall(t, args + 1, 5 | PY_VECTORCALL_ARGUMENTS_OFFSET,
+                          NULL);
+  Py_DECREF(t);
+  if (r == NULL)
+    return -1;
+  Py_DECREF(r);
+  return 0;
+}
+
+#define TRACE(checker, operation, object, name, decision) \
+  if (trace != NULL && decision >= 0 \
+      && traceDecision((PyObject *)(checker), operation, \
+                       object, name, decision) < 0) \
+    decision = -1;
+
+/* Note that we have an int version here because we will use it for
+   __setitem__, as described below */
+
+static int
+Checker_check_int(Checker *self, PyObject *object, PyObject *name)
+{
+  PyObject *reason=NULL;
+  int result;
+
+  result = Checker_decide(self, object, name, &reason);
+  TRACE(self, str_check, object, name, result);
+  result = raiseDecision(result, reason, object, name);
+  Py_XDECREF(reason);
+  return result;
 }
 
 /* Here we have the non-int version, implemented using the int
@@ -216,52 +474,159 @@ Checker_check(Checker *self, PyObject *args)
 }
 
 
-/*     def check_setattr(self, object, name): */
 static PyObject *
 Checker_check_setattr(Checker *self, PyObject *args)
 {
-  PyObject *object, *name, *permission=NULL;
+  PyObject *object, *name, *reason=NULL;
+  int result;
 
   if (!PyArg_ParseTuple(args, "OO", &object, &name))
     return NULL;
 
-/*         permission = self._permission_func(name) */
-  if (self->setperms)
-    permission = PyDict_GetItem(self->setperms, name);
+  result = Checker_decide_setattr(self, object, name, &reason);
+  TRACE(self, str_check_setattr, object, name, result);
+  result = raiseDecision(result, reason, object, name);
+  Py_XDECREF(reason);
+  if (result < 0)
+    return NULL;
 
-/*         if permission is not None: */
-  if (permission != NULL)
-    {
-/*             if permission is CheckerPublic: */
-/*                 return # Public */
-      if (permission != CheckerPublic
-          && checkPermission(permission, object, name) < 0)
-        return NULL;
+  Py_INCREF(Py_None);
+  return Py_None;
+}
 
-      Py_INCREF(Py_None);
-      return Py_None;
-    }
 
-/*         __traceback_supplement__ = (TracebackSupplement, object) */
-/*         raise ForbiddenAttribute, (name, object) */
-  args = Py_BuildValue("OO", name, object);
-  if (args != NULL)
+/*     def allowed(self, object, name): */
+static PyObject *
+Checker_allowed(Checker *self, PyObject *args)
+{
+  PyObject *object, *name, *reason=NULL;
+  int decision;
+
+  if (!PyArg_ParseTuple(args, "OO", &object, &name))
+    return NULL;
+
+  decision = Checker_decide(self, object, name, &reason);
+  return decisionResult(decision, reason);
+}
+
+/*     def allowed_setattr(self, object, name): */
+static PyObject *
+Checker_allowed_setattr(Checker *self, PyObject *args)
+{
+  PyObject *object, *name, *reason=NULL;
+  int decision;
+
+  if (!PyArg_ParseTuple(args, "OO", &object, &name))
+    return NULL;
+
+  decision = Checker_decide_setattr(self, object, name, &reason);
+  return decisionResult(decision, reason);
+}
+
+
+static PyObject *
+selectChecker(PyObject *ignored, PyObject *object);
+
+/* Proxy identity maps (see
+   zope.security.management.enableProxyIdentityMap).  Like the
+   interaction they belong to, the maps are kept on thread_local, as
+   its proxy_map attribute, so that the Python functions in checker.py
+   share them.  Until the first map is made, which is nearly always,
+   proxying doesn't have to look for one. */
+
+static PyObject *str_proxy_map, *str___dict__;
+static int proxy_maps_used = 0;
+
+/* Return a new reference to the current map, or NULL with or without an
+   exception set. */
+static PyObject *
+currentProxyMap(void)
+{
+  PyObject *dict, *proxies;
+
+  if (! proxy_maps_used)
+    return NULL;
+  dict = PyObject_GetAttr(_thread_local, str___dict__);
+  if (dict == NULL)
+    return NULL;
+  proxies = PyDict_GetItemWithError(dict, str_proxy_map);
+  if (proxies == Py_None)
+    proxies = NULL;
+  Py_XINCREF(proxies);
+  Py_DECREF(dict);
+  return proxies;
+}
+
+static PyObject *
+module_newProxyMap(PyObject *ignored, PyObject *unused)
+{
+  PyObject *proxies;
+
+  proxies = currentProxyMap();
+  if (proxies != NULL)
     {
-      PyErr_SetObject(ForbiddenAttribute, args);
-      Py_DECREF(args);
+      Py_DECREF(proxies);
+      Py_RETURN_NONE;
+    }
+  if (PyErr_Occurred())
+    return NULL;
+  proxies = PyDict_New();
+  if (proxies == NULL)
+    return NULL;
+  if (PyObject_SetAttr(_thread_local, str_proxy_map, proxies) < 0)
+    {
+      Py_DECREF(proxies);
+      return NULL;
     }
-  return NULL;
+  Py_DECREF(proxies);
+  proxy_maps_used = 1;
+  Py_RETURN_NONE;
 }
 
+static PyObject *
+module_endProxyMap(PyObject *ignored, PyObject *unused)
+{
+  PyObject *dict;
+
+  dict = PyObject_GetAttr(_thread_local, str___dict__);
+  if (dict == NULL)
+    return NULL;
+  if (PyDict_GetItemWithError(dict, str_proxy_map) != NULL)
+    {
+      if (PyDict_DelItem(dict, str_proxy_map) < 0)
+        {
+          Py_DECREF(dict);
+          return NULL;
+        }
+    }
+  else if (PyErr_Occurred())
+    {
+      Py_DECREF(dict);
+      return NULL;
+    }
+  Py_DECREF(dict);
+  Py_RETURN_NONE;
+}
 
 static PyObject *
-selectChecker(PyObject *ignored, PyObject *object);
+module_getProxyMap(PyObject *ignored, PyObject *unused)
+{
+  PyObject *proxies = currentProxyMap();
+
+  if (proxies == NULL && ! PyErr_Occurred())
+    {
+      proxies = Py_None;
+      Py_INCREF(proxies);
+    }
+  return proxies;
+}
 
 /*     def proxy(self, value): */
 static PyObject *
 Checker_proxy(Checker *self, PyObject *value)
 {
-  PyObject *checker, *r;
+  PyObject *checker, *proxies, *key = NULL, *r = NULL;
+  PyObject *args[3];
 
 /*        if type(value) is Proxy: */
 /*            return value */
@@ -271,6 +636,29 @@ Checker_proxy(Checker *self, PyObject *value)
       return value;
     }
 
+/*         proxies = _getProxyMap() */
+/*         if proxies is not None: */
+/*             proxy = proxies.get(id(value)) */
+/*             if proxy is not None: */
+/*                 return proxy */
+  proxies = currentProxyMap();
+  if (proxies == NULL && PyErr_Occurred())
+    return NULL;
+  if (proxies != NULL)
+    {
+      key = PyLong_FromVoidPtr(value);
+      if (key == NULL)
+        goto done;
+      r = PyDict_GetItemWithError(proxies, key);
+      if (r != NULL)
+        {
+          Py_INCREF(r);
+          goto done;
+        }
+      if (PyErr_Occurred())
+        goto done;
+    }
+
 /*         checker = getattr(value, '__Security_checker__', None) */
   checker = PyObject_GetAttr(value, str___Security_checker__);
 /*         if checker is None: */
@@ -281,7 +669,7 @@ Checker_proxy(Checker *self, PyObject *value)
 /*             checker = selectChecker(value) */
       checker = selectChecker(NULL, value);
       if (checker == NULL)
-        return NULL;
+        goto done;
 
 /*             if checker is None: */
 /*                 return value */
@@ -289,7 +677,8 @@ Checker_proxy(Checker *self, PyObject *value)
         {
           Py_DECREF(checker);
           Py_INCREF(value);
-          return value;
+          r = value;
+          goto done;
         }
     }
   else if (checker == Py_None)
@@ -304,11 +693,24 @@ Checker_proxy(Checker *self, PyObject *value)
           Py_DECREF(errv);
         }
 
-      return NULL;
+      goto done;
     }
 
-  r = PyObject_CallFunctionObjArgs(Proxy, value, checker, NULL);
+/*         proxy = Proxy(value, checker) */
+  args[1] = value;
+  args[2] = checker;
+  r = PyObject_Vectorcall(Proxy, args + 1, 2 | PY_VECTORCALL_ARGUMENTS_OFFSET,
+                          NULL);
   Py_DECREF(checker);
+
+/*         if proxies is not None: */
+/*             proxies[id(value)] = proxy */
+  if (r != NULL && proxies != NULL && PyDict_SetItem(proxies, key, r) < 0)
+    Py_CLEAR(r);
+
+ done:
+  Py_XDECREF(key);
+  Py_XDECREF(proxies);
   return r;
 }
 
@@ -328,6 +730,12 @@ static struct PyMethodDef Checker_methods[] = {
    "check_setattr(object, name) -- Check whether a setattr is allowed"},
   {"check", (PyCFunction)Checker_check, METH_VARARGS,
    "check(object, opname) -- Check whether an operation is allowed"},
+  {"allowed", (PyCFunction)Checker_allowed, METH_VARARGS,
+   "allowed(object, name) -- Return True if a getattr is allowed,\n"
+   "False if it is unauthorized and None if it is forbidden"},
+  {"allowed_setattr", (PyCFunction)Checker_allowed_setattr, METH_VARARGS,
+   "allowed_setattr(object, name) -- Return True if a setattr is allowed,\n"
+   "False if it is unauthorized and None if it is forbidden"},
   {"proxy", (PyCFunction)Checker_proxy, METH_O,
    "proxy(object) -- Security-proxy an object"},
 
@@ -484,12 +892,405 @@ static PyTypeObject CheckerType = {
 
 
 
+/*
+ * Combined checkers.
+ */
+
+typedef struct {
+    Checker checker;
+    /* The checkers consulted after our own (the first checker's)
+       permissions. */
+    PyObject *checkers;
+} CombinedChecker;
+
+static PyTypeObject CombinedCheckerType;
+
+/* Decide a check for one of the combined checkers.  Checkers that we
+   know are decided directly; for any other checker we have to call
+   its method and look at the exception it raises, which then becomes
+   the reason. */
+static int
+decideOne(PyObject *checker, int setattr,
+          PyObject *object, PyObject *name, PyObject **reason);
+
+static int
+CombinedChecker_decide(CombinedChecker *self, int setattr,
+                       PyObject *object, PyObject *name, PyObject **reason)
+{
+  PyObject *unauthorized=NULL, *forbidden=NULL, *r;
+  Py_ssize_t i, l;
+  int decision;
+
+  if (setattr)
+    decision = Checker_decide_setattr((Checker*)self, object, name,
+                                      &unauthorized);
+  else
+    decision = Checker_decide((Checker*)self, object, name, &unauthorized);
+
+  if (decision != DECISION_FORBIDDEN && decision != DECISION_UNAUTHORIZED)
+    return decision;
+
+  l = PyTuple_GET_SIZE(self->checkers);
+  for (i = 0; i < l; i++)
+    {
+      r = NULL;
+      decision = decideOne(PyTuple_GET_ITEM(self->checkers, i), setattr,
+                           object, name, &r);
+      if (decision == DECISION_UNAUTHORIZED)
+        {
+          /* The first unauthorized checker wins... */
+          if (unauthorized == NULL)
+            unauthorized = r;
+          else
+            Py_XDECREF(r);
+        }
+      else if (decision == DECISION_FORBIDDEN)
+        {
+          /* ...and otherwise the last forbidden one. */
+          Py_XDECREF(forbidden);
+          forbidden = r;
+        }
+      else
+        {
+          Py_XDECREF(unauthorized);
+          Py_XDECREF(forbidden);
+          return decision;
+        }
+    }
+
+  if (unauthorized != NULL)
+    {
+      Py_XDECREF(forbidden);
+      *reason = unauthorized;
+      return DECISION_UNAUTHORIZED;
+    }
+  *reason = forbidden;
+  return DECISION_FORBIDDEN;
+}
+
+static int
+decideOne(PyObject *checker, int setattr,
+          PyObject *object, PyObject *name, PyObject **reason)
+{
+  PyObject *r, *type, *value, *tb;
+  PyObject *args[4];
+
+  if (Py_TYPE(checker) == &CheckerType)
+    {
+      if (setattr)
+        return Checker_decide_setattr((Checker*)checker, object, name,
+                                      reason);
+      return Checker_decide((Checker*)checker, object, name, reason);
+    }
+  if (Py_TYPE(checker) == &CombinedCheckerType)
+    return CombinedChecker_decide((CombinedChecker*)checker, setattr,
+                                  object, name, reason);
+
+  args[1] = checker;
+  args[2] = object;
+  args[3] = name;
+  r = PyObject_VectorcallMethod(setattr ? str_check_setattr : str_check,
+                                args + 1, 3 | PY_VECTORCALL_ARGUMENTS_OFFSET,
+                                NULL);
+  if (r != NULL)
+    {
+      Py_DECREF(r);
+      return DECISION_ALLOWED;
+    }
+
+  if (PyErr_ExceptionMatches(ForbiddenAttribute))
+    setattr = DECISION_FORBIDDEN;
+  else if (PyErr_ExceptionMatches(Unauthorized))
+    setattr = DECISION_UNAUTHORIZED;
+  else
+    return -1;
+
+  PyErr_Fetch(&type, &value, &tb);
+  PyErr_NormalizeException(&type, &value, &tb);
+  if (tb != NULL)
+    {
+      PyException_SetTraceback(value, tb);
+      Py_DECREF(tb);
+    }
+  Py_DECREF(type);
+  *reason = value;
+  return setattr;
+}
+
+static int
+CombinedChecker_check_int(CombinedChecker *self,
+                          PyObject *object, PyObject *name)
+{
+  PyObject *reason=NULL;
+  int result;
+
+  result = CombinedChecker_decide(self, 0, object, name, &reason);
+  TRACE(self, str_check, object, name, result);
+  result = raiseDecision(result, reason, object, name);
+  Py_XDECREF(reason);
+  return result;
+}
+
+static PyObject *
+CombinedChecker_check(CombinedChecker *self, PyObject *args)
+{
+  PyObject *object, *name;
+
+  if (!PyArg_ParseTuple(args, "OO", &object, &name))
+    return NULL;
+
+  if (CombinedChecker_check_int(self, object, name) < 0)
+    return NULL;
+
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+
+static PyObject *
+CombinedChecker_check_setattr(CombinedChecker *self, PyObject *args)
+{
+  PyObject *object, *name, *reason=NULL;
+  int result;
+
+  if (!PyArg_ParseTuple(args, "OO", &object, &name))
+    return NULL;
+
+  result = CombinedChecker_decide(self, 1, object, name, &reason);
+  TRACE(self, str_check_setattr, object, name, result);
+  result = raiseDecision(result, reason, object, name);
+  Py_XDECREF(reason);
+  if (result < 0)
+    return NULL;
+
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+
+static PyObject *
+CombinedChecker_allowed(CombinedChecker *self, PyObject *args)
+{
+  PyObject *object, *name, *reason=NULL;
+  int decision;
+
+  if (!PyArg_ParseTuple(args, "OO", &object, &name))
+    return NULL;
+
+  decision = CombinedChecker_decide(self, 0, object, name, &reason);
+  return decisionResult(decision, reason);
+}
+
+static PyObject *
+CombinedChecker_allowed_setattr(CombinedChecker *self, PyObject *args)
+{
+  PyObject *object, *name, *reason=NULL;
+  int decision;
+
+  if (!PyArg_ParseTuple(args, "OO", &object, &name))
+    return NULL;
+
+  decision = CombinedChecker_decide(self, 1, object, name, &reason);
+  return decisionResult(decision, reason);
+}
+
+static struct PyMethodDef CombinedChecker_methods[] = {
+  {"check_getattr", (PyCFunction)CombinedChecker_check, METH_VARARGS,
+   "check_getattr(object, name) -- Check whether a getattr is allowed"},
+  {"check_setattr", (PyCFunction)CombinedChecker_check_setattr, METH_VARARGS,
+   "check_setattr(object, name) -- Check whether a setattr is allowed"},
+  {"check", (PyCFunction)CombinedChecker_check, METH_VARARGS,
+   "check(object, opname) -- Check whether an operation is allowed"},
+  {"allowed", (PyCFunction)CombinedChecker_allowed, METH_VARARGS,
+   "allowed(object, name) -- Return True if a getattr is allowed,\n"
+   "False if it is unauthorized and None if it is forbidden"},
+  {"allowed_setattr", (PyCFunction)CombinedChecker_allowed_setattr,
+   METH_VARARGS,
+   "allowed_setattr(object, name) -- Return True if a setattr is allowed,\n"
+   "False if it is unauthorized and None if it is forbidden"},
+
+  {NULL,  NULL}     /* sentinel */
+};
+
+static int
+CombinedChecker_clear(CombinedChecker *self)
+{
+  CLEAR(self->checkers);
+  return Checker_clear((Checker*)self);
+}
+
+static void
+CombinedChecker_dealloc(CombinedChecker *self)
+{
+  PyObject_GC_UnTrack((PyObject*)self);
+  CombinedChecker_clear(self);
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static int
+CombinedChecker_traverse(CombinedChecker *self, visitproc visit, void *arg)
+{
+  Py_VISIT(self->checkers);
+  return Checker_traverse((Checker*)self, visit, arg);
+}
+
+static int
+CombinedChecker_init(CombinedChecker *self, PyObject *args, PyObject *kwds)
+{
+  PyObject *getperms, *setperms, *checkers;
+  int result = -1;
+
+  if (kwds != NULL && PyDict_GET_SIZE(kwds))
+    {
+      PyErr_SetString(PyExc_TypeError,
+                      "CombinedChecker() takes no keyword arguments");
+      return -1;
+    }
+  if (PyTuple_GET_SIZE(args) < 2)
+    {
+      PyErr_SetString(PyExc_TypeError,
+                      "CombinedChecker() requires at least two checkers");
+      return -1;
+    }
+
+  getperms = PyObject_GetAttr(PyTuple_GET_ITEM(args, 0), str_get_permissions);
+  if (getperms == NULL)
+    return -1;
+  setperms = PyObject_GetAttr(PyTuple_GET_ITEM(args, 0), str_set_permissions);
+  if (setperms == NULL)
+    goto err;
+  if (! PyDict_Check(getperms) || ! PyDict_Check(setperms))
+    {
+      PyErr_SetString(PyExc_TypeError,
+                      "permissions of the first checker must be dicts");
+      goto err;
+    }
+  checkers = PyTuple_GetSlice(args, 1, PyTuple_GET_SIZE(args));
+  if (checkers == NULL)
+    goto err;
+
+  CLEAR(self->checker.getperms);
+  CLEAR(self->checker.setperms);
+  CLEAR(self->checkers);
+  self->checker.getperms = getperms;
+  self->checker.setperms = setperms;
+  self->checkers = checkers;
+  return 0;
+
+ err:
+  Py_DECREF(getperms);
+  Py_XDECREF(setperms);
+  return result;
+}
+
+static PyMappingMethods CombinedChecker_as_mapping = {
+    /* mp_length        */ NULL,
+    /* mp_subscript     */ (binaryfunc)Checker_proxy,
+    /* mp_ass_subscript */ (objobjargproc)CombinedChecker_check_int,
+};
+
+static PyTypeObject CombinedCheckerType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "zope.security.checker.CombinedChecker",
+    sizeof(CombinedChecker),
+    0,                                  /* tp_itemsize       */
+    (destructor)&CombinedChecker_dealloc, /* tp_dealloc      */
+    0,                                  /* tp_print          */
+    0,                                  /* tp_getattr        */
+    0,                                  /* tp_setattr        */
+    0,                                  /* tp_compare        */
+    0,                                  /* tp_repr           */
+    0,                                  /* tp_as_number      */
+    0,                                  /* tp_as_sequence    */
+    &CombinedChecker_as_mapping,        /* tp_as_mapping     */
+    0,                                  /* tp_hash           */
+    0,                                  /* tp_call           */
+    0,                                  /* tp_str            */
+    0,                                  /* tp_getattro       */
+    0,                                  /* tp_setattro       */
+    0,                                  /* tp_as_buffer      */
+    Py_TPFLAGS_DEFAULT |
+    Py_TPFLAGS_BASETYPE |
+    Py_TPFLAGS_HAVE_GC,                 /* tp_flags          */
+    "A checker that combines other checkers in a logical-or fashion",
+                                        /* tp_doc            */
+    (traverseproc)CombinedChecker_traverse, /* tp_traverse   */
+    (inquiry)CombinedChecker_clear,     /* tp_clear          */
+    0,                                  /* tp_richcompare    */
+    0,                                  /* tp_weaklistoffset */
+    0,                                  /* tp_iter           */
+    0,                                  /* tp_iternext       */
+    CombinedChecker_methods,            /* tp_methods        */
+    0,                                  /* tp_members        */
+    0,                                  /* tp_getset         */
+    &CheckerType,                       /* tp_base           */
+    0, /* internal use */               /* tp_dict           */
+    0,                                  /* tp_descr_get      */
+    0,                                  /* tp_descr_set      */
+    0,                                  /* tp_dictoffset     */
+    (initproc)CombinedChecker_init,     /* tp_init           */
+    0,                                  /* tp_alloc          */
+    0,                                  /* tp_new            */
+    0, /* Low-level free-mem routine */ /* tp_free           */
+    0, /* For PyObject_IS_GC */         /* tp_is_gc          */
+};
+
+
+
+
 /* def selectChecker(object): */
 /*     """Get a checker for the given object */
 /*     The appropriate checker is returned or None is returned. If the */
 /*     return value is None, then object should not be wrapped in a proxy. */
 /*     """ */
 
+/* Tuples and frozensets of at most valueCollectionMax elements are
+   left unproxied if all their elements are of types with the checker
+   NoProxy, or are security proxies.  The limit is set with
+   _setValueCollectionMax() (see setValueCollectionMax() in
+   checker.py). */
+static Py_ssize_t valueCollectionMax = 0;
+
+static int
+isValue(PyObject *value)
+{
+  if ((PyObject*)Py_TYPE(value) == Proxy)
+    return 1;
+  return PyDict_GetItem(_checkers, (PyObject*)Py_TYPE(value)) == NoProxy;
+}
+
+static int
+isValueCollection(PyObject *collection)
+{
+  PyObject *iterator, *value;
+  Py_ssize_t i, size;
+  int result = 1;
+
+  if (PyTuple_CheckExact(collection))
+    {
+      size = PyTuple_GET_SIZE(collection);
+      if (size > valueCollectionMax)
+        return 0;
+      for (i = 0; i < size; i++)
+        if (! isValue(PyTuple_GET_ITEM(collection, i)))
+          return 0;
+      return 1;
+    }
+
+  if (PySet_GET_SIZE(collection) > valueCollectionMax)
+    return 0;
+  iterator = PyObject_GetIter(collection);
+  if (iterator == NULL)
+    return -1;
+  while (result == 1 && (value = PyIter_Next(iterator)) != NULL)
+    {
+      result = isValue(value);
+      Py_DECREF(value);
+    }
+  Py_DECREF(iterator);
+  if (PyErr_Occurred())
+    return -1;
+  return result;
+}
+
 static char selectChecker_doc[] =
 "Get a checker for the given object\n"
 "\n"
@@ -501,18 +1302,48 @@ static PyObject *
 selectChecker(PyObject *ignored, PyObject *object)
 {
   PyObject *checker;
+  int is_value;
+
+/*     type_ = type(object) */
+/*     if ((type_ is tuple or type_ is frozenset) */
+/*             and _isValueCollection(object)): */
+/*         return None */
+
+  if (valueCollectionMax > 0
+      && (PyTuple_CheckExact(object) || PyFrozenSet_CheckExact(object)))
+    {
+      is_value = isValueCollection(object);
+      if (is_value < 0)
+        return NULL;
+      if (is_value)
+        {
+          Py_INCREF(Py_None);
+          return Py_None;
+        }
+    }
 
-/*     checker = _getChecker(type(object), _defaultChecker) */
+/*     checker = _getChecker(type_) */
 
   checker = PyDict_GetItem(_checkers, (PyObject*)Py_TYPE(object));
+
+/*     if checker is None: */
+/*         checker = _value_type_checkers.get(type_, _defaultChecker) */
+
   if (checker == NULL)
-    checker = _defaultChecker;
+    {
+      checker = PyDict_GetItem(_value_type_checkers,
+                               (PyObject*)Py_TYPE(object));
+      if (checker == NULL)
+        checker = _defaultChecker;
+    }
+  Py_INCREF(checker);
 
 /*     if checker is NoProxy: */
 /*         return None */
 
   if (checker == NoProxy)
     {
+      Py_DECREF(checker);
       Py_INCREF(Py_None);
       return Py_None;
     }
@@ -523,6 +1354,7 @@ selectChecker(PyObject *ignored, PyObject *object)
   if (checker == _defaultChecker
       && PyObject_IsInstance(object, PyExc_Exception))
     {
+      Py_DECREF(checker);
       Py_INCREF(Py_None);
       return Py_None;
     }
@@ -532,11 +1364,10 @@ selectChecker(PyObject *ignored, PyObject *object)
 /*         if checker is NoProxy or checker is None: */
 /*             return None */
 
-  Py_INCREF(checker);
   while (! PyObject_TypeCheck(checker, &CheckerType))
     {
       PyObject *newchecker;
-      newchecker = PyObject_CallFunctionObjArgs(checker, object, NULL);
+      newchecker = PyObject_CallOneArg(checker, object);
       Py_DECREF(checker);
       if (newchecker == NULL)
         return NULL;
@@ -554,6 +1385,37 @@ selectChecker(PyObject *ignored, PyObject *object)
   return checker;
 }
 
+static PyObject *
+module_setTrace(PyObject *ignored, PyObject *new_trace)
+{
+  PyObject *old = trace;
+
+  if (new_trace == Py_None)
+    trace = NULL;
+  else
+    {
+      Py_INCREF(new_trace);
+      trace = new_trace;
+    }
+  Py_XDECREF(old);
+
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+
+static PyObject *
+module_setValueCollectionMax(PyObject *ignored, PyObject *size)
+{
+  Py_ssize_t new_size = PyNumber_AsSsize_t(size, PyExc_OverflowError);
+
+  if (new_size == -1 && PyErr_Occurred())
+    return NULL;
+  valueCollectionMax = new_size;
+
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+
 static char
 module___doc__[] = "C optimizations for zope.security.checker";
 
@@ -561,6 +1423,16 @@ module___doc__[] = "C optimizations for zope.security.checker";
 static PyMethodDef
 module_functions[] = {
   {"selectChecker", (PyCFunction)selectChecker, METH_O, selectChecker_doc},
+  {"_newProxyMap", module_newProxyMap, METH_NOARGS,
+   "Create a proxy identity map for the current thread"},
+  {"_endProxyMap", module_endProxyMap, METH_NOARGS,
+   "Discard the proxy identity map of the current thread"},
+  {"_getProxyMap", module_getProxyMap, METH_NOARGS,
+   "Return the proxy identity map of the current thread, or None"},
+  {"_setTrace", module_setTrace, METH_O,
+   "Set the function called with the outcome of every check, or None"},
+  {"_setValueCollectionMax", module_setValueCollectionMax, METH_O,
+   "Set the size of the largest tuples and frozensets left unproxied"},
   {NULL}  /* Sentinel */
 };
 
@@ -568,6 +1440,7 @@ MOD_INIT(_zope_security_checker)
 {
   PyObject* m;
   PyObject* mod;
+  PyObject* capi;
 
   MOD_DEF(mod, "_zope_security_checker", module___doc__, module_functions)
 
@@ -582,6 +1455,12 @@ MOD_INIT(_zope_security_checker)
     return MOD_ERROR_VAL;
   }
 
+  CombinedCheckerType.tp_new = PyType_GenericNew;
+  if (PyType_Ready(&CombinedCheckerType) < 0)
+  {
+    return MOD_ERROR_VAL;
+  }
+
   _defaultChecker = PyObject_CallFunction((PyObject*)&CheckerType, "{}");
   if (_defaultChecker == NULL)
   {
@@ -591,15 +1470,27 @@ MOD_INIT(_zope_security_checker)
 #define INIT_STRING(S) \
 if((str_##S = INTERN(#S)) == NULL) return MOD_ERROR_VAL
 
+  INIT_STRING(check);
   INIT_STRING(checkPermission);
+  INIT_STRING(check_setattr);
+  INIT_STRING(get_permissions);
+  INIT_STRING(set_permissions);
   INIT_STRING(__Security_checker__);
   INIT_STRING(interaction);
+  INIT_STRING(__iter__);
+  INIT_STRING(proxy_map);
+  INIT_STRING(__dict__);
 
   if ((_checkers = PyDict_New()) == NULL)
   {
     return MOD_ERROR_VAL;
   }
 
+  if ((_value_type_checkers = PyDict_New()) == NULL)
+  {
+    return MOD_ERROR_VAL;
+  }
+
   NoProxy = PyObject_CallObject((PyObject*)&PyBaseObject_Type, NULL);
   if (NoProxy == NULL)
   {
@@ -614,6 +1505,18 @@ if((str_##S = INTERN(#S)) == NULL) return MOD_ERROR_VAL
   {
     return MOD_ERROR_VAL;
   }
+  /* Not PyCapsule_Import: zope.security is still being imported. */
+  if ((capi = PyObject_GetAttrString(m, "_trusted_region_CAPI")) == NULL)
+  {
+    return MOD_ERROR_VAL;
+  }
+  inTrustedRegion = (int (*)(void))PyCapsule_GetPointer(
+    capi, "zope.security._proxy._trusted_region_CAPI");
+  Py_DECREF(capi);
+  if (inTrustedRegion == NULL)
+  {
+    return MOD_ERROR_VAL;
+  }
   Py_DECREF(m);
 
   if ((m = PyImport_ImportModule("zope.security._definitions")) == NULL)
@@ -642,6 +1545,10 @@ if((str_##S = INTERN(#S)) == NULL) return MOD_ERROR_VAL
     return MOD_ERROR_VAL;
   }
   Py_DECREF(m);
+#if PY_VERSION_HEX >= 0x030C0000
+  base_exception_init = ((PyTypeObject *)PyExc_BaseException)->tp_init;
+  attribute_error_init = ((PyTypeObject *)PyExc_AttributeError)->tp_init;
+#endif
 
   if ((m = PyImport_ImportModule("zope.security.checker")) == NULL)
   {
@@ -662,6 +1569,7 @@ if((str_##S = INTERN(#S)) == NULL) return MOD_ERROR_VAL
 #define EXPORT(N) Py_INCREF(N); PyModule_AddObject(mod, #N, N)
 
   EXPORT(_checkers);
+  EXPORT(_value_type_checkers);
   EXPORT(NoProxy);
   EXPORT(_defaultChecker);
   EXPORT(_available_by_default);
@@ -669,5 +1577,8 @@ if((str_##S = INTERN(#S)) == NULL) return MOD_ERROR_VAL
   Py_INCREF(&CheckerType);
   PyModule_AddObject(mod, "Checker", (PyObject *)&CheckerType);
 
+  Py_INCREF(&CombinedCheckerType);
+  PyModule_AddObject(mod, "CombinedChecker", (PyObject *)&CombinedCheckerType);
+
   return MOD_SUCCESS_VAL(mod);
 }
@@ -0,0 +1,131 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Checkers for the data structures of :mod:`BTrees`.
+
+Out of the box, only the iterators of BTrees have checkers; BTrees,
+buckets, sets and tree sets themselves get the default checker, which
+allows nothing. :func:`defineBTreeCheckers` registers read-only
+checkers for all of them, in every module of every BTrees family, so
+that untrusted code can look values up, iterate and make range
+queries such as ``keys(min, max)`` without removing security proxies.
+"""
+import types
+
+
+__all__ = [
+    'defineBTreeCheckers',
+]
+
+# The names allowed on BTrees and buckets.
+_MAPPING_NAMES = (
+    '__getitem__', '__contains__', '__iter__', '__len__', '__bool__',
+    'get', 'has_key', 'keys', 'values', 'items',
+    'iterkeys', 'itervalues', 'iteritems',
+    'minKey', 'maxKey', 'byValue',
+    '__and__', '__or__', '__sub__', '__rand__', '__ror__', '__rsub__',
+)
+
+# The names allowed on sets and tree sets.
+_SET_NAMES = (
+    '__getitem__', '__contains__', '__iter__', '__len__', '__bool__',
+    'has_key', 'keys', 'minKey', 'maxKey', 'isdisjoint',
+    '__and__', '__or__', '__sub__', '__xor__',
+    '__rand__', '__ror__', '__rsub__', '__rxor__',
+)
+
+# The names allowed on the results of keys(), values() and items().
+_ITEMS_NAMES = (
+    '__getitem__', '__contains__', '__iter__', '__len__', '__bool__',
+)
+
+
+def _modules():
+    # The modules of both families, each once.
+    import BTrees
+    modules = {}
+    for family in (BTrees.family32, BTrees.family64):
+        for name in dir(family):
+            module = getattr(family, name)
+            if isinstance(module, types.ModuleType):
+                modules[module.__name__] = module
+    return [modules[name] for name in sorted(modules)]
+
+
+def _types(module, names):
+    # The C and Python implementations of the named types of *module*.
+    for name in names:
+        for suffix in ('', 'Py'):
+            type_ = getattr(module, name + suffix, None)
+            if isinstance(type_, type):
+                yield type_
+
+
+def _itemsTypes():
+    for module in _modules():
+        yield from _types(module, ('TreeItems',))
+
+
+def _iteratorTypes():
+    for module in _modules():
+        yield from _types(module, [name for name in dir(module)
+                                   if name.endswith('TreeIterator')])
+
+
+def _defineChecker(type_, checker):
+    # Define *checker* for *type_*, unless it already has a checker
+    # other than the one zope.security defines for it by default.
+    from zope.security.checker import _default_checkers
+    from zope.security.checker import defineChecker
+    from zope.security.checker import getCheckerForInstancesOf
+    from zope.security.checker import undefineChecker
+
+    existing = getCheckerForInstancesOf(type_)
+    if existing is not None:
+        if existing is not _default_checkers.get(type_):
+            return
+        undefineChecker(type_)
+    defineChecker(type_, checker)
+
+
+def defineBTreeCheckers():
+    """
+    Define read-only checkers for the BTrees, buckets, sets and tree
+    sets of all the BTrees families, for the results of their
+    ``keys()``, ``values()`` and ``items()`` methods and for their
+    iterators.
+
+    Both the C and the Python implementations are covered. Types that
+    already have a checker, other than one zope.security defines by
+    default, are left alone, so applications can still protect some
+    of these types differently, and calling this more than once is
+    harmless.
+
+    .. versionadded:: 8.5
+    """
+    from zope.security.checker import NamesChecker
+    from zope.security.checker import _iteratorChecker
+
+    mapping_checker = NamesChecker(_MAPPING_NAMES)
+    set_checker = NamesChecker(_SET_NAMES)
+    items_checker = NamesChecker(_ITEMS_NAMES)
+    for module in _modules():
+        for names, checker in ((('BTree', 'Bucket'), mapping_checker),
+                               (('Set', 'TreeSet'), set_checker)):
+            for type_ in _types(module, names):
+                _defineChecker(type_, checker)
+    for type_ in _itemsTypes():
+        _defineChecker(type_, items_checker)
+    for type_ in _iteratorTypes():
+        _defineChecker(type_, _iteratorChecker)
@@ -43,6 +43,10 @@ messages about granted attribute access.
 Note that the ``ZOPE_WATCH_CHECKERS`` mechanism may eventually be
 replaced with a more general security auditing mechanism.
 
+The same output can be switched on and off at runtime, for example
+in a running process, with :func:`setWatching`. To observe checks in
+other ways, install a trace function with :func:`setCheckTrace`.
+
 .. seealso:: :class:`CheckerLoggingMixin`
 .. seealso:: :class:`WatchingChecker`
 .. seealso:: :class:`WatchingCombinedChecker`
@@ -60,10 +64,15 @@ API
 import abc
 import datetime
 import decimal
+import fractions
+import functools
 import io
+import ipaddress
 import os
 import sys
 import types
+import uuid
+import warnings
 import weakref
 
 import zope.interface.declarations
@@ -85,6 +94,7 @@ from zope.security.interfaces import INameBasedChecker
 from zope.security.interfaces import ISecurityProxyFactory
 from zope.security.interfaces import Unauthorized
 from zope.security.proxy import Proxy
+from zope.security.proxy import _inTrustedRegion
 from zope.security.proxy import getChecker
 
 
@@ -102,6 +112,38 @@ if os.environ.get('ZOPE_WATCH_CHECKERS'):  # pragma: no cover
     except ValueError:
         WATCH_CHECKERS = 1
 
+AUDIT_VALUE_TYPES = bool(os.environ.get('ZOPE_AUDIT_VALUE_TYPES'))
+
+#: The size of the largest tuples and frozensets left unproxied
+#: because all their elements are (see :func:`setValueCollectionMax`).
+VALUE_COLLECTION_MAX = 32
+
+if os.environ.get('ZOPE_VALUE_COLLECTION_MAX'):  # pragma: no cover
+    VALUE_COLLECTION_MAX = int(os.environ.get('ZOPE_VALUE_COLLECTION_MAX'))
+
+#: The results of ``allowed`` and ``allowed_setattr`` on checkers.
+ALLOWED = True
+UNAUTHORIZED = False
+FORBIDDEN = None
+
+
+def _newProxyMapPy():
+    if getattr(thread_local, 'proxy_map', None) is None:
+        thread_local.proxy_map = {}
+
+
+def _endProxyMapPy():
+    thread_local.__dict__.pop('proxy_map', None)
+
+
+def _getProxyMapPy():
+    return getattr(thread_local, 'proxy_map', None)
+
+
+_newProxyMap = _newProxyMapPy  # in case no C optimizations
+_endProxyMap = _endProxyMapPy
+_getProxyMap = _getProxyMapPy
+
 
 def ProxyFactory(object, checker=None):
     """Factory function that creates a proxy for an object
@@ -121,6 +163,14 @@ def ProxyFactory(object, checker=None):
             # can call ProxyFactory.
             raise TypeError("Tried to use ProxyFactory to change a Proxy's"
                             " checker.")
+    proxies = _getProxyMap()
+    if proxies is not None:
+        # Proxies with a looked up checker are shared with checker.proxy().
+        key = id(object) if checker is None else (id(object), id(checker))
+        proxy = proxies.get(key)
+        if proxy is not None:
+            return proxy
+
     if checker is None:
         checker = getattr(object, '__Security_checker__', None)
 
@@ -129,7 +179,12 @@ def ProxyFactory(object, checker=None):
             if checker is None:
                 return object
 
-    return Proxy(object, checker)
+    proxy = Proxy(object, checker)
+    if proxies is not None:
+        # The proxy keeps the object and the checker, and with them
+        # their ids, alive.
+        proxies[key] = proxy
+    return proxy
 
 
 directlyProvides(ProxyFactory, ISecurityProxyFactory)
@@ -149,6 +204,15 @@ def canWrite(obj, name):
     """
     obj = ProxyFactory(obj)
     checker = getChecker(obj)
+    if type(checker) in _decidingCheckers:
+        # Avoid raising exceptions for the common denial cases.
+        allowed = checker.allowed_setattr(obj, name)
+        if allowed is not FORBIDDEN:
+            return allowed
+        # See below for why a forbidden write is not necessarily an error.
+        if checker.allowed(obj, name) is FORBIDDEN:
+            checker.check_getattr(obj, name)
+        return False
     try:
         checker.check_setattr(obj, name)
     except Unauthorized:
@@ -186,6 +250,12 @@ def canAccess(obj, name):
     # implementation, special names like __getitem__
     obj = ProxyFactory(obj)
     checker = getChecker(obj)
+    if type(checker) in _decidingCheckers:
+        # Avoid raising exceptions for the common denial cases.
+        allowed = checker.allowed(obj, name)
+        if allowed is not FORBIDDEN:
+            return allowed
+        # Let check_getattr raise the ForbiddenAttribute, see below.
     try:
         checker.check_getattr(obj, name)
     except Unauthorized:
@@ -240,6 +310,8 @@ class CheckerPy:
 
     def check_setattr(self, object, name):
         'See IChecker'
+        if _hooked:
+            return _hookedCheck(self, 'check_setattr', object, name)
         if self.set_permissions:
             permission = self.set_permissions.get(name)
         else:
@@ -259,6 +331,8 @@ class CheckerPy:
 
     def check(self, object, name):
         'See IChecker'
+        if _hooked:
+            return _hookedCheck(self, 'check', object, name)
         permission = self.get_permissions.get(name)
         if permission is not None:
             if permission is CheckerPublic:
@@ -277,17 +351,71 @@ class CheckerPy:
 
     check_getattr = check  # 'See IChecker'
 
+    def allowed(self, object, name):
+        """Decide a getattr check without raising an exception.
+
+        Return :data:`ALLOWED` if :meth:`check` would pass,
+        :data:`UNAUTHORIZED` if it would raise
+        :class:`~zope.security.interfaces.Unauthorized` and
+        :data:`FORBIDDEN` if it would raise
+        :class:`~zope.security.interfaces.ForbiddenAttribute`.
+        """
+        if _hooked and _inTrustedRegion():
+            return ALLOWED
+        permission = self.get_permissions.get(name)
+        if permission is not None:
+            if permission is CheckerPublic:
+                return ALLOWED
+            if thread_local.interaction.checkPermission(permission, object):
+                return ALLOWED
+            return UNAUTHORIZED
+        elif name in _available_by_default:
+            return ALLOWED
+
+        if name != '__iter__' or hasattr(object, name):
+            return FORBIDDEN
+        return ALLOWED
+
+    def allowed_setattr(self, object, name):
+        """Decide a setattr check without raising an exception.
+
+        See :meth:`allowed`.
+        """
+        if _hooked and _inTrustedRegion():
+            return ALLOWED
+        if self.set_permissions:
+            permission = self.set_permissions.get(name)
+        else:
+            permission = None
+
+        if permission is not None:
+            if permission is CheckerPublic:
+                return ALLOWED
+            if thread_local.interaction.checkPermission(permission, object):
+                return ALLOWED
+            return UNAUTHORIZED
+        return FORBIDDEN
+
     def proxy(self, value):
         'See IChecker'
         if isinstance(value, Proxy):
             return value
+        proxies = _getProxyMap()
+        if proxies is not None:
+            proxy = proxies.get(id(value))
+            if proxy is not None:
+                return proxy
         checker = getattr(value, '__Security_checker__', None)
         if checker is None:
             checker = selectChecker(value)
             if checker is None:
                 return value
 
-        return Proxy(value, checker)
+        proxy = Proxy(value, checker)
+        if proxies is not None:
+            # The proxy keeps the value, and with it its id, alive.
+            proxies[id(value)] = proxy
+        return proxy
 
 
 Checker = CheckerPy  # in case no C optimizations
@@ -445,15 +573,22 @@ def selectCheckerPy(object):
     #    # Is this already a security proxy?
     #    return None
 
-    checker = _getChecker(type(object), _defaultChecker)
+    type_ = type(object)
+    if (type_ is tuple or type_ is frozenset) and _isValueCollection(object):
+        return None
+
+    checker = _getChecker(type_)
 
     # checker = _getChecker(getattr(object, '__class__', type(object)),
     #                      _defaultChecker)
 
+    if checker is None:
+        checker = _value_type_checkers.get(type_, _defaultChecker)
+
     if checker is NoProxy:
         return None
 
-    while not isinstance(checker, Checker):
+    while not isinstance(checker, _BaseChecker):
         checker = checker(object)
 
         if checker is NoProxy or checker is None:
@@ -484,10 +619,26 @@ def defineChecker(type_, checker):
     if type_ in _checkers:
         raise DuplicationError(type_)
     _checkers[type_] = checker
+    _checkersChanged()
 
 
 def undefineChecker(type_):
     del _checkers[type_]
+    _checkersChanged()
+
+
+# Combined checkers created for security decorators, keyed by
+# (wrapper type, inner checker).
+# See zope.security.decorator.DecoratedSecurityCheckerDescriptor.
+# The cache is bounded; it is simply emptied when it grows too large
+# and whenever the checker registry changes.
+_combinedCheckers = {}
+_COMBINED_CHECKERS_MAX = 1000
+
+
+def _checkersChanged():
+    """Discard state derived from the checker registry."""
+    _combinedCheckers.clear()
 
 
 NoProxy = object()
@@ -504,6 +655,10 @@ NoProxy = object()
 #
 _checkers = {}
 
+# The checkers selectChecker uses for the ValueTypes without checkers
+# in _checkers, built from ValueTypes by _valueTypesChanged().
+_value_type_checkers = {}
+
 _defaultChecker = Checker({})
 _available_by_default = []
 
@@ -521,16 +676,107 @@ if _c_available:  # pragma: no cover
     from zope.security._zope_security_checker import _available_by_default
     from zope.security._zope_security_checker import _checkers
     from zope.security._zope_security_checker import _defaultChecker
+    from zope.security._zope_security_checker import _endProxyMap  # noqa: F401
+    from zope.security._zope_security_checker import _getProxyMap
+    from zope.security._zope_security_checker import _newProxyMap  # noqa: F401
+    from zope.security._zope_security_checker import _setTrace
+    from zope.security._zope_security_checker import _setValueCollectionMax
+    from zope.security._zope_security_checker import _value_type_checkers
     from zope.security._zope_security_checker import selectChecker
     zope.interface.classImplements(Checker, INameBasedChecker)
 
+# Checker may be replaced by WatchingChecker below; checker factories
+# are told apart from checkers using the original class.
+_BaseChecker = Checker
 
 _getChecker = _checkers.get
 
+_trace = None
+
+# Set once a trusted region is entered or a trace function is set.
+# Until then, the checks of CheckerPy consider neither, at the cost of
+# testing this flag.
+_hooked = False
+
+
+def _hookChecks():
+    global _hooked
+    _hooked = True
+
+
+def _hookedCheck(checker, operation, object, name):
+    # The checks of CheckerPy once _hooked is set. Like the C Checker,
+    # decide, trace the decision and raise.
+    if operation == 'check':
+        decision = CheckerPy.allowed(checker, object, name)
+    else:
+        decision = CheckerPy.allowed_setattr(checker, object, name)
+    trace = _trace
+    if trace is not None:
+        trace(checker, operation, object, name, decision)
+    if decision is ALLOWED:
+        return
+    __traceback_supplement__ = (TracebackSupplement, object)
+    if decision is UNAUTHORIZED:
+        if operation == 'check':
+            permission = checker.get_permissions.get(name)
+        else:
+            permission = checker.set_permissions.get(name)
+        raise Unauthorized(object, name, permission)
+    raise ForbiddenAttribute(name, object)
+
+
+def setCheckTrace(trace):
+    """
+    Set the function called with the outcome of every check.
+
+    After each call of the ``check``, ``check_getattr`` or
+    ``check_setattr`` method of a :class:`Checker` or
+    :class:`CombinedChecker` (including the checks the C security
+    proxy makes), *trace* is called with the checker, the name of
+    the operation (``'check'`` for getting attributes and other
+    operations, ``'check_setattr'`` for setting attributes), the
+    object, the name and the outcome: :data:`ALLOWED`,
+    :data:`UNAUTHORIZED` or :data:`FORBIDDEN`. Exceptions raised by
+    *trace* are propagated to the caller of the check. Checks made by
+    a combined checker through the checkers it combines may be traced
+    as well. ``allowed`` and ``allowed_setattr`` are not traced.
+
+    Unlike :class:`WatchingChecker`, this needs no special checker
+    classes and can be switched on and off at any time. Tracing is
+    process-wide; pass None to turn it off. While it is off, it costs
+    next to nothing.
+
+    Returns the previous trace function, or None.
+
+    .. versionadded:: 8.5
+    """
+    global _trace
+    previous = _trace
+    _trace = trace
+    if trace is not None:
+        _hookChecks()
+    if _c_available:  # pragma: no cover
+        _setTrace(trace)
+    return previous
+
+
+def _traceCheck(checker, check, operation, object, name):
+    trace = _trace
+    try:
+        check(object, name)
+    except Unauthorized:
+        trace(checker, operation, object, name, UNAUTHORIZED)
+        raise
+    except ForbiddenAttribute:
+        trace(checker, operation, object, name, FORBIDDEN)
+        raise
+    trace(checker, operation, object, name, ALLOWED)
+
 
 @implementer_if_needed(IChecker)
-class CombinedChecker(Checker):
-    """A checker that combines two other checkers in a logical-or fashion.
+class CombinedCheckerPy(Checker):
+    """A checker that combines other checkers in a logical-or fashion.
 
     The following table describes the result of a combined checker in detail.
 
@@ -551,41 +797,116 @@ class CombinedChecker(Checker):
     +--------------------+--------------------+-------------------------------------+
     | ForbiddenAttribute | ForbiddenAttribute | ForbiddenAttribute                  |
     +--------------------+--------------------+-------------------------------------+
+
+    More than two checkers may be combined. They are consulted in
+    order until one of them allows access. If none does, the first
+    ``Unauthorized`` is raised, or else the last ``ForbiddenAttribute``.
+
+    This is the Python reference implementation. Ordinarily there will
+    be no reason to ever explicitly use this class; instead use the class
+    assigned to :class:`CombinedChecker`.
     """  # noqa: E501 line too long
 
-    def __init__(self, checker1, checker2):
+    def __init__(self, checker1, checker2, *checkers):
         """Create a combined checker."""
         Checker.__init__(self,
                          checker1.get_permissions,
                          checker1.set_permissions)
 
-        self._checker2 = checker2
+        self._checkers = (checker2,) + checkers
 
-    def check(self, object, name):
-        'See IChecker'
+    def _combined(self, own_check, method, object, name):
+        unauthorized = None
         try:
-            Checker.check(self, object, name)
+            own_check(object, name)
         except ForbiddenAttribute:
-            self._checker2.check(object, name)
+            pass
         except Unauthorized as unauthorized_exception:
+            unauthorized = unauthorized_exception
+        else:
+            return
+
+        for checker in self._checkers:
             try:
-                self._checker2.check(object, name)
-            except ForbiddenAttribute:
-                raise unauthorized_exception
+                getattr(checker, method)(object, name)
+            except ForbiddenAttribute as forbidden_exception:
+                forbidden = forbidden_exception
+            except Unauthorized as unauthorized_exception:
+                if unauthorized is None:
+                    unauthorized = unauthorized_exception
+            else:
+                return
+
+        if unauthorized is not None:
+            raise unauthorized
+        raise forbidden
+
+    def check(self, object, name):
+        'See IChecker'
+        if _trace is None:
+            return self._combined(super().check, 'check', object, name)
+        _traceCheck(self, self._checkCombined, 'check', object, name)
 
     check_getattr = __setitem__ = check
 
+    def _checkCombined(self, object, name):
+        self._combined(super().check, 'check', object, name)
+
     def check_setattr(self, object, name):
         'See IChecker'
-        try:
-            Checker.check_setattr(self, object, name)
-        except ForbiddenAttribute:
-            self._checker2.check_setattr(object, name)
-        except Unauthorized as unauthorized_exception:
-            try:
-                self._checker2.check_setattr(object, name)
-            except ForbiddenAttribute:
-                raise unauthorized_exception
+        if _trace is None:
+            return self._combined(super().check_setattr, 'check_setattr',
+                                  object, name)
+        _traceCheck(self, self._checkSetattrCombined, 'check_setattr',
+                    object, name)
+
+    def _checkSetattrCombined(self, object, name):
+        self._combined(super().check_setattr, 'check_setattr',
+                       object, name)
+
+    def _combined_allowed(self, own_allowed, method, check, object, name):
+        result = own_allowed(object, name)
+        if result is ALLOWED:
+            return result
+        for checker in self._checkers:
+            if type(checker) in _decidingCheckers:
+                allowed = getattr(checker, method)(object, name)
+            else:
+                try:
+                    getattr(checker, check)(object, name)
+                except ForbiddenAttribute:
+                    allowed = FORBIDDEN
+                except Unauthorized:
+                    allowed = UNAUTHORIZED
+                else:
+                    allowed = ALLOWED
+            if allowed is ALLOWED:
+                return allowed
+            if allowed is UNAUTHORIZED:
+                result = allowed
+        return result
+
+    def allowed(self, object, name):
+        'See Checker.allowed'
+        return self._combined_allowed(super().allowed, 'allowed', 'check',
+                                      object, name)
+
+    def allowed_setattr(self, object, name):
+        'See Checker.allowed_setattr'
+        return self._combined_allowed(super().allowed_setattr,
+                                      'allowed_setattr', 'check_setattr',
+                                      object, name)
+
+
+CombinedChecker = CombinedCheckerPy  # in case no C optimizations
+
+if _c_available:  # pragma: no cover
+    from zope.security._zope_security_checker import CombinedChecker
+
+# The checker types whose ``allowed`` and ``allowed_setattr`` are known
+# to agree with their check methods. Subclasses may override the checks
+# (and watching checkers log them), so they are always checked.
+_decidingCheckers = {CheckerPy, Checker, CombinedCheckerPy, CombinedChecker}
 
 
 class CheckerLoggingMixin:
@@ -680,7 +1001,7 @@ class WatchingChecker(CheckerLoggingMixin, Checker):
     verbosity = WATCH_CHECKERS
 
 
-class WatchingCombinedChecker(CombinedChecker, WatchingChecker):
+class WatchingCombinedChecker(CombinedCheckerPy, WatchingChecker):
     """
     A checker that will perform verbose logging. This will be set
     as the default when ``ZOPE_WATCH_CHECKERS`` is set when this
@@ -696,12 +1017,59 @@ if WATCH_CHECKERS:  # pragma: no cover
     # it as a Checker.
     # See https://github.com/zopefoundation/zope.security/issues/8
     Checker = WatchingChecker
-    CombinedChecker = WatchingCombinedChecker
+    CombinedChecker = WatchingCombinedChecker  # noqa: F811 redefinition
 
     if not _c_available:
         _defaultChecker.__class__ = Checker
 
 
+_watching = 0
+
+
+def setWatching(level):
+    """
+    Switch the verbose logging of checks on or off at runtime.
+
+    *level* has the same meaning as the ``ZOPE_WATCH_CHECKERS``
+    environment variable: 0 turns logging off, 1 logs unauthorized
+    and forbidden checks, and larger numbers also log granted checks.
+    The messages are those of :class:`CheckerLoggingMixin`.
+
+    This affects all existing checkers. If ``ZOPE_WATCH_CHECKERS``
+    was set when this module was imported, it changes the
+    ``verbosity`` of :class:`WatchingChecker` and
+    :class:`WatchingCombinedChecker`. Otherwise it installs a trace
+    function with :func:`setCheckTrace` (replacing any other one), or
+    removes it for level 0.
+
+    .. versionadded:: 8.5
+    """
+    global _watching
+    if Checker is WatchingChecker:
+        WatchingChecker.verbosity = level
+        WatchingCombinedChecker.verbosity = level
+        return
+    _watching = level
+    setCheckTrace(_logCheck if level else None)
+
+
+def _logCheck(checker, operation, object, name, result):
+    kind = ' setattr' if operation == 'check_setattr' else ''
+    if result is ALLOWED:
+        if _watching < 2:
+            return
+        if not kind and name in _available_by_default:
+            outcome = '+ Always available'
+        else:
+            outcome = '+ Granted'
+    elif result is UNAUTHORIZED:
+        outcome = '- Unauthorized'
+    else:
+        outcome = '- Forbidden'
+    CheckerLoggingMixin._file.write(
+        f'[CHK] {outcome}{kind}: {name} on {object!r}\n')
+
+
 def _instanceChecker(inst):
     return _checkers.get(inst.__class__, _defaultChecker)
 
@@ -757,10 +1125,12 @@ class _BasicTypes(dict):
     def __setitem__(self, name, value):
         dict.__setitem__(self, name, value)
         _checkers[name] = value
+        _checkersChanged()
 
     def __delitem__(self, name):
         dict.__delitem__(self, name)
         del _checkers[name]
+        _checkersChanged()
 
     def clear(self):
         # Make sure you cannot clear the values
@@ -769,6 +1139,7 @@ class _BasicTypes(dict):
     def update(self, d):
         dict.update(self, d)
         _checkers.update(d)
+        _checkersChanged()
 
 
 _basic_types = {
@@ -801,6 +1172,221 @@ else:
 BasicTypes = _BasicTypes(_basic_types)
 del _basic_types
 
+
+class _ValueTypes(dict):
+    """Value Types Dictionary
+
+    Make sure that the checkers derived from it are discarded when it
+    changes.
+    """
+
+    def __setitem__(self, name, value):
+        dict.__setitem__(self, name, value)
+        _valueTypesChanged()
+
+    def __delitem__(self, name):
+        dict.__delitem__(self, name)
+        _valueTypesChanged()
+
+    def clear(self):
+        # Make sure you cannot clear the values
+        raise NotImplementedError
+
+    def update(self, d):
+        dict.update(self, d)
+        _valueTypesChanged()
+
+
+def _isValue(value):
+    return isinstance(value, Proxy) or selectChecker(value) is None
+
+
+def _valuesChecker(values):
+    # Leave an instance unproxied only if the values it gives access to
+    # are left unproxied (or are proxies) themselves.
+    if all(_isValue(value) for value in values):
+        return NoProxy
+    return _defaultChecker
+
+
+def _sliceChecker(slice_):
+    return _valuesChecker((slice_.start, slice_.stop, slice_.step))
+
+
+def _instanceState(instance):
+    state = list(getattr(instance, '__dict__', {}).values())
+    for cls in type(instance).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ('__dict__', '__weakref__'):
+                continue
+            if name.startswith('__') and not name.endswith('__'):
+                name = '_{}{}'.format(cls.__name__.lstrip('_'), name)
+            try:
+                state.append(getattr(instance, name))
+            except AttributeError:
+                pass
+    return state
+
+
+def _stateValues(instance):
+    # The objects an instance gives access to: its attributes and, for
+    # tuples, its items. Its class (for example the __objclass__ of an
+    # enumeration member) is reachable through __class__ anyway.
+    values = [value for value in _instanceState(instance)
+              if value is not type(instance)]
+    if isinstance(instance, tuple):
+        values.extend(instance)
+    return values
+
+
+def valueStateChecker(instance):
+    """
+    A checker factory for :data:`ValueTypes` whose instances can
+    refer to arbitrary objects, such as enumerations, named tuples and
+    frozen dataclasses.
+
+    Instances are left unproxied only if all the objects in their
+    ``__dict__`` and slots (and, for tuples, their items) are left
+    unproxied or are security proxies themselves; otherwise they get
+    the default checker.
+
+    .. versionadded:: 8.5
+    """
+    return _valuesChecker(_stateValues(instance))
+
+
+def _auditedValueChecker(instance, checker=NoProxy):
+    problem = None
+    if checker is NoProxy:
+        try:
+            hash(instance)
+        except TypeError:
+            problem = 'is unhashable'
+    else:
+        # Factories decide for themselves; but those that only look at
+        # part of the state of instances may leave too much unproxied.
+        checker = checker(instance)
+        if checker is not NoProxy and checker is not None:
+            return checker
+    if problem is None:
+        if _valuesChecker(_stateValues(instance)) is NoProxy:
+            return NoProxy
+        problem = 'refers to objects that are proxied'
+    warnings.warn(
+        '%r %s, but %s is registered as a value type; proxying it' % (
+            instance, problem, type(instance).__qualname__),
+        RuntimeWarning, stacklevel=2)
+    return _defaultChecker
+
+
+def _valueTypesChanged():
+    # Rebuild the checkers of the value types in place, as the C
+    # selectChecker shares the dictionary.
+    checkers = {}
+    for type_, checker in ValueTypes.items():
+        if AUDIT_VALUE_TYPES:
+            checker = functools.partial(_auditedValueChecker,
+                                        checker=checker)
+        checkers[type_] = checker
+    _value_type_checkers.clear()
+    _value_type_checkers.update(checkers)
+
+
+#: Immutable types whose instances are not proxied, in addition to the
+#: :data:`BasicTypes`.
+#:
+#: Keys are classes, values are either :data:`NoProxy` or functions
+#: that are called with an instance and return :data:`NoProxy` or a
+#: checker, such as :func:`valueStateChecker`. Types that have their
+#: own checker registered with :func:`defineChecker` are not affected.
+#:
+#: Only the instances of the registered classes themselves are left
+#: unproxied, not those of their subclasses, which may add methods
+#: that must not be called by untrusted code; subclasses have to be
+#: registered as well. Types are never recognized by their shape
+#: either: enumerations, named tuples and frozen dataclasses are
+#: proxied like any other object unless they are registered here, as
+#: all the methods of an unproxied object can be called. Slices are
+#: only left unproxied if all the values they contain are. If the
+#: ``ZOPE_AUDIT_VALUE_TYPES`` environment variable is set, or
+#: :func:`setValueTypeAudit` is used, the instances that would be
+#: left unproxied are checked as well; if they are unhashable or refer
+#: to objects that would be proxied, a :exc:`RuntimeWarning` is issued
+#: and they are proxied. This also applies to the instances that
+#: functions decide to leave unproxied, except that they may be
+#: unhashable.
+#:
+#: .. versionadded:: 8.5
+ValueTypes = _ValueTypes({
+    fractions.Fraction: NoProxy,
+    ipaddress.IPv4Address: NoProxy,
+    ipaddress.IPv4Interface: NoProxy,
+    ipaddress.IPv4Network: NoProxy,
+    ipaddress.IPv6Address: NoProxy,
+    ipaddress.IPv6Interface: NoProxy,
+    ipaddress.IPv6Network: NoProxy,
+    range: NoProxy,
+    slice: _sliceChecker,
+    uuid.SafeUUID: NoProxy,
+    uuid.UUID: NoProxy,
+})
+_valueTypesChanged()
+
+
+def setValueTypeAudit(audit):
+    """
+    Switch the auditing of :data:`ValueTypes` instances on or off.
+
+    .. versionadded:: 8.5
+    """
+    global AUDIT_VALUE_TYPES
+    AUDIT_VALUE_TYPES = bool(audit)
+    _valueTypesChanged()
+
+
+def _isValueCollection(collection):
+    # Are all the elements of a tuple or frozenset of basic types (or
+    # proxied), so the collection itself needn't be proxied?
+    if not VALUE_COLLECTION_MAX or len(collection) > VALUE_COLLECTION_MAX:
+        return False
+    for value in collection:
+        type_ = type(value)
+        if type_ is not Proxy and _getChecker(type_) is not NoProxy:
+            return False
+    return True
+
+
+def setValueCollectionMax(size):
+    """
+    Set the size of the largest tuples and frozensets that
+    :func:`selectChecker` leaves unproxied.
+
+    Tuples and frozensets (but not instances of their subclasses) of
+    at most *size* elements that are all instances of types with the
+    checker :data:`NoProxy`, such as the :data:`BasicTypes`, or
+    security proxies, are returned unproxied; larger ones are proxied
+    like any other. Pass 0 to proxy all tuples and frozensets. The
+    initial size is taken from the ``ZOPE_VALUE_COLLECTION_MAX``
+    environment variable, and defaults to 32.
+
+    Returns the previous size.
+
+    .. versionadded:: 8.5
+    """
+    global VALUE_COLLECTION_MAX
+    previous = VALUE_COLLECTION_MAX
+    VALUE_COLLECTION_MAX = size = int(size)
+    if _c_available:  # pragma: no cover
+        _setValueCollectionMax(size)
+    return previous
+
+
+setValueCollectionMax(VALUE_COLLECTION_MAX)
+
+
 # Available for tests. Located here so it can be kept in sync with BasicTypes.
 BasicTypes_examples = {
     object: object(),
@@ -959,18 +1545,15 @@ else:
     # We do this here so that all users of zope.security can benefit
     # without knowing implementation details.
     # See https://github.com/zopefoundation/zope.security/issues/20
+    # The types are taken from the BTrees modules, without creating any
+    # trees. Checkers for the data structures themselves are opt-in, see
+    # zope.security.btrees.defineBTreeCheckers().
 
     def _fixup_btrees():
-        import BTrees._base
-        _default_checkers[BTrees._base._TreeItems] = _iteratorChecker
-
-        for name in ('IF', 'II', 'IO', 'OI', 'OO'):
-            for family_name in ('family32', 'family64'):
-                family = getattr(BTrees, family_name)
-                btree = getattr(family, name).BTree
-                # The `_fixup_dictlike` is detected as undefined because it is
-                # deleted later on but this function is called beforehand:
-                _fixup_dictlike(btree)  # noqa: F821 undefined name
+        from zope.security.btrees import _itemsTypes
+        from zope.security.btrees import _iteratorTypes
+        for type_ in (*_itemsTypes(), *_iteratorTypes()):
+            _default_checkers[type_] = _iteratorChecker
 
     _fixup_btrees()
     del _fixup_btrees
@@ -1077,6 +1660,7 @@ def _clear():
     _checkers.clear()
     _checkers.update(_default_checkers)
     _checkers.update(BasicTypes)
+    _checkersChanged()
 
 
 _clear()
@@ -21,7 +21,11 @@ from zope.proxy import ProxyBase
 from zope.proxy import getProxiedObject
 from zope.proxy.decorator import SpecificationDecoratorBase
 
+from zope.security.checker import _COMBINED_CHECKERS_MAX
 from zope.security.checker import CombinedChecker
+from zope.security.checker import NoProxy
+from zope.security.checker import _combinedCheckers
+from zope.security.checker import _getChecker
 from zope.security.checker import selectChecker
 from zope.security.proxy import Proxy
 from zope.security.proxy import getChecker
@@ -36,23 +40,43 @@ class DecoratedSecurityCheckerDescriptor:
             return self
         else:
             proxied_object = getProxiedObject(inst)
+            # Combined checkers are shared between decorated objects of
+            # the same wrapper and proxied types, but only if both
+            # checkers come straight from the registry entries for those
+            # types; per-instance checkers and checker factories would
+            # make a new entry every time.
+            key = None
             if isinstance(proxied_object, Proxy):
                 checker = getChecker(proxied_object)
             else:
                 checker = getattr(proxied_object, '__Security_checker__', None)
                 if checker is None:
+                    key = (type(inst), type(proxied_object))
+                    try:
+                        return _combinedCheckers[key]
+                    except KeyError:
+                        pass
                     checker = selectChecker(proxied_object)
+                    registered = _getChecker(key[1])
+                    if not (registered is checker
+                            or checker is None and registered is NoProxy):
+                        key = None
             wrapper_checker = selectChecker(inst)
             if wrapper_checker is None and checker is None:
                 raise AttributeError("%r has no attribute %r" %
                                      (proxied_object.__class__.__name__,
                                       '__Security_checker__'))
             elif wrapper_checker is None:
-                return checker
+                result = checker
             elif checker is None:
-                return wrapper_checker
+                result = wrapper_checker
             else:
-                return CombinedChecker(wrapper_checker, checker)
+                result = CombinedChecker(wrapper_checker, checker)
+            if key is not None and not callable(_getChecker(key[0])):
+                if len(_combinedCheckers) >= _COMBINED_CHECKERS_MAX:
+                    _combinedCheckers.clear()
+                _combinedCheckers[key] = result
+            return result
 
     def __set__(self, inst, value):
         raise TypeError("Can't set __Security_checker__ on a decorated object")
@@ -0,0 +1,129 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Computing the group closure of principals.
+
+:attr:`zope.security.interfaces.IGroupClosureAwarePrincipal.allGroups`
+is the transitive closure of
+:attr:`zope.security.interfaces.IGroupAwarePrincipal.groups`. Walking
+a deep group hierarchy for every interaction is expensive, so
+:func:`getGroupClosure` caches the closure by principal ID. The cache
+is bounded: the least recently used closures are discarded first. It
+must be invalidated with :func:`invalidateGroupClosure` whenever group
+membership changes.
+"""
+from collections import OrderedDict
+
+
+__all__ = [
+    'getGroupClosure',
+    'invalidateGroupClosure',
+]
+
+# Maps principal (and group) IDs to tuples of group IDs, least recently
+# used first.
+_closures = OrderedDict()
+_CLOSURES_MAX = 10000
+
+
+def _groupId(group):
+    # Groups are normally IGroup objects, but plain IDs are common too.
+    return group if isinstance(group, str) else group.id
+
+
+def getGroupClosure(principal):
+    """
+    Return a tuple of the IDs of all the groups *principal* belongs to,
+    directly or through other groups.
+
+    The groups of *principal* and of its groups are taken from their
+    ``groups`` attribute, which may contain group objects or group IDs;
+    IDs can't be followed any further. Principals without a ``groups``
+    attribute belong to no groups.
+
+    Cycles in the group graph are allowed: each group is visited once,
+    and a principal is never reported as one of its own groups. If a
+    group's closure has already been computed, it's used instead of
+    walking that group again.
+
+    The result is cached by ``principal.id`` until
+    :func:`invalidateGroupClosure` is called for it or for one of its
+    groups, or until it is one of the least recently used closures
+    when the cache is full.
+    """
+    principal_id = principal.id
+    try:
+        closure = _closures[principal_id]
+    except KeyError:
+        pass
+    else:
+        try:
+            _closures.move_to_end(principal_id)
+        except KeyError:
+            # Invalidated concurrently; the closure is still returned.
+            pass
+        return closure
+
+    seen = {principal_id}
+    closure = []
+    pending = list(getattr(principal, 'groups', ()))
+    while pending:
+        group = pending.pop()
+        group_id = _groupId(group)
+        if group_id in seen:
+            continue
+        seen.add(group_id)
+        closure.append(group_id)
+        cached = _closures.get(group_id)
+        if cached is not None:
+            for group_id in cached:
+                if group_id not in seen:
+                    seen.add(group_id)
+                    closure.append(group_id)
+        elif not isinstance(group, str):
+            pending.extend(getattr(group, 'groups', ()))
+
+    closure = _closures[principal_id] = tuple(closure)
+    while len(_closures) > _CLOSURES_MAX:
+        try:
+            _closures.popitem(last=False)
+        except KeyError:  # pragma: no cover
+            break
+    return closure
+
+
+def invalidateGroupClosure(principal_id=None):
+    """
+    Discard the cached group closure of *principal_id*, or of all
+    principals if *principal_id* is None.
+
+    The closures of principals include the closures of their groups,
+    so the closures of all the principals and groups that belong to
+    *principal_id*, directly or not, are discarded as well.
+    """
+    if principal_id is None:
+        _closures.clear()
+        return
+    _closures.pop(principal_id, None)
+    for member_id, closure in list(_closures.items()):
+        if principal_id in closure:
+            _closures.pop(member_id, None)
+
+
+try:
+    from zope.testing.cleanup import addCleanUp
+except ImportError:  # pragma: no cover
+    pass
+else:
+    addCleanUp(invalidateGroupClosure)
@@ -17,15 +17,19 @@ Default :class:`zope.security.interfaces.ISecurityManagement` and
 
 Note that this module itself provides those interfaces.
 """
+import sys
 
 from zope.interface import moduleProvides
 
+from zope.security import checker as _checker
 from zope.security._definitions import system_user
 from zope.security._definitions import thread_local
 from zope.security.checker import CheckerPublic
 from zope.security.interfaces import IInteractionManagement
 from zope.security.interfaces import ISecurityManagement
 from zope.security.interfaces import NoInteraction
+from zope.security.proxy import _enterTrustedRegion
+from zope.security.proxy import _exitTrustedRegion
 from zope.security.simplepolicies import ParanoidSecurityPolicy
 
 
@@ -39,6 +43,8 @@ __all__ = [
     'newInteraction',
     'endInteraction',
     'restoreInteraction',
+    'enableProxyIdentityMap',
+    'trustedRegion',
     'checkPermission',
 ]
 
@@ -103,11 +109,13 @@ def newInteraction(*participations):
     if queryInteraction() is not None:
         raise ExistingInteraction("newInteraction called"
                                   " while another interaction is active.")
+    _checker._endProxyMap()
     thread_local.interaction = getSecurityPolicy()(*participations)
 
 
 def endInteraction():
     """End the current interaction."""
+    _checker._endProxyMap()
 
     try:
         thread_local.previous_interaction = thread_local.interaction
@@ -124,6 +132,7 @@ def endInteraction():
 
 
 def restoreInteraction():
+    _checker._endProxyMap()
     try:
         previous = thread_local.previous_interaction
     except AttributeError:
@@ -135,6 +144,58 @@ def restoreInteraction():
         thread_local.interaction = previous
 
 
+def enableProxyIdentityMap():
+    """Reuse security proxies for the rest of the current interaction.
+
+    Normally, proxying the same object twice, for example by getting
+    the same attribute of a proxied object twice, creates two proxies.
+    After this is called, proxying an object again during the current
+    interaction returns the proxy created the first time (for the same
+    checker, if one is passed to
+    :func:`~zope.security.checker.ProxyFactory`). This saves looking up
+    checkers and creating proxies, and makes ``is`` work on proxies, at
+    the price of keeping the proxied objects alive until the interaction
+    ends. Changes to the checker registry don't affect the proxies that
+    were already created.
+
+    The map is discarded by :func:`endInteraction` (and by
+    :func:`newInteraction` and :func:`restoreInteraction`).
+
+    :raise NoInteraction: If there is no current interaction.
+    """
+    getInteraction()
+    _checker._newProxyMap()
+
+
+class trustedRegion:
+    """Trust the code run in the ``with`` block.
+
+    Inside the block every security check made by checkers and security
+    proxies passes, without consulting the interaction or its policy.
+    Proxies stay in place, so objects that escape the block are
+    protected again afterwards.  This is meant for trusted code, like
+    batch jobs or indexers, that walks large graphs of proxied objects
+    and would otherwise have to remove the proxies one by one::
+
+        with trustedRegion():
+            index(folder)
+
+    Regions may be nested; checks are made again once the outermost
+    block is left.  Trust is limited to the code the block runs: other
+    threads and asyncio tasks are not trusted, and tasks started in the
+    block are only trusted until it is left.  Generators can't enter a
+    region (:exc:`RuntimeError` is raised), as the code that runs while
+    they are suspended would be trusted as well.
+    """
+
+    def __enter__(self):
+        _checker._hookChecks()
+        self._token = _enterTrustedRegion(sys._getframe(1))
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _exitTrustedRegion(self._token)
+
+
 def checkPermission(permission, object, interaction=None):
     """Return whether security policy allows permission on object.
 
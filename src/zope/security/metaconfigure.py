@@ -31,8 +31,8 @@ from zope.security.checker import defineChecker
 from zope.security.checker import moduleChecker
 from zope.security.interfaces import PUBLIC_PERMISSION_NAME as PublicPermission
 from zope.security.protectclass import protectLikeUnto
-from zope.security.protectclass import protectName
-from zope.security.protectclass import protectSetAttribute
+from zope.security.protectclass import protectNames
+from zope.security.protectclass import protectSetAttributes
 
 
 def dottedName(klass):
@@ -111,8 +111,9 @@ class ClassDirective:
 
     def __protectByInterface(self, interface, permission_id):
         "Set a permission on names in an interface."
-        for n, d in sorted(interface.namesAndDescriptions(1)):
-            self.__protectName(n, permission_id)
+        self.__protectNames(
+            [n for n, d in sorted(interface.namesAndDescriptions(1))],
+            permission_id)
         self.__context.action(
             discriminator=None,
             callable=provideInterface,
@@ -120,39 +121,49 @@ class ClassDirective:
                   interface)
         )
 
-    def __protectName(self, name, permission_id):
-        "Set a permission on a particular name."
-        self.__context.action(
-            discriminator=('protectName', self.__class, name),
-            callable=protectName,
-            args=(self.__class, name, permission_id)
-        )
+    def __protect(self, kind, protect, names, permission_id):
+        """
+        Add actions that call *protect* for all *names* at once.
+
+        There is still an action per name, with its own discriminator, so
+        conflicts and overrides work the same as if each name was
+        protected on its own. But those actions just collect the names
+        that survive conflict resolution, and an action added after them
+        protects all of them.
+        """
+        _context = self.__context
+        protected = []
+        for name in names:
+            _context.action(
+                discriminator=(kind, self.__class, name),
+                callable=protected.append,
+                args=(name,)
+            )
+        if names:
+            _context.action(
+                discriminator=None,
+                callable=protect,
+                args=(self.__class, protected, permission_id)
+            )
 
     def __protectNames(self, names, permission_id):
         "Set a permission on a bunch of names."
-        for name in names:
-            self.__protectName(name, permission_id)
+        self.__protect('protectName', protectNames, names, permission_id)
 
     def __protectSetAttributes(self, names, permission_id):
         "Set a permission on a bunch of names."
-        for name in names:
-            self.__context.action(
-                discriminator=('protectSetAttribute', self.__class, name),
-                callable=protectSetAttribute,
-                args=(self.__class, name, permission_id)
-            )
+        self.__protect('protectSetAttribute', protectSetAttributes,
+                       names, permission_id)
 
     def __protectSetSchema(self, schema, permission_id):
         "Set a permission on a bunch of names."
         _context = self.__context
+        names = []
         for name in sorted(schema):
             field = schema[name]
             if IField.providedBy(field) and not field.readonly:
-                _context.action(
-                    discriminator=('protectSetAttribute', self.__class, name),
-                    callable=protectSetAttribute,
-                    args=(self.__class, name, permission_id)
-                )
+                names.append(name)
+        self.__protectSetAttributes(names, permission_id)
         _context.action(
             discriminator=None,
             callable=provideInterface,
@@ -182,6 +193,15 @@ def protectModule(module, name, permission):
 
     If there isn't a checker for the module, create one.
     """
+    protectModuleNames(module, (name,), permission)
+
+
+def protectModuleNames(module, names, permission):
+    """Set up a module checker to require a permission to access names
+
+    This is like calling :func:`protectModule` for each name, but the
+    module checker is looked up only once.
+    """
 
     checker = moduleChecker(module)
     if checker is None:
@@ -194,7 +214,8 @@ def protectModule(module, name, permission):
 
     # We know a dictionary get method was used because we set it
     protections = checker.get_permissions
-    protections[name] = permission
+    for name in names:
+        protections[name] = permission
 
 
 def _names(attributes, interfaces):
@@ -210,22 +231,30 @@ def _names(attributes, interfaces):
                 yield name
 
 
-def allow(context, attributes=(), interface=()):
-
-    for name in _names(attributes, interface):
+def _protectModule(context, permission, attributes, interface):
+    # Like ClassDirective, keep one action per name for conflict
+    # detection, but let them only collect the names, and protect all
+    # of them in one action added after them.
+    names = list(_names(attributes, interface))
+    protected = []
+    for name in names:
         context.action(
             discriminator=('http://namespaces.zope.org/zope:module',
                            context.module, name),
-            callable=protectModule,
-            args=(context.module, name, PublicPermission),
+            callable=protected.append,
+            args=(name,),
+        )
+    if names:
+        context.action(
+            discriminator=None,
+            callable=protectModuleNames,
+            args=(context.module, protected, permission),
         )
 
 
+def allow(context, attributes=(), interface=()):
+    _protectModule(context, PublicPermission, attributes, interface)
+
+
 def require(context, permission, attributes=(), interface=()):
-    for name in _names(attributes, interface):
-        context.action(
-            discriminator=('http://namespaces.zope.org/zope:module',
-                           context.module, name),
-            callable=protectModule,
-            args=(context.module, name, permission),
-        )
+    _protectModule(context, permission, attributes, interface)
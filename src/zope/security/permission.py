@@ -16,7 +16,10 @@
 __docformat__ = "reStructuredText"
 
 import operator
+import threading
+import weakref
 
+from zope.component import getSiteManager
 from zope.component import getUtilitiesFor
 from zope.component import queryUtility
 from zope.interface import directlyProvides
@@ -42,6 +45,68 @@ class Permission:
         self.description = description
 
 
+class PermissionToken(str):
+    """
+    A permission ID that knows the integer slot assigned to it.
+
+    Tokens are equal to, and hash like, the permission ID strings, so
+    they can be used anywhere a permission ID can: in checkers, and as
+    the *permission* passed to a security policy's ``checkPermission``.
+    Security policies that know about them can use :attr:`slot` to
+    look the permission up in a list or a bitset instead of hashing
+    and comparing strings.
+
+    Tokens are created (and interned) by :func:`getPermissionToken`;
+    don't create them directly.
+    """
+
+    #: The small non-negative integer assigned to this permission ID.
+    #: Slots are assigned in order and never reused.
+    slot = None
+
+    def __reduce__(self):
+        # Slots are only meaningful within a process.
+        return getPermissionToken, (str(self),)
+
+
+_tokens = {}
+_tokens_by_slot = []
+_tokens_lock = threading.Lock()
+
+
+def getPermissionToken(permission_id):
+    """
+    Return the :class:`PermissionToken` for *permission_id*.
+
+    The first time a permission ID is seen it's assigned the next free
+    slot; afterwards the same token is returned. Slots are never freed,
+    so a slot keeps identifying the same permission for the life of the
+    process.
+    """
+    try:
+        return _tokens[permission_id]
+    except KeyError:
+        pass
+    if not isinstance(permission_id, str):
+        raise TypeError("Permission IDs must be strings", permission_id)
+    with _tokens_lock:
+        token = _tokens.get(permission_id)
+        if token is None:
+            token = PermissionToken(permission_id)
+            token.slot = len(_tokens_by_slot)
+            _tokens_by_slot.append(token)
+            _tokens[str(permission_id)] = token
+    return token
+
+
+def getPermissionTokens():
+    """
+    Return a tuple of all :class:`PermissionToken` objects, in slot
+    order: the token at index *n* has the slot *n*.
+    """
+    return tuple(_tokens_by_slot)
+
+
 def checkPermission(context, permission_id):
     """
     Check whether a given permission object exists in the provided
@@ -53,13 +118,72 @@ def checkPermission(context, permission_id):
         raise ValueError("Undefined permission ID", permission_id)
 
 
+def checkPermissions(context, permission_ids):
+    """
+    Check whether all the given permission IDs exist in the provided
+    context as utilities.
+
+    This is like calling :func:`checkPermission` for each ID, but the
+    registered permissions are looked up only once. A :exc:`ValueError`
+    is raised for the first ID that is undefined.
+    """
+    defined = None
+    for permission_id in permission_ids:
+        if permission_id is CheckerPublic:
+            continue
+        if defined is None:
+            defined = {name
+                       for name, _permission
+                       in getUtilitiesFor(IPermission, context)}
+        if permission_id not in defined:
+            raise ValueError("Undefined permission ID", permission_id)
+
+
 def allPermissions(context=None):
     """
     Get the IDs of all defined permission object utilities.
+
+    The IDs are :class:`PermissionToken` objects.
     """
     for name, _permission in getUtilitiesFor(IPermission, context):
         if name != zope_Public:
-            yield name
+            yield getPermissionToken(name)
+
+
+# Maps the utility registries of site managers (or the site managers
+# themselves, if they don't have one) to dictionaries mapping vocabulary
+# builders to ``(generation, vocabulary)`` tuples.
+_vocabularies = weakref.WeakKeyDictionary()
+
+
+def _cachedVocabulary(context, build):
+    site_manager = getSiteManager(context)
+    # Every change to the utility registrations, including those of the
+    # bases, changes the generation of the utility registry. If the
+    # registry doesn't keep a generation, there's no way to tell that a
+    # cached vocabulary is stale, so don't cache.
+    utilities = getattr(site_manager, 'utilities', site_manager)
+    generation = getattr(utilities, '_generation', None)
+    if generation is None:
+        return build(site_manager)
+    try:
+        cache = _vocabularies.setdefault(utilities, {})
+    except TypeError:  # pragma: no cover
+        # Not weakly referenceable. Don't cache.
+        return build(site_manager)
+    cached = cache.get(build)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    vocabulary = build(site_manager)
+    cache[build] = (generation, vocabulary)
+    return vocabulary
+
+
+def _buildPermissionsVocabulary(site_manager):
+    terms = []
+    for name, permission in site_manager.getUtilitiesFor(IPermission):
+        terms.append(SimpleTerm(permission, name))
+    return SimpleVocabulary(terms)
 
 
 def PermissionsVocabulary(context=None):
@@ -67,16 +191,31 @@ def PermissionsVocabulary(context=None):
     A vocabulary of permission IDs.
 
     Term values are permissions, while term tokens are permission IDs.
+
+    The vocabulary is built once per site manager and cached until the
+    utility registrations of the site manager (or of its bases) change;
+    callers share the same vocabulary object.
     """
-    terms = []
-    for name, permission in getUtilitiesFor(IPermission, context):
-        terms.append(SimpleTerm(permission, name))
-    return SimpleVocabulary(terms)
+    return _cachedVocabulary(context, _buildPermissionsVocabulary)
 
 
 directlyProvides(PermissionsVocabulary, IVocabularyFactory)
 
 
+def _buildPermissionIdsVocabulary(site_manager):
+    terms = []
+    has_public = False
+    for name, _permission in site_manager.getUtilitiesFor(IPermission):
+        if name == zope_Public:
+            has_public = True
+        else:
+            terms.append(SimpleTerm(name, name, name))
+    terms = sorted(terms, key=operator.attrgetter('title'))
+    if has_public:
+        terms.insert(0, SimpleTerm(CheckerPublic, zope_Public, 'Public'))
+    return SimpleVocabulary(terms)
+
+
 def PermissionIdsVocabulary(context=None):
     """
     A vocabulary of permission IDs.
@@ -93,18 +232,23 @@ def PermissionIdsVocabulary(context=None):
 
     Terms are sorted by title except for 'Public', which always appears as
     the first term.
+
+    Like :func:`PermissionsVocabulary`, the vocabulary is cached per site
+    manager.
     """
-    terms = []
-    has_public = False
-    for name, _permission in getUtilitiesFor(IPermission, context):
-        if name == zope_Public:
-            has_public = True
-        else:
-            terms.append(SimpleTerm(name, name, name))
-    terms = sorted(terms, key=operator.attrgetter('title'))
-    if has_public:
-        terms.insert(0, SimpleTerm(CheckerPublic, zope_Public, 'Public'))
-    return SimpleVocabulary(terms)
+    return _cachedVocabulary(context, _buildPermissionIdsVocabulary)
 
 
 directlyProvides(PermissionIdsVocabulary, IVocabularyFactory)
+
+
+def _clear():
+    _vocabularies.clear()
+
+
+try:
+    from zope.testing.cleanup import addCleanUp
+except ImportError:  # pragma: no cover
+    pass
+else:
+    addCleanUp(_clear)
@@ -16,13 +16,26 @@
 
 from zope.security.checker import Checker
 from zope.security.checker import CheckerPublic
+from zope.security.checker import CheckerPy
+from zope.security.checker import _checkers
 from zope.security.checker import defineChecker
 from zope.security.checker import getCheckerForInstancesOf
 from zope.security.interfaces import PUBLIC_PERMISSION_NAME as zope_Public
+from zope.security.permission import getPermissionToken
 
 
 def protectName(class_, name, permission):
     """Set a permission on a particular name."""
+    protectNames(class_, (name,), permission)
+
+
+def protectNames(class_, names, permission):
+    """
+    Set a permission on each of several names.
+
+    This is like calling :func:`protectName` for each name, but the
+    checker of the class is looked up only once.
+    """
 
     checker = getCheckerForInstancesOf(class_)
     if checker is None:
@@ -35,11 +48,22 @@ def protectName(class_, name, permission):
 
     # We know a dictionary was used because we set it
     protections = checker.get_permissions
-    protections[name] = permission
+    for name in names:
+        protections[name] = permission
 
 
 def protectSetAttribute(class_, name, permission):
     """Set a permission on a particular name."""
+    protectSetAttributes(class_, (name,), permission)
+
+
+def protectSetAttributes(class_, names, permission):
+    """
+    Set a permission on setting each of several names.
+
+    This is like calling :func:`protectSetAttribute` for each name, but
+    the checker of the class is looked up only once.
+    """
     checker = getCheckerForInstancesOf(class_)
     if checker is None:
         checker = Checker({}, {})
@@ -57,7 +81,8 @@ def protectSetAttribute(class_, name, permission):
     # Jim says this doensn't happens with the C version of the
     # checkers because they use a 'shared dummy dict'.
     protections = checker.set_permissions
-    protections[name] = permission
+    for name in names:
+        protections[name] = permission
 
 
 def protectLikeUnto(class_, like_unto):
@@ -89,3 +114,32 @@ def protectLikeUnto(class_, like_unto):
     set_protections = checker.set_permissions
     for name in unto_set_protections:
         set_protections[name] = unto_set_protections[name]
+
+
+def redefinePermissions(mapping):
+    """
+    Apply a permission redefinition to all name-based checkers.
+
+    Every permission ID used by the checkers of classes and modules
+    that is a key of *mapping* is replaced by its value, the way the
+    ``meta:redefinePermission`` ZCML directive replaces the permission
+    IDs of the directives that follow it. Permission IDs are then
+    interned as :class:`zope.security.permission.PermissionToken`
+    objects, and :data:`zope.Public
+    <zope.security.interfaces.PUBLIC_PERMISSION_NAME>` becomes
+    :data:`CheckerPublic`.
+    """
+    for checker in list(_checkers.values()):
+        if not isinstance(checker, (Checker, CheckerPy)):
+            continue
+        for permissions in (checker.get_permissions,
+                            checker.set_permissions):
+            for name, permission in permissions.items():
+                if not isinstance(permission, str):
+                    continue
+                permission = mapping.get(permission, permission)
+                if permission == zope_Public:
+                    permission = CheckerPublic
+                elif isinstance(permission, str):
+                    permission = getPermissionToken(permission)
+                permissions[name] = permission
@@ -16,8 +16,11 @@ Helper functions for proxies.
 
 .. seealso:: :ref:`proxy-known-issues`
 """
+import contextvars
 import functools
+import inspect
 import sys
+import types
 
 from zope.proxy import PyProxyBase
 
@@ -349,6 +352,71 @@ def getObjectPy(proxy):
     return super(ProxyPy, proxy).__getattribute__('_wrapped')
 
 
+def _removeSecurityProxiesPy(obj, recurse, deep):
+    while _builtin_isinstance(obj, ProxyPy):
+        obj = super(ProxyPy, obj).__getattribute__('_wrapped')
+    if not recurse:
+        return obj
+    kind = type(obj)
+    if kind is list or kind is tuple or kind is set or kind is frozenset:
+        items = list(obj)
+        result = [_removeSecurityProxiesPy(item, deep, deep)
+                  for item in items]
+    elif kind is dict:
+        items = list(obj.items())
+        result = [(_removeSecurityProxiesPy(key, deep, deep),
+                   _removeSecurityProxiesPy(value, deep, deep))
+                  for key, value in items]
+    else:
+        return obj
+    if kind is dict:
+        changed = any(new_key is not key or new_value is not value
+                      for (new_key, new_value), (key, value)
+                      in zip(result, items))
+    else:
+        changed = any(new is not item for new, item in zip(result, items))
+    return kind(result) if changed else obj
+
+
+def removeSecurityProxiesPy(obj, deep=True):
+    """Remove the security proxies from *obj* and the containers in it.
+
+    Lists, tuples, dicts (keys and values), sets and frozensets are
+    walked, recursively unless *deep* is false, in which case only
+    *obj* and its direct items are unproxied.  Subclasses of these
+    types are left alone.  Containers that contained proxies are
+    copied; the originals are never changed, and containers that
+    didn't contain any proxies are returned as they are.
+    """
+    return _removeSecurityProxiesPy(obj, True, deep)
+
+
+# The innermost trusted region of the running code. See the comment
+# on trusted regions in _proxy.c.
+_trusted_regions = contextvars.ContextVar('zope.security.trusted_region')
+
+_GENERATOR_FLAGS = inspect.CO_GENERATOR | inspect.CO_ASYNC_GENERATOR
+
+
+def _enterTrustedRegionPy(frame):
+    if not isinstance(frame, types.FrameType):
+        raise TypeError('expected a frame')
+    if frame.f_code.co_flags & _GENERATOR_FLAGS:
+        raise RuntimeError("trusted regions can't be entered in generators")
+    region = [True]
+    return _trusted_regions.set(region), region
+
+
+def _exitTrustedRegionPy(token):
+    token, region = token
+    _trusted_regions.reset(token)
+    del region[:]
+
+
+def _inTrustedRegionPy():
+    return bool(_trusted_regions.get(()))
+
+
 _c_available = not PURE_PYTHON
 if _c_available:  # pragma: no cover
     try:
@@ -360,10 +428,18 @@ if _c_available:  # pragma: no cover
 getChecker = getCheckerPy
 getObject = getObjectPy
 Proxy = ProxyPy
+removeSecurityProxies = removeSecurityProxiesPy
+_enterTrustedRegion = _enterTrustedRegionPy
+_exitTrustedRegion = _exitTrustedRegionPy
+_inTrustedRegion = _inTrustedRegionPy
 
 if _c_available:  # pragma: no cover
+    from zope.security._proxy import _enterTrustedRegion  # noqa: F401
+    from zope.security._proxy import _exitTrustedRegion  # noqa: F401
+    from zope.security._proxy import _inTrustedRegion  # noqa: F401
     from zope.security._proxy import getChecker
     from zope.security._proxy import getObject
+    from zope.security._proxy import removeSecurityProxies  # noqa: F401
     Proxy = _Proxy
 
 removeSecurityProxy = getObject
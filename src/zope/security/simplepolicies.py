@@ -23,8 +23,11 @@ import zope.interface
 
 from zope.security._definitions import system_user
 from zope.security.checker import CheckerPublic
+from zope.security.groups import getGroupClosure
 from zope.security.interfaces import IInteraction
 from zope.security.interfaces import ISecurityPolicy
+from zope.security.permission import _tokens
+from zope.security.permission import getPermissionToken
 
 
 @zope.interface.implementer(IInteraction)
@@ -76,3 +79,95 @@ class PermissiveSecurityPolicy(ParanoidSecurityPolicy):
 
     def checkPermission(self, permission, object):
         return True
+
+
+@zope.interface.provider(ISecurityPolicy)
+class BitsetSecurityPolicy(ParanoidSecurityPolicy):
+    """
+    Allow access if every non-system principal has been granted the
+    permission globally, either directly or through one of its groups.
+
+    Grants are looked up with :meth:`getGrantedPermissions`, which by
+    default uses the :attr:`grants` mapping. The groups of a principal
+    are taken from
+    :attr:`~zope.security.interfaces.IGroupClosureAwarePrincipal.allGroups`,
+    or are computed (and cached) by
+    :func:`zope.security.groups.getGroupClosure` if the principal
+    doesn't know its group closure.
+
+    The permissions granted to the principals are combined into an
+    integer bitset when participations are added or removed, using the
+    :attr:`~zope.security.permission.PermissionToken.slot` of each
+    permission. Checking a permission then is a single bit test.
+    Grants are not contextual: the *object* passed to
+    :meth:`checkPermission` is ignored.
+
+    Like with :class:`ParanoidSecurityPolicy`, access is allowed if
+    there are no non-system principals.
+    """
+
+    #: A mapping from principal and group IDs to iterables of permission
+    #: IDs granted to them. Subclasses set their own mapping or override
+    #: :meth:`getGrantedPermissions`.
+    grants = {}
+
+    # The bitset of permissions granted to all principals, or None if
+    # there are no principals to check.
+    _bits = None
+
+    def add(self, participation):
+        super().add(participation)
+        self._bits = self._computeBits()
+
+    def remove(self, participation):
+        super().remove(participation)
+        self._bits = self._computeBits()
+
+    def getGrantedPermissions(self, principal_id):
+        """
+        Return the permission IDs globally granted to the principal or
+        group *principal_id*.
+        """
+        return self.grants.get(principal_id, ())
+
+    def getPrincipalBits(self, principal):
+        """
+        Return the bitset of the permissions granted to *principal*,
+        directly or through its groups.
+        """
+        groups = getattr(principal, 'allGroups', None)
+        if groups is None:
+            groups = getGroupClosure(principal)
+        bits = 0
+        for principal_id in (principal.id, *groups):
+            for permission_id in self.getGrantedPermissions(principal_id):
+                bits |= 1 << getPermissionToken(permission_id).slot
+        return bits
+
+    def _computeBits(self):
+        bits = None
+        for participation in self.participations:
+            principal = participation.principal
+            if principal is system_user:
+                continue
+            principal_bits = self.getPrincipalBits(principal)
+            bits = principal_bits if bits is None else bits & principal_bits
+        return bits
+
+    def checkPermission(self, permission, object):
+        if permission is CheckerPublic:
+            return True
+        bits = self._bits
+        if bits is None:
+            return True
+        slot = getattr(permission, 'slot', None)
+        if slot is None:
+            if not isinstance(permission, str):
+                return False
+            # Don't intern permissions that are only checked: no
+            # principal was granted a permission without a slot.
+            token = _tokens.get(permission)
+            if token is None:
+                return False
+            slot = token.slot
+        return bool(bits >> slot & 1)
@@ -22,6 +22,8 @@ import zope.security.management
 from zope import component
 from zope import interface
 from zope.security import interfaces
+from zope.security.groups import getGroupClosure
+from zope.security.groups import invalidateGroupClosure
 from zope.security.interfaces import PUBLIC_PERMISSION_NAME
 from zope.security.permission import Permission
 
@@ -30,15 +32,27 @@ from zope.security.permission import Permission
 class Principal:
     """
     A trivial implementation of :class:`zope.security.interfaces.IPrincipal`.
+
+    If *groups* are given, the principal also provides
+    :class:`zope.security.interfaces.IGroupClosureAwarePrincipal`; its
+    ``allGroups`` come from :func:`zope.security.groups.getGroupClosure`.
+    Creating a principal discards the cached group closure for its ID,
+    and those of the principals that belong to it.
     """
 
     def __init__(self, id, title=None, description='', groups=None):
         self.id = id
         self.title = title or id
         self.description = description
+        invalidateGroupClosure(id)
         if groups is not None:
             self.groups = groups
-            interface.directlyProvides(self, interfaces.IGroupAwarePrincipal)
+            interface.directlyProvides(
+                self, interfaces.IGroupClosureAwarePrincipal)
+
+    @property
+    def allGroups(self):
+        return getGroupClosure(self)
 
 
 @interface.implementer(interfaces.IParticipation)
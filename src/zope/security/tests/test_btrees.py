@@ -0,0 +1,177 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import unittest
+
+from zope.testing.cleanup import CleanUp
+
+from zope.security.tests import QuietWatchingChecker
+
+
+class Test_defineBTreeCheckers(QuietWatchingChecker, CleanUp,
+                               unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cleanUp()
+
+    def tearDown(self):
+        self.cleanUp()
+        super().tearDown()
+
+    def _callFUT(self):
+        from zope.security.btrees import defineBTreeCheckers
+        return defineBTreeCheckers()
+
+    def _proxy(self, obj):
+        from zope.security.checker import ProxyFactory
+        return ProxyFactory(obj)
+
+    def test_before(self):
+        from BTrees.OOBTree import OOBTree
+
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        self.assertIs(selectChecker(OOBTree()), _defaultChecker)
+
+    def test_all_types(self):
+        import BTrees
+
+        from zope.security.checker import _checkers
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        self._callFUT()
+        for family in (BTrees.family32, BTrees.family64):
+            for name in ('IF', 'II', 'IO', 'IU', 'OI', 'OO', 'OU',
+                         'UF', 'UI', 'UO', 'UU'):
+                module = getattr(family, name)
+                for type_name in ('BTree', 'Bucket', 'Set', 'TreeSet',
+                                  'BTreePy', 'BucketPy', 'SetPy',
+                                  'TreeSetPy', 'TreeItems'):
+                    type_ = getattr(module, type_name)
+                    self.assertIn(type_, _checkers)
+                tree = module.BTree()
+                self.assertIsNot(selectChecker(tree), _defaultChecker)
+                self.assertIsNot(selectChecker(tree.keys()), _defaultChecker)
+                self.assertIsNot(selectChecker(iter(tree)), _defaultChecker)
+
+    def test_btree(self):
+        import operator
+
+        from BTrees.OOBTree import OOBTree
+
+        from zope.security.interfaces import ForbiddenAttribute
+        self._callFUT()
+        tree = OOBTree({1: 'a', 2: 'b', 3: 'c', 4: 'd'})
+        proxy = self._proxy(tree)
+        self.assertEqual(proxy[1], 'a')
+        self.assertEqual(proxy.get(5, 'e'), 'e')
+        self.assertIn(2, proxy)
+        self.assertTrue(proxy.has_key(2))
+        self.assertEqual(len(proxy), 4)
+        self.assertTrue(proxy)
+        self.assertEqual(proxy.minKey(), 1)
+        self.assertEqual(proxy.maxKey(2), 2)
+        self.assertEqual(list(proxy), [1, 2, 3, 4])
+        self.assertEqual(list(proxy.keys(2, 3)), [2, 3])
+        self.assertEqual(list(proxy.values(min=3)), ['c', 'd'])
+        self.assertEqual(list(proxy.items(max=1)), [(1, 'a')])
+        self.assertEqual(list(proxy.iterkeys(3)), [3, 4])
+        keys = proxy.keys(2, 4)
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(keys[0], 2)
+        self.assertIn(3, keys)
+
+        self.assertRaises(ForbiddenAttribute, operator.setitem, proxy, 5, 'e')
+        self.assertRaises(ForbiddenAttribute, operator.delitem, proxy, 1)
+        for name in ('clear', 'insert', 'pop', 'popitem', 'setdefault',
+                     'update', '_firstbucket'):
+            self.assertRaises(ForbiddenAttribute, getattr, proxy, name)
+        self.assertEqual(len(tree), 4)
+
+    def test_btree_w_mutable_values(self):
+        from BTrees.IOBTree import IOBTree
+
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.proxy import isinstance
+        self._callFUT()
+        proxy = self._proxy(IOBTree({1: []}))
+        value = proxy[1]
+        self.assertTrue(isinstance(value, list))
+        self.assertRaises(ForbiddenAttribute, getattr, value, 'append')
+        self.assertRaises(ForbiddenAttribute, getattr,
+                          list(proxy.values())[0], 'append')
+
+    def test_bucket(self):
+        from BTrees.LLBTree import LLBucket
+
+        from zope.security.interfaces import ForbiddenAttribute
+        self._callFUT()
+        proxy = self._proxy(LLBucket({1: 2, 3: 4}))
+        self.assertEqual(list(proxy.items(2)), [(3, 4)])
+        self.assertEqual(proxy[3], 4)
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, 'update')
+
+    def test_sets(self):
+        from BTrees.OOBTree import OOSet
+        from BTrees.OOBTree import OOTreeSet
+
+        from zope.security.interfaces import ForbiddenAttribute
+        self._callFUT()
+        for set_type in (OOSet, OOTreeSet):
+            proxy = self._proxy(set_type([1, 2, 3]))
+            self.assertIn(2, proxy)
+            self.assertEqual(len(proxy), 3)
+            self.assertEqual(list(proxy.keys(2)), [2, 3])
+            self.assertEqual(proxy.maxKey(), 3)
+            self.assertTrue(proxy.isdisjoint([4]))
+            self.assertEqual(list(proxy | set_type([4])), [1, 2, 3, 4])
+            for name in ('add', 'remove', 'discard', 'insert', 'update',
+                         'clear', 'pop'):
+                self.assertRaises(ForbiddenAttribute, getattr, proxy, name)
+
+    def test_python_implementation(self):
+        from BTrees.OOBTree import OOBTreePy
+
+        from zope.security.interfaces import ForbiddenAttribute
+        self._callFUT()
+        proxy = self._proxy(OOBTreePy({1: 2, 3: 4}))
+        self.assertEqual(list(proxy.keys(2)), [3])
+        self.assertEqual(list(proxy), [1, 3])
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, '_data')
+
+    def test_w_existing_checker(self):
+        from BTrees.OOBTree import OOBTree
+        from BTrees.OOBTree import OOSet
+
+        from zope.security.checker import NamesChecker
+        from zope.security.checker import defineChecker
+        from zope.security.checker import selectChecker
+        checker = NamesChecker(['keys'])
+        defineChecker(OOBTree, checker)
+        self._callFUT()
+        self.assertIs(selectChecker(OOBTree()), checker)
+        set_checker = selectChecker(OOSet())
+        self._callFUT()
+        self.assertIs(selectChecker(OOSet()), set_checker)
+
+    def test_cleanup(self):
+        from BTrees.OOBTree import OOBTree
+
+        from zope.security.checker import _clear
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        self._callFUT()
+        _clear()
+        self.assertIs(selectChecker(OOBTree()), _defaultChecker)
+        self.assertIsNot(selectChecker(iter(OOBTree())), _defaultChecker)
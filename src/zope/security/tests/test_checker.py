@@ -115,8 +115,116 @@ class Test_ProxyFactory(unittest.TestCase):
         finally:
             _clear()
 
+    def test_w_proxy_map(self):
+        from zope.security.checker import _endProxyMap
+        from zope.security.checker import _newProxyMap
+        obj = object()
+        _check = object()
+        self.assertIsNot(self._callFUT(obj, _check),
+                         self._callFUT(obj, _check))
+        _newProxyMap()
+        try:
+            returned = self._callFUT(obj, _check)
+            self.assertIs(self._callFUT(obj, _check), returned)
+            self.assertIsNot(self._callFUT(obj, object()), returned)
+        finally:
+            _endProxyMap()
+        self.assertIsNot(self._callFUT(obj, _check), returned)
+
+    def test_w_proxy_map_no_checker(self):
+        from zope.security.checker import Checker
+        from zope.security.checker import _endProxyMap
+        from zope.security.checker import _newProxyMap
+        from zope.security.proxy import getChecker
+
+        class _WithChecker:
+            __Security_checker__ = object()
+        obj = _WithChecker()
+        _newProxyMap()
+        try:
+            returned = self._callFUT(obj)
+            self.assertIs(getChecker(returned), obj.__Security_checker__)
+            self.assertIs(self._callFUT(obj), returned)
+            self.assertIs(Checker({}).proxy(obj), returned)
+            self.assertIsNot(self._callFUT(obj, Checker({})), returned)
+        finally:
+            _endProxyMap()
+
+
+class ProxyMapTestsBase:
+
+    def _getFunctions(self):
+        raise NotImplementedError("Subclasses must define")
+
+    def test_no_map_by_default(self):
+        _new, _end, _get = self._getFunctions()
+        self.assertIsNone(_get())
+
+    def test_new_end(self):
+        _new, _end, _get = self._getFunctions()
+        _new()
+        try:
+            proxies = _get()
+            self.assertEqual(proxies, {})
+            _new()
+            self.assertIs(_get(), proxies)
+        finally:
+            _end()
+        self.assertIsNone(_get())
+        _end()
+        self.assertIsNone(_get())
+
+    def test_other_threads_have_no_map(self):
+        import threading
+        _new, _end, _get = self._getFunctions()
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(_get()))
+        _new()
+        try:
+            thread.start()
+            thread.join()
+        finally:
+            _end()
+        self.assertEqual(seen, [None])
+
+    def test_kept_on_thread_local(self):
+        from zope.security._definitions import thread_local
+        _new, _end, _get = self._getFunctions()
+        _new()
+        try:
+            self.assertIs(thread_local.proxy_map, _get())
+        finally:
+            _end()
+        self.assertFalse(hasattr(thread_local, 'proxy_map'))
+        thread_local.proxy_map = proxies = {}
+        try:
+            self.assertIs(_get(), proxies)
+        finally:
+            _end()
+        self.assertIsNone(_get())
+
+
+class ProxyMapPyTests(ProxyMapTestsBase, unittest.TestCase):
+
+    def _getFunctions(self):
+        from zope.security.checker import _endProxyMapPy
+        from zope.security.checker import _getProxyMapPy
+        from zope.security.checker import _newProxyMapPy
+        return _newProxyMapPy, _endProxyMapPy, _getProxyMapPy
+
+
+@unittest.skipIf(sec_checker._getProxyMap is sec_checker._getProxyMapPy,
+                 "Pure Python")
+class ProxyMapCTests(ProxyMapTestsBase, unittest.TestCase):
 
-class Test_canWrite(unittest.TestCase):
+    def _getFunctions(self):  # pragma: no cover
+        from zope.security._zope_security_checker import _endProxyMap
+        from zope.security._zope_security_checker import _getProxyMap
+        from zope.security._zope_security_checker import _newProxyMap
+        return _newProxyMap, _endProxyMap, _getProxyMap
+
+
+class Test_canWrite(QuietWatchingChecker, unittest.TestCase):
 
     def _callFUT(self, obj, name):
         from zope.security.checker import canWrite
@@ -170,8 +278,32 @@ class Test_canWrite(unittest.TestCase):
                                              ch_set=ForbiddenAttribute))
         self.assertRaises(ForbiddenAttribute, self._callFUT, proxy, 'whatever')
 
+    def test_w_checker(self):
+        from zope.security._definitions import thread_local
+        from zope.security.checker import Checker
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.proxy import Proxy
+
+        class _Interaction:
+            def checkPermission(self, perm, obj):
+                return False
+        proxy = Proxy(object(), Checker({'readonly': CheckerPublic,
+                                         'name': 'view'},
+                                        {'public': CheckerPublic,
+                                         'name': 'edit'}))
+        thread_local.interaction = _Interaction()
+        try:
+            self.assertTrue(self._callFUT(proxy, 'public'))
+            self.assertFalse(self._callFUT(proxy, 'name'))
+            self.assertFalse(self._callFUT(proxy, 'readonly'))
+            self.assertRaises(ForbiddenAttribute,
+                              self._callFUT, proxy, 'nonesuch')
+        finally:
+            del thread_local.interaction
 
-class Test_canAccess(unittest.TestCase):
+
+class Test_canAccess(QuietWatchingChecker, unittest.TestCase):
 
     def _callFUT(self, obj, name):
         from zope.security.checker import canAccess
@@ -204,6 +336,31 @@ class Test_canAccess(unittest.TestCase):
         proxy = Proxy(obj, self._makeChecker(ch_get=ForbiddenAttribute))
         self.assertRaises(ForbiddenAttribute, self._callFUT, proxy, 'whatever')
 
+    def test_w_checker_unauth(self):
+        from zope.security._definitions import thread_local
+        from zope.security.checker import Checker
+        from zope.security.checker import CheckerPublic
+        from zope.security.proxy import Proxy
+
+        class _Interaction:
+            def checkPermission(self, perm, obj):
+                return False
+        proxy = Proxy(object(), Checker({'public': CheckerPublic,
+                                         'name': 'view'}))
+        thread_local.interaction = _Interaction()
+        try:
+            self.assertTrue(self._callFUT(proxy, 'public'))
+            self.assertFalse(self._callFUT(proxy, 'name'))
+        finally:
+            del thread_local.interaction
+
+    def test_w_checker_forbidden(self):
+        from zope.security.checker import Checker
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.proxy import Proxy
+        proxy = Proxy(object(), Checker({}))
+        self.assertRaises(ForbiddenAttribute, self._callFUT, proxy, 'name')
+
 
 _marker = object()
 
@@ -321,6 +478,45 @@ class CheckerTestsBase(QuietWatchingChecker):
         obj = object()
         self.assertEqual(checker.check(obj, '__repr__'), None)
 
+    def test_check_available_by_default_not_interned(self):
+        # Names built at runtime aren't interned.
+        checker = self._makeOne()
+        obj = object()
+        name = ''.join(['__', 'repr__'])
+        self.assertEqual(checker.check(obj, name), None)
+
+    def test_check_available_by_default_str_subclass(self):
+        class Name(str):
+            pass
+        checker = self._makeOne()
+        self.assertEqual(checker.check(object(), Name('__repr__')), None)
+
+    def test_check_available_by_default_not_interned_in_list(self):
+        from zope.security.checker import _available_by_default
+        from zope.security.interfaces import ForbiddenAttribute
+        checker = self._makeOne()
+        obj = object()
+        name = ''.join(['__', 'added__'])
+        self.assertRaises(ForbiddenAttribute, checker.check, obj, '__added__')
+        _available_by_default.append(name)
+        self.addCleanup(_available_by_default.remove, name)
+        self.assertEqual(checker.check(obj, '__added__'), None)
+
+    def test_check_missing___iter___not_interned(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        checker = self._makeOne()
+        name = ''.join(['__', 'iter__'])
+        # An AttributeError is wanted for objects that aren't iterable.
+        self.assertEqual(checker.check(object(), name), None)
+        self.assertRaises(ForbiddenAttribute, checker.check, [], name)
+
+    def test_check_short_names(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        checker = self._makeOne()
+        obj = object()
+        for name in ('', '_', '__'):
+            self.assertRaises(ForbiddenAttribute, checker.check, obj, name)
+
     def test_check_public(self):
         from zope.security.checker import CheckerPublic
         checker = self._makeOne({'name': CheckerPublic})
@@ -357,6 +553,138 @@ class CheckerTestsBase(QuietWatchingChecker):
         finally:
             del thread_local.interaction
 
+    def test_check_miss_exception(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        checker = self._makeOne()
+        obj = object()
+        with self.assertRaises(ForbiddenAttribute) as exc:
+            checker.check(obj, 'nonesuch')
+        self.assertEqual(exc.exception.args, ('nonesuch', obj))
+        self.assertEqual(str(exc.exception), str(('nonesuch', obj)))
+
+    def test_check_miss_exception_has_context(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        checker = self._makeOne()
+        obj = object()
+        try:
+            raise KeyError('handled')
+        except KeyError as e:
+            handled = e
+            with self.assertRaises(ForbiddenAttribute) as exc:
+                checker.check(obj, 'nonesuch')
+        self.assertIs(exc.exception.__context__, handled)
+
+    def test_check_non_public_w_interaction_denies_exception(self):
+        from zope.security._definitions import thread_local
+        from zope.security.interfaces import Unauthorized
+
+        class _Interaction:
+            def checkPermission(self, obj, perm):
+                return False
+        checker = self._makeOne({'name': 'view'})
+        obj = object()
+        thread_local.interaction = _Interaction()
+        try:
+            with self.assertRaises(Unauthorized) as exc:
+                checker.check(obj, 'name')
+        finally:
+            del thread_local.interaction
+        self.assertEqual(exc.exception.args, (obj, 'name', 'view'))
+
+    def test_hasattr_on_proxy(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.proxy import Proxy
+
+        class Foo:
+            bar = 'Bar'
+            baz = 'Baz'
+        checker = self._makeOne({'bar': CheckerPublic})
+        proxy = Proxy(Foo(), checker)
+        self.assertTrue(hasattr(proxy, 'bar'))
+        self.assertFalse(hasattr(proxy, 'baz'))
+        self.assertFalse(hasattr(proxy, 'nonesuch'))
+
+    def test_check_in_trusted_region(self):
+        from zope.security.checker import ALLOWED
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.management import trustedRegion
+        checker = self._makeOne()
+        obj = object()
+        with trustedRegion():
+            self.assertIsNone(checker.check(obj, 'nonesuch'))
+            self.assertIsNone(checker.check_getattr(obj, 'nonesuch'))
+            self.assertIsNone(checker.check_setattr(obj, 'nonesuch'))
+            self.assertIs(checker.allowed(obj, 'nonesuch'), ALLOWED)
+            self.assertIs(checker.allowed_setattr(obj, 'nonesuch'), ALLOWED)
+        self.assertRaises(ForbiddenAttribute,
+                          checker.check, obj, 'nonesuch')
+
+    def test_allowed_miss(self):
+        from zope.security.checker import FORBIDDEN
+        checker = self._makeOne()
+        self.assertIs(checker.allowed(object(), 'nonesuch'), FORBIDDEN)
+
+    def test_allowed_available_by_default(self):
+        from zope.security.checker import ALLOWED
+        checker = self._makeOne()
+        self.assertIs(checker.allowed(object(), '__repr__'), ALLOWED)
+
+    def test_allowed_iter_missing(self):
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        checker = self._makeOne()
+        self.assertIs(checker.allowed(object(), '__iter__'), ALLOWED)
+        self.assertIs(checker.allowed([], '__iter__'), FORBIDDEN)
+
+    def test_allowed_public(self):
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import CheckerPublic
+        checker = self._makeOne({'name': CheckerPublic})
+        self.assertIs(checker.allowed(object(), 'name'), ALLOWED)
+
+    def test_allowed_w_interaction(self):
+        from zope.security._definitions import thread_local
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import UNAUTHORIZED
+
+        class _Interaction:
+            def checkPermission(self, perm, obj):
+                return perm == 'view'
+        checker = self._makeOne({'name': 'view', 'other': 'edit'})
+        thread_local.interaction = _Interaction()
+        try:
+            self.assertIs(checker.allowed(object(), 'name'), ALLOWED)
+            self.assertIs(checker.allowed(object(), 'other'), UNAUTHORIZED)
+        finally:
+            del thread_local.interaction
+
+    def test_allowed_setattr(self):
+        from zope.security._definitions import thread_local
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        from zope.security.checker import UNAUTHORIZED
+        from zope.security.checker import CheckerPublic
+
+        class _Interaction:
+            def checkPermission(self, perm, obj):
+                return False
+        checker = self._makeOne(set_permissions={'name': CheckerPublic,
+                                                 'other': 'edit'})
+        thread_local.interaction = _Interaction()
+        try:
+            self.assertIs(checker.allowed_setattr(object(), 'name'), ALLOWED)
+            self.assertIs(checker.allowed_setattr(object(), 'other'),
+                          UNAUTHORIZED)
+            self.assertIs(checker.allowed_setattr(object(), 'nonesuch'),
+                          FORBIDDEN)
+        finally:
+            del thread_local.interaction
+
+    def test_allowed_setattr_none_set(self):
+        from zope.security.checker import FORBIDDEN
+        checker = self._makeOne()
+        self.assertIs(checker.allowed_setattr(object(), 'name'), FORBIDDEN)
+
     def test_proxy_already_proxied(self):
         from zope.security.proxy import Proxy
         from zope.security.proxy import getChecker
@@ -370,6 +698,24 @@ class CheckerTestsBase(QuietWatchingChecker):
         self.assertIs(returned, proxy)
         self.assertIs(getChecker(returned), _check)
 
+    def test_proxy_w_proxy_map(self):
+        from zope.security.checker import _endProxyMap
+        from zope.security.checker import _newProxyMap
+        from zope.security.proxy import getObject
+
+        class _WithChecker:
+            __Security_checker__ = object()
+        obj = _WithChecker()
+        checker = self._makeOne()
+        self.assertIsNot(checker.proxy(obj), checker.proxy(obj))
+        _newProxyMap()
+        try:
+            returned = checker.proxy(obj)
+            self.assertIs(getObject(returned), obj)
+            self.assertIs(checker.proxy(obj), returned)
+        finally:
+            _endProxyMap()
+
     def test_proxy_no_dunder_no_select(self):
         obj = object()
         checker = self._makeOne()
@@ -636,6 +982,102 @@ class CheckerTestsBase(QuietWatchingChecker):
         _key, subiter = next(proxy)
         self.assertEqual([0], list(subiter))
 
+    def _traceChecks(self):
+        from zope.security.checker import setCheckTrace
+        traced = []
+
+        def trace(*args):
+            traced.append(args)
+        setCheckTrace(trace)
+        self.addCleanup(setCheckTrace, None)
+        return traced
+
+    def test_check_traced(self):
+        from zope.security._definitions import thread_local
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        from zope.security.checker import UNAUTHORIZED
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.interfaces import Unauthorized
+
+        class _Interaction:
+            def checkPermission(self, obj, perm):
+                return False
+        checker = self._makeOne({'public': CheckerPublic, 'name': 'view'})
+        obj = object()
+        traced = self._traceChecks()
+        checker.check(obj, 'public')
+        checker.check_getattr(obj, '__repr__')
+        self.assertRaises(ForbiddenAttribute, checker.check, obj, 'nonesuch')
+        thread_local.interaction = _Interaction()
+        try:
+            self.assertRaises(Unauthorized, checker.check, obj, 'name')
+        finally:
+            del thread_local.interaction
+        self.assertEqual(traced, [
+            (checker, 'check', obj, 'public', ALLOWED),
+            (checker, 'check', obj, '__repr__', ALLOWED),
+            (checker, 'check', obj, 'nonesuch', FORBIDDEN),
+            (checker, 'check', obj, 'name', UNAUTHORIZED),
+        ])
+
+    def test_check_setattr_traced(self):
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+        checker = self._makeOne(set_permissions={'name': CheckerPublic})
+        obj = object()
+        traced = self._traceChecks()
+        checker.check_setattr(obj, 'name')
+        self.assertRaises(ForbiddenAttribute,
+                          checker.check_setattr, obj, 'nonesuch')
+        self.assertEqual(traced, [
+            (checker, 'check_setattr', obj, 'name', ALLOWED),
+            (checker, 'check_setattr', obj, 'nonesuch', FORBIDDEN),
+        ])
+
+    def test_allowed_not_traced(self):
+        checker = self._makeOne()
+        traced = self._traceChecks()
+        checker.allowed(object(), 'nonesuch')
+        checker.allowed_setattr(object(), 'nonesuch')
+        self.assertEqual(traced, [])
+
+    def test_trace_raises(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import setCheckTrace
+
+        def trace(*args):
+            raise ValueError()
+        checker = self._makeOne({'name': CheckerPublic})
+        setCheckTrace(trace)
+        self.addCleanup(setCheckTrace, None)
+        self.assertRaises(ValueError, checker.check, object(), 'name')
+
+    def test_proxy_checks_traced(self):
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.proxy import Proxy
+        from zope.security.proxy import removeSecurityProxy
+
+        class Foo:
+            a = 'a'
+
+        checker = self._makeOne({'a': CheckerPublic})
+        proxy = Proxy(Foo(), checker)
+        traced = self._traceChecks()
+        self.assertEqual(proxy.a, 'a')
+        self.assertRaises(ForbiddenAttribute, setattr, proxy, 'a', 'b')
+        obj = removeSecurityProxy(proxy)
+        self.assertEqual(traced, [
+            (checker, 'check', obj, 'a', ALLOWED),
+            (checker, 'check_setattr', obj, 'a', FORBIDDEN),
+        ])
+
 
 class TestCheckerPy(CheckerTestsBase, unittest.TestCase):
 
@@ -1060,6 +1502,205 @@ class _SelectCheckerBase:
 
             self.assertIs(self._callFUT(result), _iteratorChecker)
 
+    def test_w_value_types_NoProxy(self):
+        import fractions
+        import ipaddress
+        import uuid
+
+        for obj in [uuid.uuid4(),
+                    uuid.SafeUUID.safe,
+                    fractions.Fraction(1, 3),
+                    ipaddress.ip_address('192.0.2.1'),
+                    ipaddress.ip_address('2001:db8::1'),
+                    ipaddress.ip_network('192.0.2.0/24'),
+                    ipaddress.ip_network('2001:db8::/32'),
+                    ipaddress.ip_interface('192.0.2.1/24'),
+                    range(3),
+                    slice(1, None, 2),
+                    ]:
+            self.assertIsNone(self._callFUT(obj))
+
+    def test_w_value_type_subclasses(self):
+        import fractions
+        import uuid
+
+        from zope.security.checker import _defaultChecker
+
+        class MyUUID(uuid.UUID):
+            def delete_everything(self):
+                raise AssertionError("Never called")
+
+        class MyFraction(fractions.Fraction):
+            pass
+        self.assertIs(self._callFUT(MyUUID(int=1)), _defaultChecker)
+        self.assertIs(self._callFUT(MyFraction(1, 3)), _defaultChecker)
+
+    def test_w_value_types_w_mutable_values(self):
+        from zope.security.checker import _defaultChecker
+        self.assertIs(self._callFUT(slice([], 1)), _defaultChecker)
+
+    def test_w_unregistered_value_shapes(self):
+        import collections
+        import dataclasses
+        import enum
+
+        from zope.security.checker import _defaultChecker
+
+        class Color(enum.Enum):
+            RED = 1
+
+        @dataclasses.dataclass(frozen=True)
+        class Frozen:
+            a: object
+        Pair = collections.namedtuple('Pair', 'a b')
+        for obj in [Color.RED, Frozen(1), Pair(1, 2)]:
+            self.assertIs(self._callFUT(obj), _defaultChecker)
+
+    def _registerValueType(self, type_, checker):
+        from zope.security.checker import ValueTypes
+        ValueTypes[type_] = checker
+        self.addCleanup(ValueTypes.__delitem__, type_)
+
+    def test_w_registered_enum(self):
+        import enum
+
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import valueStateChecker
+
+        class Color(enum.Enum):
+            RED = 1
+            LIST = [1]
+
+        class Flag(enum.IntFlag):
+            A = 1
+        self._registerValueType(Color, valueStateChecker)
+        self._registerValueType(Flag, valueStateChecker)
+        self.assertIsNone(self._callFUT(Color.RED))
+        self.assertIsNone(self._callFUT(Flag.A))
+        self.assertIs(self._callFUT(Color.LIST), _defaultChecker)
+        # Everything the member refers to is checked, not only its value.
+        Color.RED.extra = []
+        self.assertIs(self._callFUT(Color.RED), _defaultChecker)
+
+    def test_w_registered_named_tuple(self):
+        import collections
+        import typing
+
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import valueStateChecker
+
+        class Point(typing.NamedTuple):
+            x: object
+            y: object
+        Pair = collections.namedtuple('Pair', 'a b')
+        self._registerValueType(Point, valueStateChecker)
+        self._registerValueType(Pair, valueStateChecker)
+        self.assertIsNone(self._callFUT(Point(1, 'a')))
+        self.assertIsNone(self._callFUT(Pair(Point(1, 2), None)))
+        self.assertIs(self._callFUT(Point(1, [])), _defaultChecker)
+
+    def test_w_registered_named_tuple_subclass_w_attributes(self):
+        import collections
+
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import valueStateChecker
+
+        class Pair(collections.namedtuple('Pair', 'a b')):
+            pass
+        self._registerValueType(Pair, valueStateChecker)
+        pair = Pair(1, 2)
+        self.assertIsNone(self._callFUT(pair))
+        pair.extra = []
+        self.assertIs(self._callFUT(pair), _defaultChecker)
+
+    def test_w_registered_dataclass(self):
+        import dataclasses
+
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import valueStateChecker
+
+        @dataclasses.dataclass(frozen=True)
+        class Frozen:
+            a: object
+            b: object = 2
+        self._registerValueType(Frozen, valueStateChecker)
+        self.assertIsNone(self._callFUT(Frozen(1)))
+        self.assertIs(self._callFUT(Frozen([])), _defaultChecker)
+        # State that isn't a field is checked too.
+        frozen = Frozen(1)
+        object.__setattr__(frozen, '_cache', [])
+        self.assertIs(self._callFUT(frozen), _defaultChecker)
+
+    def test_w_value_type_containing_proxy(self):
+        import dataclasses
+
+        from zope.security.checker import Checker
+        from zope.security.checker import valueStateChecker
+        from zope.security.proxy import Proxy
+
+        @dataclasses.dataclass(frozen=True)
+        class Frozen:
+            a: object
+        self._registerValueType(Frozen, valueStateChecker)
+        self.assertIsNone(self._callFUT(Frozen(Proxy([], Checker({})))))
+
+    def test_w_value_type_w_checker(self):
+        import enum
+
+        from zope.security.checker import Checker
+        from zope.security.checker import NoProxy
+        from zope.security.checker import defineChecker
+
+        class Color(enum.Enum):
+            RED = 1
+        self._registerValueType(Color, NoProxy)
+        self.assertIsNone(self._callFUT(Color.RED))
+        checker = Checker({})
+        defineChecker(Color, checker)
+        self.assertIs(self._callFUT(Color.RED), checker)
+
+    def test_w_value_collections(self):
+        from zope.security.checker import Checker
+        from zope.security.proxy import Proxy
+        proxy = Proxy([], Checker({}))
+        for obj in [(),
+                    (1, 'a', None, 1.0),
+                    (proxy,),
+                    frozenset(),
+                    frozenset([1, 'a', None])]:
+            self.assertIsNone(self._callFUT(obj))
+
+    def test_w_collections_w_other_values(self):
+        from zope.security.checker import _checkers
+        for obj in [(1, []), ((1,),), frozenset([1, (1,)])]:
+            self.assertIs(self._callFUT(obj), _checkers[type(obj)])
+
+    def test_w_collection_subclasses(self):
+        from zope.security.checker import _defaultChecker
+
+        class Tuple(tuple):
+            pass
+
+        class FrozenSet(frozenset):
+            pass
+        self.assertIs(self._callFUT(Tuple((1,))), _defaultChecker)
+        self.assertIs(self._callFUT(FrozenSet((1,))), _defaultChecker)
+
+    def test_w_value_collections_w_max(self):
+        from zope.security.checker import VALUE_COLLECTION_MAX
+        from zope.security.checker import _checkers
+        from zope.security.checker import setValueCollectionMax
+        self.addCleanup(setValueCollectionMax, VALUE_COLLECTION_MAX)
+        setValueCollectionMax(2)
+        self.assertIsNone(self._callFUT((1, 2)))
+        self.assertIsNone(self._callFUT(frozenset((1, 2))))
+        self.assertIs(self._callFUT((1, 2, 3)), _checkers[tuple])
+        self.assertIs(self._callFUT(frozenset((1, 2, 3))),
+                      _checkers[frozenset])
+        setValueCollectionMax(0)
+        self.assertIs(self._callFUT(()), _checkers[tuple])
+        self.assertIs(self._callFUT(frozenset()), _checkers[frozenset])
+
 
 class Test_selectCheckerPy(_SelectCheckerBase, unittest.TestCase):
 
@@ -1434,6 +2075,185 @@ class TestCombinedChecker(QuietWatchingChecker,
         finally:
             del thread_local.interaction
 
+    def test_check_many_checkers_last_ok(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+
+        combined = self._getTargetClass()(
+            self._makeOther(), self._makeOther(),
+            self._makeOther({'name': CheckerPublic}))
+        combined.check(object(), 'name')  # no raise
+        combined.check_getattr(object(), 'name')  # no raise
+        self.assertRaises(ForbiddenAttribute,
+                          combined.check_setattr, object(), 'name')
+
+    def test_check_many_checkers_first_unauthorized_wins(self):
+        from zope.security._definitions import thread_local
+        from zope.security.interfaces import Unauthorized
+
+        class _Interaction:
+            def checkPermission(self, obj, perm):
+                return False
+
+        combined = self._getTargetClass()(
+            self._makeOther(), self._makeOther({'name': 'view'}),
+            self._makeOther(), self._makeOther({'name': 'edit'}))
+        thread_local.interaction = _Interaction()
+        try:
+            with self.assertRaises(Unauthorized) as exc:
+                combined.check(object(), 'name')
+        finally:
+            del thread_local.interaction
+        self.assertEqual(exc.exception.args[2], 'view')
+
+    def test_check_setattr_many_checkers(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+
+        combined = self._getTargetClass()(
+            self._makeOther(), self._makeOther(),
+            self._makeOther(set_permissions={'name': CheckerPublic}))
+        combined.check_setattr(object(), 'name')  # no raise
+        self.assertRaises(ForbiddenAttribute,
+                          combined.check, object(), 'name')
+
+    def test_check_reraises_exception_of_other_checker(self):
+        from zope.security.checker import Checker
+        from zope.security.interfaces import Unauthorized
+
+        raised = Unauthorized('custom')
+
+        class _Raising(Checker):
+            def check(self, object, name):
+                raise raised
+
+        combined = self._makeOne(self._makeOther(), _Raising({}))
+        with self.assertRaises(Unauthorized) as exc:
+            combined.check(object(), 'name')
+        self.assertIs(exc.exception, raised)
+
+    def test_check_propagates_other_errors(self):
+        from zope.security.checker import Checker
+
+        class _Broken(Checker):
+            def check(self, object, name):
+                raise ValueError(name)
+
+        combined = self._makeOne(self._makeOther(), _Broken({}))
+        self.assertRaises(ValueError, combined.check, object(), 'name')
+
+    def test_nested(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+
+        inner = self._getTargetClass()(
+            self._makeOther(), self._makeOther({'name': CheckerPublic}))
+        combined = self._makeOne(self._makeOther(), inner)
+        combined.check(object(), 'name')  # no raise
+        self.assertRaises(ForbiddenAttribute,
+                          combined.check, object(), 'other')
+
+    def test_requires_two_checkers(self):
+        self.assertRaises(TypeError,
+                          self._getTargetClass(), self._makeOther())
+
+    def test_proxy_uses_combined_check(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.proxy import Proxy
+
+        class Foo:
+            a = 'a'
+            b = 'b'
+
+        combined = self._makeOne(self._makeOther({'a': CheckerPublic}),
+                                 self._makeOther({'b': CheckerPublic}))
+        proxy = Proxy(Foo(), combined)
+        self.assertEqual(proxy.a, 'a')
+        self.assertEqual(proxy.b, 'b')
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, 'c')
+
+    def test_allowed(self):
+        from zope.security._definitions import thread_local
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        from zope.security.checker import UNAUTHORIZED
+        from zope.security.checker import CheckerPublic
+
+        class _Interaction:
+            def checkPermission(self, perm, obj):
+                return False
+
+        combined = self._makeOne(
+            self._makeOther({'unauth': 'view'}),
+            self._makeOther({'public': CheckerPublic, 'unauth': 'edit'},
+                            {'unauth': 'edit'}))
+        thread_local.interaction = _Interaction()
+        try:
+            self.assertIs(combined.allowed(object(), 'public'), ALLOWED)
+            self.assertIs(combined.allowed(object(), 'unauth'), UNAUTHORIZED)
+            self.assertIs(combined.allowed(object(), 'nonesuch'), FORBIDDEN)
+            self.assertIs(combined.allowed_setattr(object(), 'unauth'),
+                          UNAUTHORIZED)
+            self.assertIs(combined.allowed_setattr(object(), 'public'),
+                          FORBIDDEN)
+        finally:
+            del thread_local.interaction
+
+    def test_allowed_w_other_checker(self):
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        from zope.security.checker import UNAUTHORIZED
+        from zope.security.checker import Checker
+        from zope.security.interfaces import Unauthorized
+
+        class _Other(Checker):
+            def check(self, object, name):
+                if name == 'unauth':
+                    raise Unauthorized(name)
+
+            def check_setattr(self, object, name):
+                raise Unauthorized(name)
+
+        combined = self._makeOne(self._makeOther(), _Other({}))
+        self.assertIs(combined.allowed(object(), 'name'), ALLOWED)
+        self.assertIs(combined.allowed(object(), 'unauth'), UNAUTHORIZED)
+        self.assertIs(combined.allowed_setattr(object(), 'name'),
+                      UNAUTHORIZED)
+        combined = self._makeOne(self._makeOther(), self._makeOther())
+        self.assertIs(combined.allowed(object(), 'name'), FORBIDDEN)
+
+    def test_check_traced(self):
+        from zope.security.checker import ALLOWED
+        from zope.security.checker import FORBIDDEN
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import setCheckTrace
+        from zope.security.interfaces import ForbiddenAttribute
+        traced = []
+
+        def trace(*args):
+            traced.append(args)
+        combined = self._makeOne(self._makeOther(),
+                                 self._makeOther({'name': CheckerPublic}))
+        obj = object()
+        setCheckTrace(trace)
+        self.addCleanup(setCheckTrace, None)
+        combined.check(obj, 'name')
+        # The checks of the combined checkers may be traced, too, but
+        # the combined checker's outcome is traced last.
+        self.assertEqual(traced[-1], (combined, 'check', obj, 'name', ALLOWED))
+        del traced[:]
+        self.assertRaises(ForbiddenAttribute,
+                          combined.check_setattr, obj, 'name')
+        self.assertEqual(traced[-1],
+                         (combined, 'check_setattr', obj, 'name', FORBIDDEN))
+
+
+class TestCombinedCheckerPy(TestCombinedChecker):
+
+    def _getTargetClass(self):
+        return sec_checker.CombinedCheckerPy
+
 
 @unittest.skipIf(
     sec_checker.WatchingCombinedChecker is sec_checker.CombinedChecker,
@@ -1610,6 +2430,112 @@ class TestCheckerLoggingMixin(unittest.TestCase):
                          '[CHK] - Unauthorized getattr: name on TESTING\n')
 
 
+class Test_setValueCollectionMax(unittest.TestCase):
+
+    def tearDown(self):
+        sec_checker.setValueCollectionMax(32)
+
+    def _callFUT(self, size):
+        from zope.security.checker import setValueCollectionMax
+        return setValueCollectionMax(size)
+
+    def test_default(self):
+        from zope.security.checker import VALUE_COLLECTION_MAX
+        self.assertEqual(VALUE_COLLECTION_MAX, 32)
+        self.assertIsNone(sec_checker.selectChecker(tuple(range(32))))
+
+    def test_returns_previous(self):
+        self.assertEqual(self._callFUT(5), 32)
+        self.assertEqual(self._callFUT('0'), 5)
+        self.assertEqual(sec_checker.VALUE_COLLECTION_MAX, 0)
+
+    def test_proxies(self):
+        from zope.security.checker import ProxyFactory
+        from zope.security.proxy import removeSecurityProxy
+        value = (1, 2)
+        self.assertIs(ProxyFactory(value), value)
+        self._callFUT(1)
+        proxy = ProxyFactory(value)
+        self.assertIsNot(proxy, value)
+        self.assertIs(removeSecurityProxy(proxy), value)
+
+
+class Test_setWatching(unittest.TestCase):
+
+    def setUp(self):
+        import io
+        self._file = sec_checker.CheckerLoggingMixin._file
+        self._stream = sec_checker.CheckerLoggingMixin._file = io.StringIO()
+
+    def tearDown(self):
+        sec_checker.setWatching(sec_checker.WATCH_CHECKERS)
+        sec_checker.CheckerLoggingMixin._file = self._file
+
+    def _callFUT(self, level):
+        from zope.security.checker import setWatching
+        return setWatching(level)
+
+    def _makeObject(self):
+        class _Object:
+            def __repr__(self):
+                return 'TESTING'
+        return _Object()
+
+    def _check(self):
+        from zope.security._definitions import thread_local
+        from zope.security.checker import Checker
+        from zope.security.checker import CheckerPublic
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.interfaces import Unauthorized
+
+        class _Interaction:
+            def checkPermission(self, obj, perm):
+                return False
+        checker = Checker({'public': CheckerPublic, 'name': 'view'},
+                          {'public': CheckerPublic})
+        obj = self._makeObject()
+        checker.check(obj, 'public')
+        checker.check(obj, '__repr__')
+        checker.check_setattr(obj, 'public')
+        self.assertRaises(ForbiddenAttribute, checker.check, obj, 'nonesuch')
+        self.assertRaises(ForbiddenAttribute,
+                          checker.check_setattr, obj, 'nonesuch')
+        thread_local.interaction = _Interaction()
+        try:
+            self.assertRaises(Unauthorized, checker.check, obj, 'name')
+        finally:
+            del thread_local.interaction
+        return self._stream.getvalue().splitlines()
+
+    def test_off(self):
+        self._callFUT(0)
+        self.assertEqual(self._check(), [])
+
+    def test_normal_verbosity(self):
+        self._callFUT(1)
+        self.assertEqual(self._check(), [
+            '[CHK] - Forbidden: nonesuch on TESTING',
+            '[CHK] - Forbidden setattr: nonesuch on TESTING',
+            '[CHK] - Unauthorized: name on TESTING',
+        ])
+
+    def test_raised_verbosity(self):
+        self._callFUT(2)
+        self.assertEqual(self._check(), [
+            '[CHK] + Granted: public on TESTING',
+            '[CHK] + Always available: __repr__ on TESTING',
+            '[CHK] + Granted setattr: public on TESTING',
+            '[CHK] - Forbidden: nonesuch on TESTING',
+            '[CHK] - Forbidden setattr: nonesuch on TESTING',
+            '[CHK] - Unauthorized: name on TESTING',
+        ])
+
+    def test_switched_off_again(self):
+        self._callFUT(2)
+        self._callFUT(0)
+        self.assertEqual(self._check(), [])
+
+
 class Test__instanceChecker(unittest.TestCase):
 
     def setUp(self):
@@ -2318,6 +3244,243 @@ class TestCombinedCheckerMixin(QuietWatchingChecker,
         verifyObject(IChecker, dc)
 
 
+class TestValueTypes(unittest.TestCase):
+
+    def setUp(self):
+        from zope.security.checker import AUDIT_VALUE_TYPES
+        from zope.security.checker import _clear
+        self._audit = AUDIT_VALUE_TYPES
+        _clear()
+
+    def tearDown(self):
+        from zope.security.checker import _clear
+        from zope.security.checker import setValueTypeAudit
+        setValueTypeAudit(self._audit)
+        _clear()
+
+    def _makeType(self):
+        class Value:
+            __slots__ = ('value', '__weakref__')
+
+            def __init__(self, value):
+                self.value = value
+
+            def __repr__(self):
+                return 'Value'
+        return Value
+
+    def test___setitem__(self):
+        from zope.security.checker import NoProxy
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        Value = self._makeType()
+
+        class SubValue(Value):
+            pass
+        self.assertIs(selectChecker(Value(1)), _defaultChecker)
+        ValueTypes[Value] = NoProxy
+        self.addCleanup(ValueTypes.__delitem__, Value)
+        self.assertIsNone(selectChecker(Value(1)))
+        # Subclasses must be registered themselves.
+        self.assertIs(selectChecker(SubValue(1)), _defaultChecker)
+        ValueTypes[SubValue] = NoProxy
+        self.addCleanup(ValueTypes.__delitem__, SubValue)
+        self.assertIsNone(selectChecker(SubValue(1)))
+
+    def test___delitem__(self):
+        from zope.security.checker import NoProxy
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        Value = self._makeType()
+        ValueTypes[Value] = NoProxy
+        self.assertIsNone(selectChecker(Value(1)))
+        del ValueTypes[Value]
+        self.assertIs(selectChecker(Value(1)), _defaultChecker)
+
+    def test_clear(self):
+        from zope.security.checker import ValueTypes
+        self.assertRaises(NotImplementedError, ValueTypes.clear)
+
+    def test_update_w_function(self):
+        from zope.security.checker import Checker
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import selectChecker
+        Value = self._makeType()
+        checker = Checker({})
+        ValueTypes.update({Value: lambda value: checker})
+        self.addCleanup(ValueTypes.__delitem__, Value)
+        self.assertIs(selectChecker(Value(1)), checker)
+
+    def test_audit(self):
+        import warnings
+
+        from zope.security.checker import NoProxy
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        from zope.security.checker import setValueTypeAudit
+        Value = self._makeType()
+        ValueTypes[Value] = NoProxy
+        self.addCleanup(ValueTypes.__delitem__, Value)
+        setValueTypeAudit(True)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            self.assertIsNone(selectChecker(Value(1)))
+            self.assertEqual(w, [])
+            self.assertIs(selectChecker(Value([])), _defaultChecker)
+        self.assertEqual(len(w), 1)
+        self.assertIs(w[0].category, RuntimeWarning)
+        self.assertEqual(
+            str(w[0].message),
+            'Value refers to objects that are proxied, but '
+            'TestValueTypes._makeType.<locals>.Value is registered as a '
+            'value type; proxying it')
+        setValueTypeAudit(False)
+        self.assertIsNone(selectChecker(Value([])))
+
+    def test_audit_unhashable(self):
+        import warnings
+
+        from zope.security.checker import NoProxy
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        from zope.security.checker import setValueTypeAudit
+
+        class Value:
+            __hash__ = None
+        ValueTypes[Value] = NoProxy
+        self.addCleanup(ValueTypes.__delitem__, Value)
+        setValueTypeAudit(True)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            self.assertIs(selectChecker(Value()), _defaultChecker)
+        self.assertIn('is unhashable', str(w[0].message))
+
+    def test_audit_builtin_value_types(self):
+        import fractions
+        import ipaddress
+        import uuid
+        import warnings
+
+        from zope.security.checker import selectChecker
+        from zope.security.checker import setValueTypeAudit
+        setValueTypeAudit(True)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            for obj in [uuid.uuid4(),
+                        fractions.Fraction(1, 3),
+                        ipaddress.ip_address('2001:db8::1%scope'),
+                        ipaddress.ip_interface('192.0.2.1/24'),
+                        range(3),
+                        slice(1, None)]:
+                self.assertIsNone(selectChecker(obj))
+
+    def test_audit_factory(self):
+        import warnings
+
+        from zope.security.checker import NoProxy
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import selectChecker
+        from zope.security.checker import setValueTypeAudit
+
+        class Value:
+            __hash__ = None
+
+            def __init__(self, value, other=None):
+                self.value = value
+                self.other = other
+
+        def checker(value):
+            # Only looks at part of the state.
+            return NoProxy if value.value is not None else _defaultChecker
+        ValueTypes[Value] = checker
+        self.addCleanup(ValueTypes.__delitem__, Value)
+        setValueTypeAudit(True)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            # Factories may leave unhashable instances unproxied.
+            self.assertIsNone(selectChecker(Value(1)))
+            # Instances the factory proxies aren't reported.
+            self.assertIs(selectChecker(Value(None)), _defaultChecker)
+            self.assertEqual(w, [])
+            self.assertIs(selectChecker(Value(1, [])), _defaultChecker)
+        self.assertEqual(len(w), 1)
+        self.assertIn('refers to objects that are proxied', str(w[0].message))
+        setValueTypeAudit(False)
+        self.assertIsNone(selectChecker(Value(1, [])))
+
+    def test_audit_valueStateChecker(self):
+        import enum
+        import warnings
+
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import selectChecker
+        from zope.security.checker import setValueTypeAudit
+        from zope.security.checker import valueStateChecker
+
+        class Color(enum.Enum):
+            RED = 1
+        ValueTypes[Color] = valueStateChecker
+        self.addCleanup(ValueTypes.__delitem__, Color)
+        setValueTypeAudit(True)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.assertIsNone(selectChecker(Color.RED))
+
+    def test_only_value_types_kept(self):
+        import gc
+        import weakref
+
+        from zope.security.checker import NoProxy
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import _defaultChecker
+        from zope.security.checker import _value_type_checkers
+        from zope.security.checker import selectChecker
+        from zope.security.checker import setValueTypeAudit
+        setValueTypeAudit(False)
+        Value = self._makeType()
+        ValueTypes[Value] = NoProxy
+        self.addCleanup(ValueTypes.__delitem__, Value)
+        self.assertIsNone(selectChecker(Value(1)))
+        self.assertIs(_value_type_checkers[Value], NoProxy)
+
+        class Other:
+            pass
+        self.assertIs(selectChecker(Other()), _defaultChecker)
+        self.assertNotIn(Other, _value_type_checkers)
+        ref = weakref.ref(Other)
+        del Other
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_kept_when_checkers_change(self):
+        from zope.security.checker import NoProxy
+        from zope.security.checker import ValueTypes
+        from zope.security.checker import _clear
+        from zope.security.checker import defineChecker
+        from zope.security.checker import selectChecker
+        Value = self._makeType()
+        ValueTypes[Value] = NoProxy
+        self.addCleanup(ValueTypes.__delitem__, Value)
+        defineChecker(type(self), NoProxy)
+        _clear()
+        self.assertIsNone(selectChecker(Value(1)))
+
+    def test_mangled_slots(self):
+        from zope.security.checker import _instanceState
+
+        class _Value:
+            __slots__ = '__private'
+
+            def __init__(self):
+                self.__private = 1
+        self.assertEqual(_instanceState(_Value()), [1])
+
+
 class TestBasicTypes(unittest.TestCase):
 
     def setUp(self):
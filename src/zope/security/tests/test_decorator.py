@@ -156,6 +156,144 @@ class DecoratedSecurityCheckerDescriptorTests(QuietWatchingChecker,
         checker.check(w_sec, 'a')  # no raise
         checker.check(w_sec, 'b')  # no raise
 
+    def test_combined_checker_is_cached(self):
+        from zope.proxy import ProxyBase
+
+        from zope.security.checker import NamesChecker
+        from zope.security.checker import defineChecker
+
+        class Foo:
+            a = 'a'
+        defineChecker(Foo, NamesChecker(['a']))
+
+        class Wrapper(ProxyBase):
+            b = 'b'
+            __Security_checker__ = self._makeOne()
+        defineChecker(Wrapper, NamesChecker(['b']))
+
+        checker = Wrapper(Foo()).__Security_checker__
+        self.assertIs(Wrapper(Foo()).__Security_checker__, checker)
+
+    def test_cached_combined_checker_skips_selection(self):
+        from zope.proxy import ProxyBase
+
+        from zope.security import decorator
+        from zope.security.checker import NamesChecker
+        from zope.security.checker import defineChecker
+
+        class Foo:
+            a = 'a'
+        defineChecker(Foo, NamesChecker(['a']))
+
+        class Wrapper(ProxyBase):
+            __Security_checker__ = self._makeOne()
+        defineChecker(Wrapper, NamesChecker(['b']))
+        checker = Wrapper(Foo()).__Security_checker__
+
+        def _selectChecker(object):
+            raise AssertionError('selectChecker called')
+        orig, decorator.selectChecker = decorator.selectChecker, _selectChecker
+        try:
+            self.assertIs(Wrapper(Foo()).__Security_checker__, checker)
+        finally:
+            decorator.selectChecker = orig
+
+    def test_combined_checker_cache_invalidated_by_registry(self):
+        from zope.proxy import ProxyBase
+
+        from zope.security.checker import NamesChecker
+        from zope.security.checker import defineChecker
+        from zope.security.checker import undefineChecker
+
+        class Foo:
+            a = 'a'
+        fooChecker = NamesChecker(['a'])
+        defineChecker(Foo, fooChecker)
+
+        class Wrapper(ProxyBase):
+            b = 'b'
+            __Security_checker__ = self._makeOne()
+        defineChecker(Wrapper, NamesChecker(['b']))
+        wrapper = Wrapper(Foo())
+
+        checker = wrapper.__Security_checker__
+        undefineChecker(Wrapper)
+        wrapperChecker = NamesChecker(['c'])
+        defineChecker(Wrapper, wrapperChecker)
+        new_checker = wrapper.__Security_checker__
+        self.assertIsNot(new_checker, checker)
+        self.assertIs(new_checker.permission_id('c'),
+                      wrapperChecker.permission_id('c'))
+        self.assertIsNone(new_checker.permission_id('b'))
+
+    def test_instance_checker_not_cached(self):
+        from zope.proxy import ProxyBase
+
+        from zope.security.checker import NamesChecker
+        from zope.security.checker import _combinedCheckers
+        from zope.security.checker import defineChecker
+
+        class Foo:
+            a = 'a'
+
+        class Wrapper(ProxyBase):
+            __Security_checker__ = self._makeOne()
+        defineChecker(Wrapper, NamesChecker(['b']))
+        _combinedCheckers.clear()
+
+        for _ in range(3):
+            foo = Foo()
+            foo.__Security_checker__ = NamesChecker(['a'])
+            checker = Wrapper(foo).__Security_checker__
+            checker.check(foo, 'a')  # no raise
+        self.assertEqual(_combinedCheckers, {})
+
+    def test_checker_factory_for_object_not_cached(self):
+        from zope.proxy import ProxyBase
+
+        from zope.security.checker import NamesChecker
+        from zope.security.checker import _combinedCheckers
+        from zope.security.checker import defineChecker
+
+        class Foo:
+            a = 'a'
+        defineChecker(Foo, lambda foo: NamesChecker(['a']))
+
+        class Wrapper(ProxyBase):
+            __Security_checker__ = self._makeOne()
+        defineChecker(Wrapper, NamesChecker(['b']))
+        _combinedCheckers.clear()
+
+        first = Wrapper(Foo()).__Security_checker__
+        second = Wrapper(Foo()).__Security_checker__
+        self.assertIsNot(first, second)
+        self.assertEqual(_combinedCheckers, {})
+
+    def test_checker_factory_for_wrapper_not_cached(self):
+        from zope.proxy import ProxyBase
+
+        from zope.security.checker import NamesChecker
+        from zope.security.checker import defineChecker
+
+        class Foo:
+            a = 'a'
+        defineChecker(Foo, NamesChecker(['a']))
+
+        class Wrapper(ProxyBase):
+            __Security_checker__ = self._makeOne()
+        checkers = []
+
+        def factory(wrapper):
+            checker = NamesChecker(['b'])
+            checkers.append(checker)
+            return checker
+        defineChecker(Wrapper, factory)
+
+        first = Wrapper(Foo()).__Security_checker__
+        second = Wrapper(Foo()).__Security_checker__
+        self.assertIsNot(first, second)
+        self.assertEqual(len(checkers), 2)
+
     def test_cannot_overwrite(self):
         from zope.proxy import ProxyBase
 
@@ -0,0 +1,156 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import unittest
+
+from zope.testing.cleanup import CleanUp
+
+
+class _Principal:
+
+    def __init__(self, id, *groups):
+        self.id = id
+        self.groups = list(groups)
+
+
+class Test_getGroupClosure(CleanUp, unittest.TestCase):
+
+    def _callFUT(self, principal):
+        from zope.security.groups import getGroupClosure
+        return getGroupClosure(principal)
+
+    def test_wo_groups_attribute(self):
+        class Principal:
+            id = 'foo'
+        self.assertEqual(self._callFUT(Principal()), ())
+
+    def test_w_group_ids(self):
+        principal = _Principal('foo', 'bar', 'baz')
+        self.assertEqual(sorted(self._callFUT(principal)), ['bar', 'baz'])
+
+    def test_w_nested_groups(self):
+        top = _Principal('top')
+        middle = _Principal('middle', top)
+        principal = _Principal('foo', middle, 'other')
+        self.assertEqual(sorted(self._callFUT(principal)),
+                         ['middle', 'other', 'top'])
+
+    def test_w_duplicates(self):
+        top = _Principal('top')
+        left = _Principal('left', top)
+        right = _Principal('right', top)
+        principal = _Principal('foo', left, right, 'top')
+        self.assertEqual(sorted(self._callFUT(principal)),
+                         ['left', 'right', 'top'])
+
+    def test_w_cycle(self):
+        a = _Principal('a')
+        b = _Principal('b', a)
+        a.groups.append(b)
+        principal = _Principal('foo', a)
+        self.assertEqual(sorted(self._callFUT(principal)), ['a', 'b'])
+
+    def test_w_cycle_through_principal(self):
+        principal = _Principal('foo')
+        group = _Principal('group', principal)
+        principal.groups.append(group)
+        self.assertEqual(self._callFUT(principal), ('group',))
+
+    def test_result_is_cached(self):
+        group = _Principal('group')
+        principal = _Principal('foo', group)
+        self.assertEqual(self._callFUT(principal), ('group',))
+        principal.groups.append('other')
+        self.assertEqual(self._callFUT(principal), ('group',))
+        # Any object with the same id gets the cached closure.
+        self.assertEqual(self._callFUT(_Principal('foo')), ('group',))
+
+    def test_uses_cached_closure_of_groups(self):
+        top = _Principal('top')
+        middle = _Principal('middle', top)
+        self.assertEqual(self._callFUT(middle), ('top',))
+        # Changes below a group with a cached closure aren't seen.
+        middle.groups.append('ignored')
+        principal = _Principal('foo', middle)
+        self.assertEqual(sorted(self._callFUT(principal)),
+                         ['middle', 'top'])
+
+    def test_cache_is_bounded(self):
+        from zope.security import groups
+        orig, groups._CLOSURES_MAX = groups._CLOSURES_MAX, 2
+        try:
+            first = _Principal('first', 'a')
+            self._callFUT(first)
+            self._callFUT(_Principal('second', 'b'))
+            # Using a closure makes it the most recently used one.
+            self._callFUT(first)
+            self._callFUT(_Principal('third', 'c'))
+            self.assertEqual(list(groups._closures), ['first', 'third'])
+        finally:
+            groups._CLOSURES_MAX = orig
+
+
+class Test_invalidateGroupClosure(CleanUp, unittest.TestCase):
+
+    def _callFUT(self, *args):
+        from zope.security.groups import invalidateGroupClosure
+        return invalidateGroupClosure(*args)
+
+    def _getGroupClosure(self, principal):
+        from zope.security.groups import getGroupClosure
+        return getGroupClosure(principal)
+
+    def test_w_principal_id(self):
+        foo = _Principal('foo', 'a')
+        bar = _Principal('bar', 'a')
+        self._getGroupClosure(foo)
+        self._getGroupClosure(bar)
+        foo.groups.append('b')
+        bar.groups.append('b')
+        self._callFUT('foo')
+        self.assertEqual(sorted(self._getGroupClosure(foo)), ['a', 'b'])
+        self.assertEqual(self._getGroupClosure(bar), ('a',))
+
+    def test_w_group_id_discards_members(self):
+        from zope.security.groups import _closures
+        top = _Principal('top')
+        middle = _Principal('middle', top)
+        foo = _Principal('foo', middle)
+        bar = _Principal('bar', 'other')
+        self._getGroupClosure(foo)
+        self._getGroupClosure(bar)
+        top.groups.append('new')
+        self._callFUT('top')
+        self.assertEqual(sorted(self._getGroupClosure(foo)),
+                         ['middle', 'new', 'top'])
+        self.assertEqual(sorted(self._getGroupClosure(middle)),
+                         ['new', 'top'])
+        self.assertIn('bar', _closures)
+
+    def test_w_unknown_principal_id(self):
+        self._callFUT('unknown')
+
+    def test_wo_principal_id(self):
+        foo = _Principal('foo', 'a')
+        bar = _Principal('bar', 'a')
+        self._getGroupClosure(foo)
+        self._getGroupClosure(bar)
+        foo.groups.append('b')
+        bar.groups.append('b')
+        self._callFUT()
+        self.assertEqual(sorted(self._getGroupClosure(foo)), ['a', 'b'])
+        self.assertEqual(sorted(self._getGroupClosure(bar)), ['a', 'b'])
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -15,14 +15,18 @@
 """
 import unittest
 
+from zope.security.tests import QuietWatchingChecker
 
-class Test(unittest.TestCase):
+
+class Test(QuietWatchingChecker, unittest.TestCase):
 
     def setUp(self):
+        super().setUp()
         self._cleanUp()
 
     def tearDown(self):
         self._cleanUp()
+        super().tearDown()
 
     def _cleanUp(self):
         from zope.security.management import _clear
@@ -171,6 +175,154 @@ class Test(unittest.TestCase):
         self.assertEqual(checkPermission(None, obj), True)
         self.assertEqual(checkPermission(CheckerPublic, obj), True)
 
+    def test_enableProxyIdentityMap_wo_interaction(self):
+        from zope.security.interfaces import NoInteraction
+        from zope.security.management import enableProxyIdentityMap
+        self.assertRaises(NoInteraction, enableProxyIdentityMap)
+
+    def test_enableProxyIdentityMap(self):
+        from zope.security.checker import Checker
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import ProxyFactory
+        from zope.security.management import enableProxyIdentityMap
+        from zope.security.management import endInteraction
+        from zope.security.management import newInteraction
+        from zope.security.management import restoreInteraction
+
+        class Child:
+            pass
+
+        class Foo:
+            child = Child()
+        proxy = ProxyFactory(Foo(), Checker({'child': CheckerPublic}))
+        newInteraction()
+        self.assertIsNot(proxy.child, proxy.child)
+        enableProxyIdentityMap()
+        self.assertIs(proxy.child, proxy.child)
+        endInteraction()
+        self.assertIsNot(proxy.child, proxy.child)
+        restoreInteraction()
+        self.assertIsNot(proxy.child, proxy.child)
+        enableProxyIdentityMap()
+        endInteraction()
+        newInteraction()
+        self.assertIsNot(proxy.child, proxy.child)
+
+    def _makeProxy(self):
+        from zope.security.checker import Checker
+        from zope.security.checker import CheckerPublic
+        from zope.security.proxy import ProxyFactory
+
+        class Foo:
+            public = 'Public'
+            protected = 'Protected'
+            private = 'Private'
+        checker = Checker({'public': CheckerPublic,
+                           'protected': 'zope.Test'},
+                          {'protected': 'zope.Test'})
+        return ProxyFactory(Foo(), checker)
+
+    def test_trustedRegion(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.interfaces import Unauthorized
+        from zope.security.management import newInteraction
+        from zope.security.management import trustedRegion
+
+        class Participation:
+            interaction = None
+            principal = object()
+        newInteraction(Participation())
+        proxy = self._makeProxy()
+        with trustedRegion():
+            self.assertEqual(proxy.public, 'Public')
+            self.assertEqual(proxy.protected, 'Protected')
+            self.assertEqual(proxy.private, 'Private')
+            proxy.protected = 'Changed'
+        self.assertEqual(proxy.public, 'Public')
+        self.assertRaises(Unauthorized, getattr, proxy, 'protected')
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, 'private')
+        with self.assertRaises(Unauthorized):
+            proxy.protected = 'Again'
+
+    def test_trustedRegion_results_stay_proxied(self):
+        from zope.security.management import trustedRegion
+        from zope.security.proxy import Proxy
+
+        proxy = self._makeProxy()
+        with trustedRegion():
+            method = proxy.__init__
+        self.assertIsInstance(method, Proxy)
+
+    def test_trustedRegion_nested(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.management import trustedRegion
+
+        proxy = self._makeProxy()
+        with trustedRegion():
+            with trustedRegion():
+                self.assertEqual(proxy.private, 'Private')
+            self.assertEqual(proxy.private, 'Private')
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, 'private')
+
+    def test_trustedRegion_w_exception(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.management import trustedRegion
+
+        proxy = self._makeProxy()
+        with self.assertRaises(ValueError):
+            with trustedRegion():
+                raise ValueError
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, 'private')
+
+    def test_trustedRegion_other_tasks(self):
+        import asyncio
+
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.management import trustedRegion
+
+        proxy = self._makeProxy()
+        seen = []
+
+        async def trusted():
+            with trustedRegion():
+                seen.append(proxy.private)
+                await asyncio.sleep(0)
+                seen.append(proxy.private)
+
+        async def untrusted():
+            try:
+                seen.append(proxy.private)
+            except ForbiddenAttribute:
+                seen.append('forbidden')
+
+        async def main():
+            await asyncio.gather(trusted(), untrusted())
+        asyncio.run(main())
+        self.assertEqual(seen, ['Private', 'forbidden', 'Private'])
+
+    def test_trustedRegion_in_generator(self):
+        from zope.security.interfaces import ForbiddenAttribute
+        from zope.security.management import trustedRegion
+
+        proxy = self._makeProxy()
+
+        def generator():
+            with trustedRegion():
+                yield proxy.private
+        self.assertRaises(RuntimeError, next, generator())
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, 'private')
+
+    def test_trustedRegion_canAccess(self):
+        from zope.security.checker import canAccess
+        from zope.security.checker import canWrite
+        from zope.security.management import trustedRegion
+
+        proxy = self._makeProxy()
+        with trustedRegion():
+            self.assertTrue(canAccess(proxy, 'private'))
+            self.assertTrue(canWrite(proxy, 'private'))
+        self.assertRaises(Exception, canAccess, proxy, 'private')
+
     def test_system_user(self):
         from zope.interface.verify import verifyObject
 
@@ -42,6 +42,31 @@ class ClassDirectiveTests(unittest.TestCase):
     def _makeOne(self, _context, class_):
         return self._getTargetClass()(_context, class_)
 
+    def _checkProtections(self, actions, kind, protect, names, permission):
+        # One action per name, for conflict detection, followed by one
+        # protecting the names whose actions were executed.
+        self.assertEqual(len(actions), len(names) + 1)
+        for action, name in zip(actions, names):
+            self.assertEqual(action['discriminator'], (kind, Foo, name))
+            self.assertEqual(action['args'], (name,))
+        batch = actions[-1]
+        self.assertIsNone(batch['discriminator'])
+        self.assertIs(batch['callable'], protect)
+        protected = batch['args'][1]
+        self.assertEqual(batch['args'], (Foo, protected, permission))
+        self.assertEqual(protected, [])
+        for action in actions[:-1]:
+            action['callable'](*action['args'])
+        self.assertEqual(protected, list(names))
+
+    def _checkProvideInterface(self, action, iface):
+        from zope.component.interface import provideInterface
+        self.assertIsNone(action['discriminator'])
+        self.assertIs(action['callable'], provideInterface)
+        self.assertEqual(action['args'],
+                         ('zope.security.tests.test_metaconfigure.'
+                          + iface.__name__, iface))
+
     # def test_ctor_non_class(self): TODO  needs better guard in __init__
 
     def test_implements_empty(self):
@@ -130,11 +155,10 @@ class ClassDirectiveTests(unittest.TestCase):
             directive.require(context, attributes=('foo', 'bar'))
 
     def test_require_w_single_interface(self):
-        from zope.component.interface import provideInterface
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.protectclass import protectName
+        from zope.security.protectclass import protectNames
 
         class IFoo(Interface):
             bar = Attribute("Bar")
@@ -142,26 +166,16 @@ class ClassDirectiveTests(unittest.TestCase):
         context = DummyZCMLContext()
         directive = self._makeOne(context, Foo)
         directive.require(context, permission='testing', interface=[IFoo])
-        self.assertEqual(len(context._actions), 3)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectName', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectName)
-        self.assertEqual(context._actions[0]['args'], (Foo, 'bar', 'testing'))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('protectName', Foo, 'baz'))
-        self.assertIs(context._actions[1]['callable'], protectName)
-        self.assertEqual(context._actions[1]['args'], (Foo, 'baz', 'testing'))
-        self.assertIsNone(context._actions[2]['discriminator'])
-        self.assertIs(context._actions[2]['callable'], provideInterface)
-        self.assertEqual(context._actions[2]['args'],
-                         ('zope.security.tests.test_metaconfigure.IFoo', IFoo))
+        self.assertEqual(len(context._actions), 4)
+        self._checkProtections(context._actions[:3], 'protectName',
+                               protectNames, ['bar', 'baz'], 'testing')
+        self._checkProvideInterface(context._actions[3], IFoo)
 
     def test_require_w_multiple_interfaces(self):
-        from zope.component.interface import provideInterface
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.protectclass import protectName
+        from zope.security.protectclass import protectNames
 
         class IFoo(Interface):
             bar = Attribute("Bar")
@@ -172,62 +186,38 @@ class ClassDirectiveTests(unittest.TestCase):
         directive = self._makeOne(context, Foo)
         directive.require(context, permission='testing',
                           interface=[IFoo, IBar])
-        self.assertEqual(len(context._actions), 4)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectName', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectName)
-        self.assertEqual(context._actions[0]['args'], (Foo, 'bar', 'testing'))
-        self.assertIsNone(context._actions[1]['discriminator'])
-        self.assertIs(context._actions[1]['callable'], provideInterface)
-        self.assertEqual(context._actions[1]['args'],
-                         ('zope.security.tests.test_metaconfigure.IFoo', IFoo))
-        self.assertEqual(context._actions[2]['discriminator'],
-                         ('protectName', Foo, 'baz'))
-        self.assertIs(context._actions[2]['callable'], protectName)
-        self.assertEqual(context._actions[2]['args'], (Foo, 'baz', 'testing'))
-        self.assertIsNone(context._actions[3]['discriminator'])
-        self.assertIs(context._actions[3]['callable'], provideInterface)
-        self.assertEqual(context._actions[3]['args'],
-                         ('zope.security.tests.test_metaconfigure.IBar', IBar))
+        self.assertEqual(len(context._actions), 6)
+        self._checkProtections(context._actions[:2], 'protectName',
+                               protectNames, ['bar'], 'testing')
+        self._checkProvideInterface(context._actions[2], IFoo)
+        self._checkProtections(context._actions[3:5], 'protectName',
+                               protectNames, ['baz'], 'testing')
+        self._checkProvideInterface(context._actions[5], IBar)
 
     def test_require_w_attributes(self):
-        from zope.security.protectclass import protectName
+        from zope.security.protectclass import protectNames
         context = DummyZCMLContext()
         directive = self._makeOne(context, Foo)
         directive.require(context, permission='testing',
                           attributes=['bar', 'baz'])
-        self.assertEqual(len(context._actions), 2)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectName', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectName)
-        self.assertEqual(context._actions[0]['args'], (Foo, 'bar', 'testing'))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('protectName', Foo, 'baz'))
-        self.assertIs(context._actions[1]['callable'], protectName)
-        self.assertEqual(context._actions[1]['args'], (Foo, 'baz', 'testing'))
+        self._checkProtections(context._actions, 'protectName',
+                               protectNames, ['bar', 'baz'], 'testing')
 
     def test_require_w_set_attributes(self):
-        from zope.security.protectclass import protectSetAttribute
+        from zope.security.protectclass import protectSetAttributes
         context = DummyZCMLContext()
         directive = self._makeOne(context, Foo)
         directive.require(context, permission='testing',
                           set_attributes=['bar', 'baz'])
-        self.assertEqual(len(context._actions), 2)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectSetAttribute', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectSetAttribute)
-        self.assertEqual(context._actions[0]['args'], (Foo, 'bar', 'testing'))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('protectSetAttribute', Foo, 'baz'))
-        self.assertIs(context._actions[1]['callable'], protectSetAttribute)
-        self.assertEqual(context._actions[1]['args'], (Foo, 'baz', 'testing'))
+        self._checkProtections(context._actions, 'protectSetAttribute',
+                               protectSetAttributes, ['bar', 'baz'],
+                               'testing')
 
     def test_require_w_set_schema_normal_fields(self):
-        from zope.component.interface import provideInterface
         from zope.interface import Interface
         from zope.schema import Field
 
-        from zope.security.protectclass import protectSetAttribute
+        from zope.security.protectclass import protectSetAttributes
 
         class IFoo(Interface):
             bar = Field("Bar")
@@ -235,19 +225,11 @@ class ClassDirectiveTests(unittest.TestCase):
         context = DummyZCMLContext()
         directive = self._makeOne(context, Foo)
         directive.require(context, permission='testing', set_schema=[IFoo])
-        self.assertEqual(len(context._actions), 3)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectSetAttribute', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectSetAttribute)
-        self.assertEqual(context._actions[0]['args'], (Foo, 'bar', 'testing'))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('protectSetAttribute', Foo, 'baz'))
-        self.assertIs(context._actions[1]['callable'], protectSetAttribute)
-        self.assertEqual(context._actions[1]['args'], (Foo, 'baz', 'testing'))
-        self.assertIsNone(context._actions[2]['discriminator'])
-        self.assertIs(context._actions[2]['callable'], provideInterface)
-        self.assertEqual(context._actions[2]['args'],
-                         ('zope.security.tests.test_metaconfigure.IFoo', IFoo))
+        self.assertEqual(len(context._actions), 4)
+        self._checkProtections(context._actions[:3], 'protectSetAttribute',
+                               protectSetAttributes, ['bar', 'baz'],
+                               'testing')
+        self._checkProvideInterface(context._actions[3], IFoo)
 
     def test_require_w_set_schema_ignores_non_fields(self):
         from zope.component.interface import provideInterface
@@ -288,11 +270,10 @@ class ClassDirectiveTests(unittest.TestCase):
         self.assertRaises(ConfigurationError, directive.allow, context)
 
     def test_allow_w_single_interface(self):
-        from zope.component.interface import provideInterface
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.protectclass import protectName
+        from zope.security.protectclass import protectNames
 
         class IFoo(Interface):
             bar = Attribute("Bar")
@@ -300,28 +281,16 @@ class ClassDirectiveTests(unittest.TestCase):
         context = DummyZCMLContext()
         directive = self._makeOne(context, Foo)
         directive.allow(context, interface=[IFoo])
-        self.assertEqual(len(context._actions), 3)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectName', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectName)
-        self.assertEqual(context._actions[0]['args'],
-                         (Foo, 'bar', zope_Public))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('protectName', Foo, 'baz'))
-        self.assertIs(context._actions[1]['callable'], protectName)
-        self.assertEqual(context._actions[1]['args'],
-                         (Foo, 'baz', zope_Public))
-        self.assertIsNone(context._actions[2]['discriminator'])
-        self.assertIs(context._actions[2]['callable'], provideInterface)
-        self.assertEqual(context._actions[2]['args'],
-                         ('zope.security.tests.test_metaconfigure.IFoo', IFoo))
+        self.assertEqual(len(context._actions), 4)
+        self._checkProtections(context._actions[:3], 'protectName',
+                               protectNames, ['bar', 'baz'], zope_Public)
+        self._checkProvideInterface(context._actions[3], IFoo)
 
     def test_allow_w_multiple_interfaces(self):
-        from zope.component.interface import provideInterface
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.protectclass import protectName
+        from zope.security.protectclass import protectNames
 
         class IFoo(Interface):
             bar = Attribute("Bar")
@@ -331,42 +300,32 @@ class ClassDirectiveTests(unittest.TestCase):
         context = DummyZCMLContext()
         directive = self._makeOne(context, Foo)
         directive.allow(context, interface=[IFoo, IBar])
-        self.assertEqual(len(context._actions), 4)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectName', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectName)
-        self.assertEqual(context._actions[0]['args'],
-                         (Foo, 'bar', zope_Public))
-        self.assertIsNone(context._actions[1]['discriminator'])
-        self.assertIs(context._actions[1]['callable'], provideInterface)
-        self.assertEqual(context._actions[1]['args'],
-                         ('zope.security.tests.test_metaconfigure.IFoo', IFoo))
-        self.assertEqual(context._actions[2]['discriminator'],
-                         ('protectName', Foo, 'baz'))
-        self.assertIs(context._actions[2]['callable'], protectName)
-        self.assertEqual(context._actions[2]['args'],
-                         (Foo, 'baz', zope_Public))
-        self.assertIsNone(context._actions[3]['discriminator'])
-        self.assertIs(context._actions[3]['callable'], provideInterface)
-        self.assertEqual(context._actions[3]['args'],
-                         ('zope.security.tests.test_metaconfigure.IBar', IBar))
+        self.assertEqual(len(context._actions), 6)
+        self._checkProtections(context._actions[:2], 'protectName',
+                               protectNames, ['bar'], zope_Public)
+        self._checkProvideInterface(context._actions[2], IFoo)
+        self._checkProtections(context._actions[3:5], 'protectName',
+                               protectNames, ['baz'], zope_Public)
+        self._checkProvideInterface(context._actions[5], IBar)
 
     def test_allow_w_attributes(self):
-        from zope.security.protectclass import protectName
+        from zope.security.protectclass import protectNames
         context = DummyZCMLContext()
         directive = self._makeOne(context, Foo)
         directive.allow(context, attributes=['bar', 'baz'])
-        self.assertEqual(len(context._actions), 2)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('protectName', Foo, 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectName)
-        self.assertEqual(context._actions[0]['args'],
-                         (Foo, 'bar', zope_Public))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('protectName', Foo, 'baz'))
-        self.assertIs(context._actions[1]['callable'], protectName)
-        self.assertEqual(context._actions[1]['args'],
-                         (Foo, 'baz', zope_Public))
+        self._checkProtections(context._actions, 'protectName',
+                               protectNames, ['bar', 'baz'], zope_Public)
+
+    def test_require_w_empty_interface(self):
+        from zope.interface import Interface
+
+        class IFoo(Interface):
+            pass
+        context = DummyZCMLContext()
+        directive = self._makeOne(context, Foo)
+        directive.require(context, permission='testing', interface=[IFoo])
+        self.assertEqual(len(context._actions), 1)
+        self._checkProvideInterface(context._actions[0], IFoo)
 
     def test___call__(self):
         context = DummyZCMLContext()
@@ -461,7 +420,68 @@ class Test_protectModule(unittest.TestCase):
         self.assertIs(checker.get_permissions['name'], CheckerPublic)
 
 
-class Test_allow(unittest.TestCase):
+class Test_protectModuleNames(unittest.TestCase):
+
+    def setUp(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def tearDown(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def _callFUT(self, module, names, permission):
+        from zope.security.metaconfigure import protectModuleNames
+        return protectModuleNames(module, names, permission)
+
+    def test_check_wo_existing_module_checker(self):
+        from zope.security import tests as module
+        from zope.security.checker import _checkers
+        perm = object()
+        self._callFUT(module, ['name', 'other'], perm)
+        checker = _checkers[module]
+        self.assertEqual(checker.get_permissions,
+                         {'name': perm, 'other': perm})
+
+    def test_check_w_existing_module_checker_zope_Public(self):
+        from zope.security import tests as module
+        from zope.security.checker import Checker
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import _checkers
+        perm = object()
+        before = _checkers[module] = Checker({'other': perm})
+        self._callFUT(module, ['name', 'more'], zope_Public)
+        checker = _checkers[module]
+        self.assertIs(checker, before)
+        self.assertEqual(checker.get_permissions,
+                         {'name': CheckerPublic, 'more': CheckerPublic,
+                          'other': perm})
+
+
+class _ModuleProtectionsChecks:
+
+    def _checkProtections(self, actions, names, permission):
+        # One action per name, for conflict detection, followed by one
+        # protecting the names whose actions were executed.
+        from zope.security.metaconfigure import protectModuleNames
+        self.assertEqual(len(actions), len(names) + 1)
+        for action, name in zip(actions, names):
+            self.assertEqual(action['discriminator'],
+                             ('http://namespaces.zope.org/zope:module',
+                              'testing', name))
+            self.assertEqual(action['args'], (name,))
+        batch = actions[-1]
+        self.assertIsNone(batch['discriminator'])
+        self.assertIs(batch['callable'], protectModuleNames)
+        protected = batch['args'][1]
+        self.assertEqual(batch['args'], ('testing', protected, permission))
+        self.assertEqual(protected, [])
+        for action in actions[:-1]:
+            action['callable'](*action['args'])
+        self.assertEqual(protected, list(names))
+
+
+class Test_allow(_ModuleProtectionsChecks, unittest.TestCase):
 
     def setUp(self):
         from zope.security.checker import _clear
@@ -487,50 +507,27 @@ class Test_allow(unittest.TestCase):
         self.assertEqual(len(context._actions), 0)
 
     def test_w_attributes(self):
-        from zope.security.metaconfigure import protectModule
         ATTRS = ['foo', 'bar']
         context = DummyZCMLContext()
         context.module = 'testing'
         self._callFUT(context, ATTRS)
-        self.assertEqual(len(context._actions), len(ATTRS))
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'foo'))
-        self.assertIs(context._actions[0]['callable'], protectModule)
-        self.assertEqual(context._actions[0]['args'],
-                         ('testing', 'foo', zope_Public))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'bar'))
-        self.assertIs(context._actions[1]['callable'], protectModule)
-        self.assertEqual(context._actions[1]['args'],
-                         ('testing', 'bar', zope_Public))
+        self._checkProtections(context._actions, ATTRS, zope_Public)
 
     def test_w_interface(self):
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.metaconfigure import protectModule
-
         class IFoo(Interface):
             bar = Attribute('Bar')
         context = DummyZCMLContext()
         context.module = 'testing'
         self._callFUT(context, interface=[IFoo])
-        self.assertEqual(len(context._actions), 1)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectModule)
-        self.assertEqual(context._actions[0]['args'],
-                         ('testing', 'bar', zope_Public))
+        self._checkProtections(context._actions, ['bar'], zope_Public)
 
     def test_w_both(self):
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.metaconfigure import protectModule
-
         class IFoo(Interface):
             bar = Attribute('Bar')
             baz = Attribute('Baz')
@@ -538,28 +535,11 @@ class Test_allow(unittest.TestCase):
         context = DummyZCMLContext()
         context.module = 'testing'
         self._callFUT(context, ATTRS, [IFoo])
-        self.assertEqual(len(context._actions), 3)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'foo'))
-        self.assertIs(context._actions[0]['callable'], protectModule)
-        self.assertEqual(context._actions[0]['args'],
-                         ('testing', 'foo', zope_Public))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'bar'))
-        self.assertIs(context._actions[1]['callable'], protectModule)
-        self.assertEqual(context._actions[1]['args'],
-                         ('testing', 'bar', zope_Public))
-        self.assertEqual(context._actions[2]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'baz'))
-        self.assertIs(context._actions[2]['callable'], protectModule)
-        self.assertEqual(context._actions[2]['args'],
-                         ('testing', 'baz', zope_Public))
+        self._checkProtections(context._actions, ['foo', 'bar', 'baz'],
+                               zope_Public)
 
 
-class Test_requre(unittest.TestCase):
+class Test_requre(_ModuleProtectionsChecks, unittest.TestCase):
 
     def setUp(self):
         from zope.security.checker import _clear
@@ -587,52 +567,29 @@ class Test_requre(unittest.TestCase):
         self.assertEqual(len(context._actions), 0)
 
     def test_w_attributes(self):
-        from zope.security.metaconfigure import protectModule
         ATTRS = ['foo', 'bar']
         context = DummyZCMLContext()
         context.module = 'testing'
         perm = object()
         self._callFUT(context, perm, ATTRS)
-        self.assertEqual(len(context._actions), len(ATTRS))
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'foo'))
-        self.assertIs(context._actions[0]['callable'], protectModule)
-        self.assertEqual(context._actions[0]['args'],
-                         ('testing', 'foo', perm))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'bar'))
-        self.assertIs(context._actions[1]['callable'], protectModule)
-        self.assertEqual(context._actions[1]['args'],
-                         ('testing', 'bar', perm))
+        self._checkProtections(context._actions, ATTRS, perm)
 
     def test_w_interface(self):
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.metaconfigure import protectModule
-
         class IFoo(Interface):
             bar = Attribute('Bar')
         context = DummyZCMLContext()
         context.module = 'testing'
         perm = object()
         self._callFUT(context, perm, interface=[IFoo])
-        self.assertEqual(len(context._actions), 1)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'bar'))
-        self.assertIs(context._actions[0]['callable'], protectModule)
-        self.assertEqual(context._actions[0]['args'],
-                         ('testing', 'bar', perm))
+        self._checkProtections(context._actions, ['bar'], perm)
 
     def test_w_both(self):
         from zope.interface import Attribute
         from zope.interface import Interface
 
-        from zope.security.metaconfigure import protectModule
-
         class IFoo(Interface):
             bar = Attribute('Bar')
             baz = Attribute('Baz')
@@ -641,25 +598,7 @@ class Test_requre(unittest.TestCase):
         context.module = 'testing'
         perm = object()
         self._callFUT(context, perm, ATTRS, [IFoo])
-        self.assertEqual(len(context._actions), 3)
-        self.assertEqual(context._actions[0]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'foo'))
-        self.assertIs(context._actions[0]['callable'], protectModule)
-        self.assertEqual(context._actions[0]['args'],
-                         ('testing', 'foo', perm))
-        self.assertEqual(context._actions[1]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'bar'))
-        self.assertIs(context._actions[1]['callable'], protectModule)
-        self.assertEqual(context._actions[1]['args'],
-                         ('testing', 'bar', perm))
-        self.assertEqual(context._actions[2]['discriminator'],
-                         ('http://namespaces.zope.org/zope:module',
-                          'testing', 'baz'))
-        self.assertIs(context._actions[2]['callable'], protectModule)
-        self.assertEqual(context._actions[2]['args'],
-                         ('testing', 'baz', perm))
+        self._checkProtections(context._actions, ['foo', 'bar', 'baz'], perm)
 
 
 class DummyZCMLContext:
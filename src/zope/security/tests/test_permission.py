@@ -59,6 +59,44 @@ class PermissionTests(unittest.TestCase):
         self.assertEqual(permission.description, 'DESCRIPTION')
 
 
+class Test_getPermissionToken(unittest.TestCase):
+
+    def _callFUT(self, permission_id):
+        from zope.security.permission import getPermissionToken
+        return getPermissionToken(permission_id)
+
+    def test_token(self):
+        from zope.security.permission import PermissionToken
+        token = self._callFUT('zope.security.tests.token')
+        self.assertIsInstance(token, PermissionToken)
+        self.assertEqual(token, 'zope.security.tests.token')
+        self.assertEqual(hash(token), hash('zope.security.tests.token'))
+        self.assertIsInstance(token.slot, int)
+
+    def test_interned(self):
+        token = self._callFUT('zope.security.tests.token')
+        self.assertIs(self._callFUT('zope.security.tests.token'), token)
+        self.assertIs(self._callFUT(token), token)
+        self.assertIs({token: 1}.get('zope.security.tests.token'), 1)
+
+    def test_slots(self):
+        from zope.security.permission import getPermissionTokens
+        one = self._callFUT('zope.security.tests.one')
+        two = self._callFUT('zope.security.tests.two')
+        self.assertNotEqual(one.slot, two.slot)
+        tokens = getPermissionTokens()
+        self.assertIs(tokens[one.slot], one)
+        self.assertIs(tokens[two.slot], two)
+
+    def test_non_string(self):
+        self.assertRaises(TypeError, self._callFUT, object())
+
+    def test_pickle(self):
+        import pickle
+        token = self._callFUT('zope.security.tests.token')
+        self.assertIs(pickle.loads(pickle.dumps(token)), token)
+
+
 class Test_checkPermission(PlacelessSetup, unittest.TestCase):
 
     def _callFUT(self, context, permission_id):
@@ -81,6 +119,38 @@ class Test_checkPermission(PlacelessSetup, unittest.TestCase):
         self._callFUT(None, 'testing')  # no raise
 
 
+class Test_checkPermissions(PlacelessSetup, unittest.TestCase):
+
+    def _callFUT(self, context, permission_ids):
+        from zope.security.permission import checkPermissions
+        return checkPermissions(context, permission_ids)
+
+    def test_empty(self):
+        self._callFUT(None, ())  # no raise
+
+    def test_w_CheckerPublic(self):
+        from zope.security.checker import CheckerPublic
+        self._callFUT(None, [CheckerPublic])  # no raise
+
+    def test_hit(self):
+        from zope.component import provideUtility
+
+        from zope.security.interfaces import IPermission
+        provideUtility(object(), IPermission, 'a')
+        provideUtility(object(), IPermission, 'b')
+        self._callFUT(None, ['b', 'a', 'b'])  # no raise
+
+    def test_miss_reports_first_undefined(self):
+        from zope.component import provideUtility
+
+        from zope.security.interfaces import IPermission
+        provideUtility(object(), IPermission, 'a')
+        with self.assertRaises(ValueError) as exc:
+            self._callFUT(None, ['a', 'y', 'x'])
+        self.assertEqual(exc.exception.args,
+                         ('Undefined permission ID', 'y'))
+
+
 class Test_allPermissions(PlacelessSetup, unittest.TestCase):
 
     def _callFUT(self):
@@ -99,6 +169,15 @@ class Test_allPermissions(PlacelessSetup, unittest.TestCase):
         provideUtility(permission, IPermission, 'testing')
         self.assertEqual(list(self._callFUT()), ['testing'])
 
+    def test_yields_tokens(self):
+        from zope.component import provideUtility
+
+        from zope.security.interfaces import IPermission
+        from zope.security.permission import getPermissionToken
+        provideUtility(object(), IPermission, 'testing')
+        token, = self._callFUT()
+        self.assertIs(token, getPermissionToken('testing'))
+
     def test_skips_zope_Public(self):
         self.assertEqual(list(self._callFUT()), [])
         from zope.component import provideUtility
@@ -205,5 +284,78 @@ class Test_PermissionIdsVocabulary(PlacelessSetup, unittest.TestCase):
                          [zope_Public, 'testing'])
 
 
+class _VocabularyCachingTests(PlacelessSetup):
+
+    def _callFUT(self, context=None):
+        raise NotImplementedError("Subclass responsibility")
+
+    def test_cached(self):
+        from zope.component import provideUtility
+
+        from zope.security.interfaces import IPermission
+        provideUtility(object(), IPermission, 'testing')
+        self.assertIs(self._callFUT(), self._callFUT())
+
+    def test_invalidated_by_unregistration(self):
+        from zope.component import getGlobalSiteManager
+        from zope.component import provideUtility
+
+        from zope.security.interfaces import IPermission
+        permission = object()
+        provideUtility(permission, IPermission, 'testing')
+        self.assertEqual(len(self._callFUT()), 1)
+        getGlobalSiteManager().unregisterUtility(
+            permission, IPermission, 'testing')
+        self.assertEqual(len(self._callFUT()), 0)
+
+    def test_per_site_manager(self):
+        from zope.component import getGlobalSiteManager
+        from zope.interface.registry import Components
+
+        from zope.security.interfaces import IPermission
+        local = Components('local', (getGlobalSiteManager(),))
+        local.registerUtility(object(), IPermission, 'local')
+        self.assertEqual(len(self._callFUT()), 0)
+        self.assertEqual(len(self._callFUT(local)), 1)
+        # Registrations in a base are seen by the local site manager.
+        getGlobalSiteManager().registerUtility(
+            object(), IPermission, 'global')
+        self.assertEqual(len(self._callFUT(local)), 2)
+        self.assertEqual(len(self._callFUT()), 1)
+
+    def test_wo_generation_not_cached(self):
+        from zope.interface import implementer
+        from zope.interface.interfaces import IComponentLookup
+
+        @implementer(IComponentLookup)
+        class SiteManager:
+            def __init__(self):
+                self.permissions = []
+
+            def getUtilitiesFor(self, interface):
+                return list(self.permissions)
+
+        site_manager = SiteManager()
+        self.assertEqual(len(self._callFUT(site_manager)), 0)
+        site_manager.permissions.append(('testing', object()))
+        self.assertEqual(len(self._callFUT(site_manager)), 1)
+
+
+class Test_PermissionsVocabulary_caching(_VocabularyCachingTests,
+                                         unittest.TestCase):
+
+    def _callFUT(self, context=None):
+        from zope.security.permission import PermissionsVocabulary
+        return PermissionsVocabulary(context)
+
+
+class Test_PermissionIdsVocabulary_caching(_VocabularyCachingTests,
+                                           unittest.TestCase):
+
+    def _callFUT(self, context=None):
+        from zope.security.permission import PermissionIdsVocabulary
+        return PermissionIdsVocabulary(context)
+
+
 def test_suite():
     return unittest.defaultTestLoader.loadTestsFromName(__name__)
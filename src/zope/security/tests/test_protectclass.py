@@ -48,6 +48,43 @@ class Test_protectName(unittest.TestCase):
         self.assertIs(checker.get_permissions['bar'], permission)
 
 
+class Test_protectNames(unittest.TestCase):
+
+    def setUp(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def tearDown(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def _callFUT(self, class_, names, permission):
+        from zope.security.protectclass import protectNames
+        return protectNames(class_, names, permission)
+
+    def test_wo_existing_checker_w_zope_Public(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import _checkers
+        self._callFUT(Foo, ['bar', 'baz'], zope_Public)
+        self.assertEqual(_checkers[Foo].get_permissions,
+                         {'bar': CheckerPublic, 'baz': CheckerPublic})
+
+    def test_w_existing_checker(self):
+        from zope.security.checker import Checker
+        from zope.security.checker import _checkers
+        checker = _checkers[Foo] = Checker({'qux': None})
+        permission = object()
+        self._callFUT(Foo, ['bar', 'baz'], permission)
+        self.assertIs(_checkers[Foo], checker)
+        self.assertEqual(checker.get_permissions,
+                         {'bar': permission, 'baz': permission, 'qux': None})
+
+    def test_wo_names(self):
+        from zope.security.checker import _checkers
+        self._callFUT(Foo, [], zope_Public)
+        self.assertEqual(_checkers[Foo].get_permissions, {})
+
+
 class Test_protectSetAttribute(unittest.TestCase):
 
     def setUp(self):
@@ -78,6 +115,38 @@ class Test_protectSetAttribute(unittest.TestCase):
         self.assertIs(checker.set_permissions['bar'], permission)
 
 
+class Test_protectSetAttributes(unittest.TestCase):
+
+    def setUp(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def tearDown(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def _callFUT(self, class_, names, permission):
+        from zope.security.protectclass import protectSetAttributes
+        return protectSetAttributes(class_, names, permission)
+
+    def test_wo_existing_checker_w_zope_Public(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import _checkers
+        self._callFUT(Foo, ['bar', 'baz'], zope_Public)
+        self.assertEqual(_checkers[Foo].set_permissions,
+                         {'bar': CheckerPublic, 'baz': CheckerPublic})
+
+    def test_w_existing_checker(self):
+        from zope.security.checker import Checker
+        from zope.security.checker import _checkers
+        checker = _checkers[Foo] = Checker({})
+        permission = object()
+        self._callFUT(Foo, ['bar', 'baz'], permission)
+        self.assertIs(_checkers[Foo], checker)
+        self.assertEqual(checker.set_permissions,
+                         {'bar': permission, 'baz': permission})
+
+
 class Test_protectLikeUnto(unittest.TestCase):
 
     def setUp(self):
@@ -132,9 +201,73 @@ class Test_protectLikeUnto(unittest.TestCase):
                          foo_checker.set_permissions)
 
 
+class Test_redefinePermissions(unittest.TestCase):
+
+    def setUp(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def tearDown(self):
+        from zope.security.checker import _clear
+        _clear()
+
+    def _callFUT(self, mapping):
+        from zope.security.protectclass import redefinePermissions
+        return redefinePermissions(mapping)
+
+    def test_rewrites_and_interns(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import _checkers
+        from zope.security.permission import getPermissionToken
+        from zope.security.protectclass import protectName
+        from zope.security.protectclass import protectSetAttribute
+        protectName(Foo, 'bar', 'zope.View')
+        protectName(Foo, 'baz', 'zope.Other')
+        protectName(Foo, 'public', zope_Public)
+        protectSetAttribute(Foo, 'bar', 'zope.View')
+        self._callFUT({'zope.View': 'zope.Security'})
+        checker = _checkers[Foo]
+        token = getPermissionToken('zope.Security')
+        self.assertIs(checker.get_permissions['bar'], token)
+        self.assertIs(checker.set_permissions['bar'], token)
+        self.assertIs(checker.get_permissions['baz'],
+                      getPermissionToken('zope.Other'))
+        self.assertIs(checker.get_permissions['public'], CheckerPublic)
+
+    def test_not_transitive(self):
+        from zope.security.checker import _checkers
+        from zope.security.protectclass import protectName
+        protectName(Foo, 'bar', 'a')
+        protectName(Foo, 'baz', 'b')
+        self._callFUT({'a': 'b', 'b': 'c'})
+        self.assertEqual(_checkers[Foo].get_permissions,
+                         {'bar': 'b', 'baz': 'c'})
+
+    def test_to_public(self):
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import _checkers
+        from zope.security.protectclass import protectName
+        protectName(Foo, 'bar', 'zope.View')
+        self._callFUT({'zope.View': zope_Public})
+        self.assertIs(_checkers[Foo].get_permissions['bar'], CheckerPublic)
+
+    def test_skips_non_name_based_checker(self):
+        from zope.security.checker import _checkers
+        from zope.security.checker import defineChecker
+
+        def checker(ob):
+            raise AssertionError("Never called")
+        defineChecker(Foo, checker)
+        self._callFUT({'zope.View': 'zope.Security'})
+        self.assertIs(_checkers[Foo], checker)
+
+
 class Foo:
     bar = 'Bar'
 
+    class Nested:
+        pass
+
 
 class Bar(Foo):
     baz = 'Baz'
@@ -143,7 +276,12 @@ class Bar(Foo):
 def test_suite():
     return unittest.TestSuite((
         unittest.defaultTestLoader.loadTestsFromTestCase(Test_protectName),
+        unittest.defaultTestLoader.loadTestsFromTestCase(Test_protectNames),
         unittest.defaultTestLoader.loadTestsFromTestCase(
             Test_protectSetAttribute),
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            Test_protectSetAttributes),
         unittest.defaultTestLoader.loadTestsFromTestCase(Test_protectLikeUnto),
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            Test_redefinePermissions),
     ))
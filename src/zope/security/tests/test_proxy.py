@@ -15,6 +15,7 @@
 """
 import io
 import os
+import sys
 import unittest
 
 from zope.security._compat import PURE_PYTHON
@@ -332,6 +333,28 @@ class AbstractProxyTestBase:
         self.assertRaises(ForbiddenAttribute, proxy)
         self.assertEqual(checker._checked, '__call__')
 
+    def test___call___w_arguments(self):
+        class Foo:
+            def __call__(self, *args, **kw):
+                return args, kw
+        target = Foo()
+        checker = DummyChecker()
+        proxy = self._makeOne(target, checker)
+        self.assertEqual(proxy(1, 2, b=3), ((1, 2), {'b': 3}))
+        self.assertEqual(proxy(*(1,), **{'b': 3}), ((1,), {'b': 3}))
+        self.assertEqual(checker._checked, '__call__')
+
+    def test___call___subclass_overrides(self):
+        class Foo:
+            def __call__(self):
+                raise AssertionError("Never called")
+
+        class Subclass(self._getTargetClass()):
+            def __call__(self, *args):
+                return 'Sub', args
+        proxy = Subclass(Foo(), DummyChecker())
+        self.assertEqual(proxy(1), ('Sub', (1,)))
+
     def test___int___w_checker_allows(self):
         target = 3.0
         checker = DummyChecker()
@@ -1290,6 +1313,25 @@ class ProxyCTests(AbstractProxyTestBase,
         from zope.security.proxy import _Proxy
         return _Proxy
 
+    def test_trusted_region_skips_checker(self):  # pragma: no cover
+        from zope.security._proxy import _enterTrustedRegion
+        from zope.security._proxy import _exitTrustedRegion
+        from zope.security.interfaces import ForbiddenAttribute
+
+        class Foo:
+            bar = 'Bar'
+        checker = DummyChecker(ForbiddenAttribute)
+        proxy = self._makeOne(Foo(), checker)
+        token = _enterTrustedRegion(sys._getframe())
+        try:
+            self.assertEqual(proxy.bar, 'Bar')
+            proxy.baz = 'Baz'
+        finally:
+            _exitTrustedRegion(token)
+        self.assertIsNone(checker._checked)
+        self.assertEqual(checker._proxied, 'Bar')
+        self.assertRaises(ForbiddenAttribute, getattr, proxy, 'bar')
+
 
 class ProxyPyTests(AbstractProxyTestBase,
                    unittest.TestCase):
@@ -1414,6 +1456,307 @@ class ProxyPyTests(AbstractProxyTestBase,
         self.assertEqual(WithModule.__module__, proxy.__module__)
 
 
+class RemoveSecurityProxiesTestsBase:
+
+    def _getTargetClass(self):
+        raise NotImplementedError("Subclasses must define")
+
+    def _callFUT(self, obj, *args, **kw):
+        raise NotImplementedError("Subclasses must define")
+
+    def _proxy(self, obj):
+        return self._getTargetClass()(obj, object())
+
+    def test_not_proxied(self):
+        obj = object()
+        self.assertIs(self._callFUT(obj), obj)
+
+    def test_proxied(self):
+        obj = object()
+        self.assertIs(self._callFUT(self._proxy(obj)), obj)
+
+    def test_proxied_twice(self):
+        obj = object()
+        self.assertIs(self._callFUT(self._proxy(self._proxy(obj))), obj)
+
+    def test_containers_wo_proxies_not_copied(self):
+        obj = object()
+        for container in ([obj, [obj]], (obj, (obj,)), {obj: [obj]},
+                          {obj}, frozenset([obj]), [], (), {}):
+            self.assertIs(self._callFUT(container), container)
+
+    def test_list(self):
+        obj = object()
+        container = [obj, self._proxy(obj), obj]
+        result = self._callFUT(container)
+        self.assertIsInstance(result, list)
+        self.assertIsNot(result, container)
+        self.assertEqual(len(result), 3)
+        for item in result:
+            self.assertIs(item, obj)
+        self.assertIsInstance(container[1], self._getTargetClass())
+
+    def test_tuple(self):
+        obj = object()
+        container = (obj, self._proxy(obj), self._proxy(obj))
+        result = self._callFUT(container)
+        self.assertIsInstance(result, tuple)
+        self.assertEqual(len(result), 3)
+        for item in result:
+            self.assertIs(item, obj)
+
+    def test_dict(self):
+        obj, other = object(), object()
+        container = {'a': obj, 'b': self._proxy(obj), other: 1}
+        result = self._callFUT(container)
+        self.assertIsInstance(result, dict)
+        self.assertIsNot(result, container)
+        self.assertEqual(list(result), ['a', 'b', other])
+        self.assertIs(result['a'], obj)
+        self.assertIs(result['b'], obj)
+        self.assertIsInstance(container['b'], self._getTargetClass())
+
+    def test_dict_proxied_key(self):
+        # Proxies hash and compare like the object they wrap.
+        obj = 'key'
+        result = self._callFUT({self._proxy(obj): 1})
+        self.assertEqual(result, {obj: 1})
+        self.assertIs(type(list(result)[0]), str)
+
+    def test_sets(self):
+        obj = 'item'
+        for kind in set, frozenset:
+            result = self._callFUT(kind([self._proxy(obj), 'other']))
+            self.assertIs(type(result), kind)
+            self.assertEqual(result, {obj, 'other'})
+            for item in result:
+                self.assertIs(type(item), str)
+
+    def test_nested(self):
+        obj = object()
+        container = self._proxy(
+            {'a': self._proxy([self._proxy((self._proxy(obj), obj))])})
+        result = self._callFUT(container)
+        self.assertEqual(result, {'a': [(obj, obj)]})
+        self.assertIs(type(result['a']), list)
+        self.assertIs(result['a'][0][0], obj)
+
+    def test_not_deep(self):
+        obj = object()
+        inner = [self._proxy(obj)]
+        container = self._proxy([self._proxy(obj), self._proxy(inner)])
+        result = self._callFUT(container, deep=False)
+        self.assertIs(result[0], obj)
+        self.assertIs(result[1], inner)
+        self.assertIsInstance(inner[0], self._getTargetClass())
+
+    def test_subclasses_not_walked(self):
+        class List(list):
+            pass
+        container = List([self._proxy(object())])
+        self.assertIs(self._callFUT(container), container)
+
+    def test_recursive(self):
+        container = []
+        container.append(container)
+        self.assertRaises(RecursionError, self._callFUT, container)
+
+
+@unittest.skipIf(PURE_PYTHON,
+                 "Needs C extension")
+class RemoveSecurityProxiesCTests(RemoveSecurityProxiesTestsBase,
+                                  unittest.TestCase):
+
+    def _getTargetClass(self):  # pragma: no cover
+        from zope.security.proxy import _Proxy
+        return _Proxy
+
+    def _callFUT(self, obj, *args, **kw):  # pragma: no cover
+        from zope.security._proxy import removeSecurityProxies
+        return removeSecurityProxies(obj, *args, **kw)
+
+
+class RemoveSecurityProxiesPyTests(RemoveSecurityProxiesTestsBase,
+                                   unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.security.proxy import ProxyPy
+        return ProxyPy
+
+    def _callFUT(self, obj, *args, **kw):
+        from zope.security.proxy import removeSecurityProxiesPy
+        return removeSecurityProxiesPy(obj, *args, **kw)
+
+
+class TrustedRegionTestsBase:
+
+    def _getFunctions(self):
+        raise NotImplementedError("Subclasses must define")
+
+    def test_not_trusted_by_default(self):
+        _enter, _exit, _in = self._getFunctions()
+        self.assertFalse(_in())
+
+    def test_enter_exit(self):
+        _enter, _exit, _in = self._getFunctions()
+        token = _enter(sys._getframe())
+        try:
+            self.assertTrue(_in())
+        finally:
+            _exit(token)
+        self.assertFalse(_in())
+
+    def test_nested(self):
+        _enter, _exit, _in = self._getFunctions()
+        outer = _enter(sys._getframe())
+        inner = _enter(sys._getframe())
+        _exit(inner)
+        try:
+            self.assertTrue(_in())
+        finally:
+            _exit(outer)
+        self.assertFalse(_in())
+
+    def test_enter_wo_frame(self):
+        _enter, _exit, _in = self._getFunctions()
+        self.assertRaises(TypeError, _enter, None)
+        self.assertFalse(_in())
+
+    def test_exit_twice(self):
+        _enter, _exit, _in = self._getFunctions()
+        token = _enter(sys._getframe())
+        _exit(token)
+        self.assertRaises(RuntimeError, _exit, token)
+        self.assertFalse(_in())
+
+    def test_called_code_trusted(self):
+        _enter, _exit, _in = self._getFunctions()
+        token = _enter(sys._getframe())
+        try:
+            self.assertTrue((lambda: _in())())
+        finally:
+            _exit(token)
+
+    def test_other_threads_not_trusted(self):
+        import threading
+        _enter, _exit, _in = self._getFunctions()
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(_in()))
+        token = _enter(sys._getframe())
+        try:
+            thread.start()
+            thread.join()
+        finally:
+            _exit(token)
+        self.assertEqual(seen, [False])
+
+    def test_enter_in_generator(self):
+        _enter, _exit, _in = self._getFunctions()
+
+        def generator():
+            yield _enter(sys._getframe())
+        self.assertRaises(RuntimeError, next, generator())
+        self.assertFalse(_in())
+
+    def test_enter_in_async_generator(self):
+        import asyncio
+        _enter, _exit, _in = self._getFunctions()
+
+        async def generator():
+            yield _enter(sys._getframe())
+
+        async def main():
+            with self.assertRaises(RuntimeError):
+                await generator().__anext__()
+        asyncio.run(main())
+        self.assertFalse(_in())
+
+    def test_enter_in_function_called_by_generator(self):
+        _enter, _exit, _in = self._getFunctions()
+
+        def trusted():
+            token = _enter(sys._getframe())
+            try:
+                return _in()
+            finally:
+                _exit(token)
+
+        def generator():
+            yield trusted()
+            yield _in()
+        self.assertEqual(list(generator()), [True, False])
+
+    def test_other_tasks_not_trusted(self):
+        import asyncio
+        _enter, _exit, _in = self._getFunctions()
+        seen = []
+
+        async def trusted():
+            token = _enter(sys._getframe())
+            try:
+                seen.append(('trusted', _in()))
+                await asyncio.sleep(0)
+                seen.append(('trusted', _in()))
+                await asyncio.sleep(0)
+            finally:
+                _exit(token)
+
+        async def untrusted():
+            seen.append(('untrusted', _in()))
+            await asyncio.sleep(0)
+            seen.append(('untrusted', _in()))
+
+        async def main():
+            await asyncio.gather(trusted(), untrusted())
+        asyncio.run(main())
+        self.assertEqual(seen, [('trusted', True), ('untrusted', False),
+                                ('trusted', True), ('untrusted', False)])
+
+    def test_tasks_started_in_region_trusted_while_active(self):
+        import asyncio
+        _enter, _exit, _in = self._getFunctions()
+
+        async def check():
+            return _in()
+
+        async def main():
+            token = _enter(sys._getframe())
+            try:
+                during = await asyncio.create_task(check())
+                after = asyncio.create_task(check())
+            finally:
+                _exit(token)
+            return during, await after
+        self.assertEqual(asyncio.run(main()), (True, False))
+
+    def test_exit_w_bad_token(self):
+        _enter, _exit, _in = self._getFunctions()
+        self.assertRaises(TypeError, _exit, None)
+
+
+@unittest.skipIf(PURE_PYTHON,
+                 "Needs C extension")
+class TrustedRegionCTests(TrustedRegionTestsBase,
+                          unittest.TestCase):
+
+    def _getFunctions(self):  # pragma: no cover
+        from zope.security._proxy import _enterTrustedRegion
+        from zope.security._proxy import _exitTrustedRegion
+        from zope.security._proxy import _inTrustedRegion
+        return _enterTrustedRegion, _exitTrustedRegion, _inTrustedRegion
+
+
+class TrustedRegionPyTests(TrustedRegionTestsBase,
+                           unittest.TestCase):
+
+    def _getFunctions(self):
+        from zope.security.proxy import _enterTrustedRegionPy
+        from zope.security.proxy import _exitTrustedRegionPy
+        from zope.security.proxy import _inTrustedRegionPy
+        return (_enterTrustedRegionPy, _exitTrustedRegionPy,
+                _inTrustedRegionPy)
+
+
 class DummyChecker:
     _proxied = _checked = None
 
@@ -129,5 +129,142 @@ class PermissiveSecurityPolicyTests(unittest.TestCase,
         self.assertTrue(policy.checkPermission(permission, target))
 
 
+class BitsetSecurityPolicyTests(unittest.TestCase,
+                                ConformsToIInteraction):
+
+    def _getTargetClass(self):
+        from zope.security.simplepolicies import BitsetSecurityPolicy
+
+        class Policy(BitsetSecurityPolicy):
+            grants = {
+                'alice': ('perm.alice',),
+                'bob': ('perm.bob', 'perm.shared'),
+                'group.a': ('perm.group_a', 'perm.shared'),
+                'group.b': ('perm.group_b',),
+            }
+        return Policy
+
+    def _makeParticipation(self, id, groups=None, allGroups=None):
+        from zope.security.testing import Participation
+        from zope.security.testing import Principal
+        if allGroups is None:
+            principal = Principal(id, groups=groups)
+        else:
+            class ClosureAwarePrincipal:
+                pass
+            principal = ClosureAwarePrincipal()
+            principal.id = id
+            principal.groups = groups
+            principal.allGroups = allGroups
+        return Participation(principal)
+
+    def test_checkPermission_w_public(self):
+        from zope.security.checker import CheckerPublic
+        policy = self._makeOne(self._makeParticipation('nobody'))
+        self.assertTrue(policy.checkPermission(CheckerPublic, None))
+
+    def test_checkPermission_w_no_participations(self):
+        policy = self._makeOne()
+        self.assertTrue(policy.checkPermission('perm.alice', None))
+
+    def test_checkPermission_w_only_system_user(self):
+        from zope.security._definitions import system_user
+        from zope.security.testing import Participation
+        policy = self._makeOne(Participation(system_user))
+        self.assertTrue(policy.checkPermission('perm.alice', None))
+
+    def test_checkPermission_direct_grant(self):
+        policy = self._makeOne(self._makeParticipation('alice'))
+        self.assertTrue(policy.checkPermission('perm.alice', None))
+        self.assertFalse(policy.checkPermission('perm.bob', None))
+        self.assertFalse(policy.checkPermission('perm.unknown', None))
+
+    def test_checkPermission_w_token(self):
+        from zope.security.permission import getPermissionToken
+        policy = self._makeOne(self._makeParticipation('alice'))
+        self.assertTrue(
+            policy.checkPermission(getPermissionToken('perm.alice'), None))
+        self.assertFalse(
+            policy.checkPermission(getPermissionToken('perm.bob'), None))
+
+    def test_checkPermission_unknown_not_interned(self):
+        from zope.security.permission import _tokens
+        policy = self._makeOne(self._makeParticipation('alice'))
+        self.assertFalse(policy.checkPermission('perm.never.granted', None))
+        self.assertNotIn('perm.never.granted', _tokens)
+
+    def test_checkPermission_w_non_string(self):
+        policy = self._makeOne(self._makeParticipation('alice'))
+        self.assertFalse(policy.checkPermission(object(), None))
+
+    def test_checkPermission_w_allGroups(self):
+        policy = self._makeOne(
+            self._makeParticipation('carol', allGroups=('group.a',
+                                                        'group.b'),
+                                    groups=('group.a',)))
+        self.assertTrue(policy.checkPermission('perm.group_a', None))
+        self.assertTrue(policy.checkPermission('perm.group_b', None))
+        self.assertFalse(policy.checkPermission('perm.alice', None))
+
+    def test_checkPermission_w_groups(self):
+        from zope.security.testing import Principal
+        group_b = Principal('group.b')
+        group_a = Principal('group.a', groups=[group_b])
+        policy = self._makeOne(
+            self._makeParticipation('carol', groups=[group_a]))
+        self.assertTrue(policy.checkPermission('perm.group_a', None))
+        self.assertTrue(policy.checkPermission('perm.group_b', None))
+        self.assertFalse(policy.checkPermission('perm.alice', None))
+
+    def test_checkPermission_w_groups_wo_allGroups(self):
+        from zope.security.groups import invalidateGroupClosure
+        from zope.security.testing import Participation
+
+        class Principal:
+            id = 'erin'
+            groups = ('group.b',)
+        self.addCleanup(invalidateGroupClosure)
+        policy = self._makeOne(Participation(Principal()))
+        self.assertTrue(policy.checkPermission('perm.group_b', None))
+        self.assertFalse(policy.checkPermission('perm.group_a', None))
+
+    def test_checkPermission_requires_all_principals(self):
+        from zope.security._definitions import system_user
+        from zope.security.testing import Participation
+        policy = self._makeOne(
+            self._makeParticipation('bob'),
+            self._makeParticipation('carol', allGroups=('group.a',)),
+            Participation(system_user))
+        self.assertTrue(policy.checkPermission('perm.shared', None))
+        self.assertFalse(policy.checkPermission('perm.bob', None))
+        self.assertFalse(policy.checkPermission('perm.group_a', None))
+
+    def test_add_and_remove_recompute(self):
+        alice = self._makeParticipation('alice')
+        bob = self._makeParticipation('bob')
+        policy = self._makeOne(alice)
+        self.assertFalse(policy.checkPermission('perm.bob', None))
+        policy.add(bob)
+        self.assertFalse(policy.checkPermission('perm.alice', None))
+        self.assertFalse(policy.checkPermission('perm.bob', None))
+        policy.remove(alice)
+        self.assertTrue(policy.checkPermission('perm.bob', None))
+        policy.remove(bob)
+        self.assertTrue(policy.checkPermission('perm.alice', None))
+
+    def test_grants_are_not_contextual(self):
+        policy = self._makeOne(self._makeParticipation('alice'))
+        self.assertTrue(policy.checkPermission('perm.alice', object()))
+        self.assertTrue(policy.checkPermission('perm.alice', self))
+
+    def test_getGrantedPermissions_override(self):
+        class Policy(self._getTargetClass()):
+            def getGrantedPermissions(self, principal_id):
+                return ('perm.' + principal_id,)
+        policy = Policy(self._makeParticipation('dave'))
+        self.assertTrue(policy.checkPermission('perm.dave', None))
+        self.assertFalse(policy.checkPermission('perm.alice', None))
+
+
 def test_suite():
     return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -69,6 +69,37 @@ class TestTestingFunctions(CleanUp,
         utility = component.getUtility(IPermission, name=zope_Public)
         self.assertIs(perm, utility)
 
+    def test_principal_w_groups_provides_allGroups(self):
+        from zope.security.interfaces import IGroupClosureAwarePrincipal
+
+        outer = testing.Principal('outer')
+        inner = testing.Principal('inner', groups=[outer])
+        principal = testing.Principal('foo', groups=[inner, 'plain'])
+        self.assertTrue(IGroupClosureAwarePrincipal.providedBy(principal))
+        self.assertEqual(sorted(principal.allGroups),
+                         ['inner', 'outer', 'plain'])
+
+    def test_principal_wo_groups(self):
+        from zope.security.interfaces import IGroupAwarePrincipal
+
+        principal = testing.Principal('foo')
+        self.assertFalse(IGroupAwarePrincipal.providedBy(principal))
+        self.assertEqual(principal.allGroups, ())
+
+    def test_principal_invalidates_cached_closure(self):
+        principal = testing.Principal('foo', groups=['bar'])
+        self.assertEqual(principal.allGroups, ('bar',))
+        principal = testing.Principal('foo', groups=['baz'])
+        self.assertEqual(principal.allGroups, ('baz',))
+
+    def test_principal_invalidates_cached_closures_of_members(self):
+        group = testing.Principal('group', groups=['old'])
+        principal = testing.Principal('foo', groups=[group])
+        self.assertEqual(sorted(principal.allGroups), ['group', 'old'])
+        group = testing.Principal('group', groups=['new'])
+        principal.groups = [group]
+        self.assertEqual(sorted(principal.allGroups), ['group', 'new'])
+
 
 def test_suite():
     return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -49,12 +49,28 @@ class PermissionTests(unittest.TestCase,
         self.assertEqual(permission.fromUnicode('nonesuch.permission'),
                          'nonesuch.permission')
 
+    def test_fromUnicode_returns_token(self):
+        from zope.security.permission import getPermissionToken
+        permission = self._makeOne()
+        token = permission.fromUnicode('nonesuch.permission')
+        self.assertIs(token, getPermissionToken('nonesuch.permission'))
+
     def test_fromUnicode_hit(self):
         permission = self._makeOne()
         p_obj = object()
         permission.context.permission_mapping = {'extant.permission': p_obj}
         self.assertIs(permission.fromUnicode('extant.permission'), p_obj)
 
+    def test_fromUnicode_hit_returns_token(self):
+        from zope.security.permission import PermissionToken
+        from zope.security.permission import getPermissionToken
+        permission = self._makeOne()
+        permission.context.permission_mapping = {
+            'extant.permission': 'other.permission'}
+        token = permission.fromUnicode('extant.permission')
+        self.assertIsInstance(token, PermissionToken)
+        self.assertIs(token, getPermissionToken('other.permission'))
+
     def test__validate_w_public(self):
         context = DummyZCMLContext()
         permission = self._makeOne(context)
@@ -62,15 +78,164 @@ class PermissionTests(unittest.TestCase,
         self.assertEqual(len(context._actions), 0)
 
     def test__validate_w_non_public(self):
-        from zope.security.permission import checkPermission
+        from zope.security.zcml import _checkPermissions
         context = DummyZCMLContext()
+        context.info = 'info A'
         permission = self._makeOne(context)
         permission._validate('a.permission')
         self.assertEqual(len(context._actions), 1)
         self.assertEqual(context._actions[0]['discriminator'], None)
-        self.assertEqual(context._actions[0]['callable'], checkPermission)
+        self.assertEqual(context._actions[0]['callable'], _checkPermissions)
         self.assertEqual(context._actions[0]['args'],
-                         (None, 'a.permission'))
+                         (context, {'a.permission': 'info A'}))
+
+    def test__validate_collects_permissions(self):
+        context = DummyZCMLContext()
+        permission = self._makeOne(context)
+        for info, permission_id in (('info 1', 'b.permission'),
+                                    ('info 2', 'a.permission'),
+                                    ('info 3', 'b.permission')):
+            context.info = info
+            permission._validate(permission_id)
+        self.assertEqual(len(context._actions), 1)
+        # Each ID keeps the info of the first directive referencing it.
+        self.assertEqual(context._actions[0]['args'][1],
+                         {'b.permission': 'info 1', 'a.permission': 'info 2'})
+        self.assertEqual(list(context._actions[0]['args'][1]),
+                         ['b.permission', 'a.permission'])
+
+    def test__validate_w_grouping_context(self):
+        from zope.configuration.config import GroupingContextDecorator
+        context = DummyZCMLContext()
+        group = GroupingContextDecorator(GroupingContextDecorator(context))
+        self._makeOne(context)._validate('a.permission')
+        self._makeOne(group)._validate('b.permission')
+        self.assertEqual(len(context._actions), 1)
+        self.assertEqual(list(context._actions[0]['args'][1]),
+                         ['a.permission', 'b.permission'])
+
+    def test__validate_after_check(self):
+        from zope.component import provideUtility
+        from zope.component.testing import PlacelessSetup
+        from zope.configuration.config import ConfigurationExecutionError
+
+        from zope.security.interfaces import IPermission
+        placeless = PlacelessSetup()
+        placeless.setUp()
+        self.addCleanup(placeless.tearDown)
+        provideUtility(object(), IPermission, 'a.permission')
+        context = DummyZCMLContext()
+        permission = self._makeOne(context)
+        permission._validate('a.permission')
+        action = context._actions[0]
+        action['callable'](*action['args'])
+        # Permissions referenced later are checked by a new action.
+        context.info = 'info B'
+        permission._validate('b.permission')
+        self.assertEqual(len(context._actions), 2)
+        action = context._actions[1]
+        self.assertEqual(list(action['args'][1]), ['b.permission'])
+        with self.assertRaises(ConfigurationExecutionError) as exc:
+            action['callable'](*action['args'])
+        self.assertEqual(exc.exception.info, 'info B')
+        self.assertIsInstance(exc.exception.evalue, ValueError)
+        self.assertEqual(exc.exception.evalue.args,
+                         ('Undefined permission ID', 'b.permission'))
+
+    def test_undefined_permission_in_zcml(self):
+        from zope.component.testing import PlacelessSetup
+        from zope.configuration import xmlconfig
+        from zope.configuration.exceptions import ConfigurationError
+
+        import zope.security
+        placeless = PlacelessSetup()
+        placeless.setUp()
+        self.addCleanup(placeless.tearDown)
+        context = xmlconfig.file('meta.zcml', zope.security)
+        with self.assertRaises(ConfigurationError) as exc:
+            xmlconfig.string("""
+            <configure xmlns="http://namespaces.zope.org/zope"
+                       i18n_domain="zope">
+              <permission id="a.permission" title="A" />
+              <class class="zope.security.tests.test_zcml.DummyZCMLContext">
+                <require permission="a.permission" attributes="action" />
+                <require permission="b.permission" attributes="_actions" />
+              </class>
+            </configure>
+            """, context)
+        message = str(exc.exception)
+        self.assertIn('b.permission', message)
+        # The error points at the directive referencing the permission,
+        # not at the first directive that referenced any permission.
+        opening = message.splitlines()[0]
+        self.assertIn('line 7', opening)
+        self.assertNotIn('line 6', message)
+
+    def test_zcml_checks_each_permission_once(self):
+        from zope.component.testing import PlacelessSetup
+        from zope.configuration import xmlconfig
+
+        import zope.security
+        from zope.security.zcml import _checkPermissions
+        placeless = PlacelessSetup()
+        placeless.setUp()
+        self.addCleanup(placeless.tearDown)
+        context = xmlconfig.file('meta.zcml', zope.security)
+        xmlconfig.string("""
+        <configure xmlns="http://namespaces.zope.org/zope"
+                   i18n_domain="zope">
+          <permission id="a.permission" title="A" />
+          <permission id="b.permission" title="B" />
+          <class class="zope.security.tests.test_zcml.DummyZCMLContext">
+            <require permission="a.permission" attributes="action" />
+            <require permission="b.permission" attributes="_actions" />
+            <require permission="a.permission" set_attributes="action" />
+            <require permission="zope.Public" set_attributes="_actions" />
+          </class>
+          <class class="zope.security.tests.test_zcml.PermissionTests">
+            <require permission="a.permission" attributes="run" />
+            <require permission="b.permission" attributes="debug" />
+          </class>
+        </configure>
+        """, context, execute=False)
+        checks = [action for action in context.actions
+                  if action['callable'] is _checkPermissions]
+        self.assertEqual(len(checks), 1)
+        self.assertEqual(list(checks[0]['args'][1]),
+                         ['a.permission', 'b.permission'])
+        # Each ID is reported at the first directive referencing it.
+        infos = checks[0]['args'][1]
+        self.assertIn('line 7', str(infos['a.permission']))
+        self.assertIn('line 8', str(infos['b.permission']))
+        self.assertNotEqual(checks[0]['info'], infos['a.permission'])
+        context.execute_actions()
+
+    def test_zcml_reports_each_undefined_permission_where_used(self):
+        from zope.component.testing import PlacelessSetup
+        from zope.configuration import xmlconfig
+        from zope.configuration.exceptions import ConfigurationError
+
+        import zope.security
+        placeless = PlacelessSetup()
+        placeless.setUp()
+        self.addCleanup(placeless.tearDown)
+        context = xmlconfig.file('meta.zcml', zope.security)
+        with self.assertRaises(ConfigurationError) as exc:
+            xmlconfig.string("""
+            <configure xmlns="http://namespaces.zope.org/zope"
+                       i18n_domain="zope">
+              <permission id="a.permission" title="A" />
+              <class class="zope.security.tests.test_zcml.DummyZCMLContext">
+                <require permission="a.permission" attributes="action" />
+              </class>
+              <class class="zope.security.tests.test_zcml.PermissionTests">
+                <require permission="a.permission" attributes="run" />
+                <require permission="c.permission" attributes="debug" />
+              </class>
+            </configure>
+            """, context)
+        opening = str(exc.exception).splitlines()[0]
+        self.assertIn('line 10', opening)
 
 
 class Test_securityPolicy(unittest.TestCase):
@@ -142,6 +307,14 @@ class Test_permission(unittest.TestCase):
         self.assertIs(context._actions[1]['callable'], provideInterface)
         self.assertEqual(context._actions[1]['args'], ('', IPermission))
 
+    def test_id_is_token(self):
+        from zope.security.permission import getPermissionToken
+        context = DummyZCMLContext()
+        context.info = 'INFO'
+        self._callFUT(context, 'a.permission', 'TITLE')
+        permission = context._actions[0]['args'][1]
+        self.assertIs(permission.id, getPermissionToken('a.permission'))
+
 
 class Test_redefinePermission(unittest.TestCase):
 
@@ -184,11 +357,53 @@ class Test_redefinePermission(unittest.TestCase):
         self.assertIs(context.permission_mapping, mapping)
         self.assertIs(context.permission_mapping['before.permission'], after)
 
+    def test_redefines_checkers_once_per_machine(self):
+        from zope.security.zcml import _redefinePermissions
+        z_context = DummyZCMLContext()
+
+        class Context:
+            pass
+        z_context.context = Context()
+        self._callFUT(z_context, 'a.permission', 'b.permission')
+        self._callFUT(z_context, 'c.permission', 'd.permission')
+        self.assertEqual(len(z_context._actions), 1)
+        action = z_context._actions[0]
+        self.assertIsNone(action['discriminator'])
+        self.assertIs(action['callable'], _redefinePermissions)
+        self.assertEqual(action['args'], (z_context, {
+            'a.permission': 'b.permission',
+            'c.permission': 'd.permission',
+        }))
+
+    def test__redefinePermissions(self):
+        from zope.security.checker import _checkers
+        from zope.security.checker import _clear
+        from zope.security.protectclass import protectName
+        from zope.security.zcml import _redefinePermissions
+        z_context = DummyZCMLContext()
+
+        class Context:
+            pass
+        z_context.context = Context()
+
+        class Foo:
+            pass
+        self.addCleanup(_clear)
+        protectName(Foo, 'bar', 'a.permission')
+        self._callFUT(z_context, 'a.permission', 'b.permission')
+        _redefinePermissions(*z_context._actions[0]['args'])
+        self.assertEqual(_checkers[Foo].get_permissions,
+                         {'bar': 'b.permission'})
+        # Later redefinitions add a new action.
+        self._callFUT(z_context, 'b.permission', 'c.permission')
+        self.assertEqual(len(z_context._actions), 2)
+
 
 class DummyZCMLContext:
 
     def __init__(self):
         self._actions = []
+        self.info = ''
 
     def action(self, **kw):
         self._actions.append(kw)
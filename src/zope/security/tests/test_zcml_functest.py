@@ -566,6 +566,79 @@ class TestRequireDirective(unittest.TestCase):
         self.assertDeclaration(declaration,
                                m1P=P1, m2P=P2, m3P=P2)
 
+    def testConflictingNames(self):
+        from zope.configuration.config import ConfigurationConflictError
+
+        from zope.security.tests import module
+        declaration = ('''<class class="%s">
+                            <require
+                                permission="%s"
+                                attributes="m1 m2"/>
+                            <require
+                                permission="%s"
+                                attributes="m2 m3"/>
+                          </class>'''
+                       % (_pfx("test_class"), P1, P2))
+        self.assertRaises(ConfigurationConflictError,
+                          apply_declaration,
+                          module.template_bracket % declaration)
+
+    def testOverriddenNames(self):
+        # Names protected by one require can be overridden individually.
+        from zope.configuration.config import ConfigurationMachine
+
+        from zope.security.metaconfigure import ClassDirective
+        from zope.security.tests import module
+        context = ConfigurationMachine()
+        directive = ClassDirective(context, module.test_class)
+        context.includepath = ('included.zcml',)
+        directive.require(context, permission=P1, attributes=['m1', 'm2'])
+        context.includepath = ()
+        directive.require(context, permission=P2, attributes=['m2', 'm3'])
+        context.execute_actions()
+        self.assertState(m1P=P1, m2P=P2, m3P=P2)
+
+
+class TestModuleDirective(unittest.TestCase):
+
+    def setUp(self):
+        from zope.component.testing import setUp
+        setUp()
+        defineDirectives()
+
+    def tearDown(self):
+        from zope.component.testing import tearDown
+        tearDown()
+
+    def testAllowAndRequire(self):
+        from zope.configuration.xmlconfig import xmlconfig
+
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import moduleChecker
+        from zope.security.tests import exampleclass
+        f = configfile("""
+<module module="zope.security.tests.exampleclass">
+  <allow attributes="ExampleClass IExample" />
+  <require permission="%s" attributes="IExample2" />
+</module>
+                       """ % P1)
+        xmlconfig(f)
+        checker = moduleChecker(exampleclass)
+        self.assertIs(checker.permission_id('ExampleClass'), CheckerPublic)
+        self.assertIs(checker.permission_id('IExample'), CheckerPublic)
+        self.assertEqual(checker.permission_id('IExample2'), P1)
+
+    def testConflictingNames(self):
+        from zope.configuration.config import ConfigurationConflictError
+        from zope.configuration.xmlconfig import xmlconfig
+        f = configfile("""
+<module module="zope.security.tests.exampleclass">
+  <allow attributes="ExampleClass IExample" />
+  <require permission="%s" attributes="IExample" />
+</module>
+                       """ % P1)
+        self.assertRaises(ConfigurationConflictError, xmlconfig, f)
+
 
 def apply_declaration(declaration):
     '''Apply the xmlconfig machinery.'''
@@ -609,6 +682,42 @@ class DirectivesTest(unittest.TestCase):
         xmlconfig.file("redefineperms.zcml", tests)
         self.assertEqual(perms, ['zope.Security'])
 
+    def testRedefinePermissionAppliesToCheckers(self):
+        from zope.configuration import xmlconfig
+
+        from zope.security.checker import CheckerPublic
+        from zope.security.checker import getCheckerForInstancesOf
+        from zope.security.permission import getPermissionToken
+        from zope.security.protectclass import protectName
+        from zope.security.tests.exampleclass import ExampleClass
+
+        # Protections made before the redefinition, by directives or by
+        # code, are redefined at the end of the configuration.
+        protectName(ExampleClass, 'direct', 'zope.View')
+        xmlconfig.string("""
+<configure
+    xmlns="http://namespaces.zope.org/zope"
+    xmlns:meta="http://namespaces.zope.org/meta">
+  <include package="zope.security" file="meta.zcml" />
+  <permission id="zope.View" title="View" />
+  <permission id="zope.Security" title="Change security settings" />
+  <class class="zope.security.tests.exampleclass.ExampleClass">
+    <require permission="zope.View" attributes="before" />
+    <require permission="zope.Public" attributes="public" />
+  </class>
+  <meta:redefinePermission from="zope.View" to="zope.Security" />
+  <class class="zope.security.tests.exampleclass.ExampleClass">
+    <require permission="zope.View" attributes="after" />
+  </class>
+</configure>
+""")
+        checker = getCheckerForInstancesOf(ExampleClass)
+        token = getPermissionToken('zope.Security')
+        self.assertIs(checker.permission_id('direct'), token)
+        self.assertIs(checker.permission_id('before'), token)
+        self.assertIs(checker.permission_id('after'), token)
+        self.assertIs(checker.permission_id('public'), CheckerPublic)
+
 
 def test_suite():
     return unittest.defaultTestLoader.loadTestsFromName(__name__)
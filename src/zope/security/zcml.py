@@ -15,6 +15,10 @@
 """
 __docformat__ = 'restructuredtext'
 
+import weakref
+
+from zope.configuration.config import ConfigurationExecutionError
+from zope.configuration.config import GroupingContextDecorator
 from zope.configuration.fields import GlobalObject
 from zope.configuration.fields import MessageID
 from zope.interface import Interface
@@ -24,7 +28,9 @@ from zope.schema.interfaces import IFromUnicode
 from zope.security._compat import implementer_if_needed
 from zope.security.interfaces import PUBLIC_PERMISSION_NAME as zope_Public
 from zope.security.management import setSecurityPolicy
-from zope.security.permission import checkPermission
+from zope.security.permission import checkPermissions
+from zope.security.permission import getPermissionToken
+from zope.security.protectclass import redefinePermissions
 
 
 @implementer_if_needed(IFromUnicode)
@@ -33,28 +39,68 @@ class Permission(Id):
     """
 
     def fromUnicode(self, value):
-        u = super().fromUnicode(value)
+        u = getPermissionToken(super().fromUnicode(value))
 
         map = getattr(self.context, 'permission_mapping', {})
-        return map.get(u, u)
+        u = map.get(u, u)
+        return getPermissionToken(u) if isinstance(u, str) else u
 
     def _validate(self, value):
         super()._validate(value)
 
         if value != zope_Public:
-            self.context.action(
-                discriminator=None,
-                callable=checkPermission,
-                args=(None, value),
-
-                # Delay execution till end. This is an
-                # optimization. We don't want to intersperse utility
-                # lookup, done when checking permissions, with utility
-                # definitions. Utility lookup is expensive after
-                # utility definition, as extensive caches have to be
-                # rebuilt.
-                order=9999999,
-            )
+            _collectPermissionId(self.context, value)
+
+
+# Maps configuration machines to the permission IDs referenced by the
+# directives they processed whose check hasn't run yet. Each ID maps to
+# the info of the first directive that referenced it, which is where an
+# undefined permission is reported; IDs are checked in the order they
+# were referenced.
+_pending_permission_ids = weakref.WeakKeyDictionary()
+
+# The info of the action checking the collected IDs. It stands for no
+# directive in particular, as errors are reported at the directive that
+# referenced the undefined permission.
+_CHECK_PERMISSIONS_INFO = 'Checking the permissions used by the configuration'
+
+
+def _configurationMachine(context):
+    while isinstance(context, GroupingContextDecorator):
+        context = context.context
+    return context
+
+
+def _collectPermissionId(context, permission_id):
+    machine = _configurationMachine(context)
+    permission_ids = _pending_permission_ids.get(machine)
+    if permission_ids is None:
+        permission_ids = _pending_permission_ids[machine] = {}
+        context.action(
+            discriminator=None,
+            callable=_checkPermissions,
+            args=(machine, permission_ids),
+            info=_CHECK_PERMISSIONS_INFO,
+
+            # Delay execution till end. This is an
+            # optimization. We don't want to intersperse utility
+            # lookup, done when checking permissions, with utility
+            # definitions. Utility lookup is expensive after
+            # utility definition, as extensive caches have to be
+            # rebuilt.
+            order=9999999,
+        )
+    permission_ids.setdefault(permission_id, context.info)
+
+
+def _checkPermissions(machine, permission_ids):
+    # Permissions referenced after this point need a new action.
+    if _pending_permission_ids.get(machine) is permission_ids:
+        del _pending_permission_ids[machine]
+    try:
+        checkPermissions(None, permission_ids)
+    except ValueError as e:
+        raise ConfigurationExecutionError(permission_ids[e.args[1]], e)
 
 
 class ISecurityPolicyDirective(Interface):
@@ -98,7 +144,7 @@ def permission(_context, id, title, description=''):
 
     from zope.security.interfaces import IPermission
     from zope.security.permission import Permission
-    permission = Permission(id, title, description)
+    permission = Permission(getPermissionToken(id), title, description)
     utility(_context, IPermission, permission, name=id)
 
 
@@ -117,6 +163,7 @@ class IRedefinePermission(Interface):
 
 
 def redefinePermission(_context, from_, to):
+    directive_context = _context
     _context = _context.context
 
     # check if context has any permission mappings yet
@@ -124,3 +171,31 @@ def redefinePermission(_context, from_, to):
         _context.permission_mapping = {}
 
     _context.permission_mapping[from_] = to
+
+    # Directives processed before this one, and code calling
+    # protectName() directly, don't see the mapping. Apply it to all
+    # checkers at the end of the configuration, too.
+    machine = _configurationMachine(directive_context)
+    mapping = _pending_redefinitions.get(machine)
+    if mapping is None:
+        mapping = _pending_redefinitions[machine] = {}
+        directive_context.action(
+            discriminator=None,
+            callable=_redefinePermissions,
+            args=(machine, mapping),
+            order=9999999,
+        )
+    mapping[from_] = to
+
+
+# Maps configuration machines to the permission redefinitions made by
+# the directives they processed that haven't been applied to the
+# checkers yet.
+_pending_redefinitions = weakref.WeakKeyDictionary()
+
+
+def _redefinePermissions(machine, mapping):
+    # Redefinitions made after this point need a new action.
+    if _pending_redefinitions.get(machine) is mapping:
+        del _pending_redefinitions[machine]
+    redefinePermissions(mapping)